@@ -0,0 +1,7 @@
+"""
+Benchmarks reproduzíveis do PDF Text Extractor.
+
+Inclui um gerador determinístico de PDFs sintéticos (corpus.py) e um
+executor que mede a vazão de extração, limpeza e processamento em lote
+(run.py).
+"""
@@ -0,0 +1,209 @@
+"""
+Gerador determinístico de corpus sintético de PDFs.
+
+Os PDFs são escritos diretamente (PDF 1.4, fonte Helvetica padrão), sem
+dependências externas. Para os mesmos parâmetros e semente, os arquivos
+gerados são idênticos byte a byte.
+"""
+import random
+from pathlib import Path
+from typing import List
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+
+_WORDS = [
+    "relatório", "análise", "investigação", "documento", "processo", "conteúdo",
+    "informação", "pessoa", "empresa", "registro", "operação", "contrato",
+    "período", "valor", "data", "origem", "destino", "observação", "situação",
+    "referência", "atividade", "município", "estado", "setor", "unidade",
+]
+
+
+def _escape(text: str) -> str:
+    """Escapa uma string literal PDF."""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text_line(text: str) -> str:
+    """Operador que mostra uma linha de texto e avança para a próxima."""
+    return f"({_escape(text)}) Tj T*"
+
+
+class SyntheticPDFBuilder:
+    """
+    Gera PDFs sintéticos com a poluição típica dos documentos processados:
+    cabeçalhos RELINT/SEPOL repetidos, rodapés com numeração de página,
+    códigos longos de documento e tabelas desenhadas com linhas.
+    """
+    
+    def __init__(
+        self,
+        lines_per_page: int = 40,
+        tables: bool = True,
+        headers: bool = True,
+        footers: bool = True,
+        document_codes: bool = True,
+        seed: int = 0
+    ):
+        """
+        Configura o gerador.
+        
+        Args:
+            lines_per_page: Linhas de texto corrido por página
+            tables: Se True, desenha uma tabela em páginas alternadas
+            headers: Se True, inclui cabeçalho RELINT/SEPOL em cada página
+            footers: Se True, inclui rodapé "PÁGINA n" e "n / total"
+            document_codes: Se True, inclui códigos longos de documento
+            seed: Semente do gerador pseudoaleatório
+        """
+        self.lines_per_page = lines_per_page
+        self.tables = tables
+        self.headers = headers
+        self.footers = footers
+        self.document_codes = document_codes
+        self.seed = seed
+    
+    def _sentence(self, rnd: random.Random) -> str:
+        """Gera uma frase de texto corrido."""
+        words = [rnd.choice(_WORDS) for _ in range(rnd.randint(6, 12))]
+        return " ".join(words).capitalize() + "."
+    
+    def _page_content(self, rnd: random.Random, page_number: int, num_pages: int) -> bytes:
+        """Gera o fluxo de conteúdo de uma página."""
+        ops = ["BT /F1 10 Tf 12 TL 50 800 Td"]
+        
+        if self.headers:
+            ops.append(_text_line("RELINT SEPOL/SSINTE - RELATÓRIO DE INTELIGÊNCIA"))
+        if self.document_codes:
+            ops.append(_text_line(f"Documento {rnd.randrange(10 ** 10, 10 ** 12)}"))
+        
+        for _ in range(self.lines_per_page):
+            ops.append(_text_line(self._sentence(rnd)))
+        
+        if self.footers:
+            ops.append(_text_line(f"RESUMO: página gerada para benchmark {page_number}"))
+            ops.append(_text_line(f"PÁGINA {page_number}    {page_number} / {num_pages}"))
+        
+        ops.append("ET")
+        
+        if self.tables and page_number % 2 == 0:
+            # Tabela 3x4 desenhada com linhas, na parte inferior da página
+            top, row_height, col_width, left = 200, 18, 120, 50
+            ops.append("0.5 w")
+            for row in range(5):
+                y = top - row * row_height
+                ops.append(f"{left} {y} m {left + 3 * col_width} {y} l S")
+            for col in range(4):
+                x = left + col * col_width
+                ops.append(f"{x} {top} m {x} {top - 4 * row_height} l S")
+            ops.append("BT /F1 9 Tf")
+            for row in range(4):
+                for col in range(3):
+                    x = left + col * col_width + 4
+                    y = top - (row + 1) * row_height + 5
+                    ops.append(f"1 0 0 1 {x} {y} Tm ({_escape(f'C{row}{col} {rnd.randint(0, 999)}')}) Tj")
+            ops.append("ET")
+        
+        return "\n".join(ops).encode("cp1252")
+    
+    def build(self, num_pages: int, seed: int = None) -> bytes:
+        """
+        Gera o conteúdo de um PDF.
+        
+        Args:
+            num_pages: Número de páginas
+            seed: Semente específica do documento (padrão: semente do gerador)
+            
+        Returns:
+            Bytes do arquivo PDF
+        """
+        rnd = random.Random(self.seed if seed is None else seed)
+        objects: List[bytes] = []
+        
+        def add(obj: bytes) -> int:
+            objects.append(obj)
+            return len(objects)
+        
+        font_id = add(
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            b"/Encoding /WinAnsiEncoding >>"
+        )
+        pages_id = add(b"")
+        kids = []
+        
+        for page_number in range(1, num_pages + 1):
+            content = self._page_content(rnd, page_number, num_pages)
+            content_id = add(
+                b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+            )
+            kids.append(add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, font_id, content_id)
+            ))
+        
+        objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+        )
+        catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+        info_id = add(b"<< /Title (Documento sintetico) /Producer (benchmarks.corpus) >>")
+        
+        output = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for number, obj in enumerate(objects, 1):
+            offsets.append(len(output))
+            output += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+        
+        xref_offset = len(output)
+        output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        for offset in offsets:
+            output += b"%010d 00000 n \n" % offset
+        output += (
+            b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(objects) + 1, catalog_id, info_id, xref_offset)
+        )
+        
+        return bytes(output)
+    
+    def write(self, pdf_path: str, num_pages: int, seed: int = None) -> Path:
+        """
+        Gera um PDF em disco.
+        
+        Args:
+            pdf_path: Caminho do arquivo a gerar
+            num_pages: Número de páginas
+            seed: Semente específica do documento
+            
+        Returns:
+            Caminho do arquivo gerado
+        """
+        path = Path(pdf_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.build(num_pages, seed))
+        return path
+
+
+def generate_corpus(
+    output_dir: str,
+    num_docs: int = 10,
+    pages_per_doc: int = 10,
+    **builder_options
+) -> List[Path]:
+    """
+    Gera um corpus determinístico de PDFs sintéticos.
+    
+    Args:
+        output_dir: Diretório onde os PDFs são gravados
+        num_docs: Número de documentos
+        pages_per_doc: Páginas por documento
+        **builder_options: Opções repassadas a SyntheticPDFBuilder
+        
+    Returns:
+        Lista com os caminhos dos PDFs gerados
+    """
+    builder = SyntheticPDFBuilder(**builder_options)
+    return [
+        builder.write(Path(output_dir) / f"sintetico_{index:04d}.pdf", pages_per_doc, seed=builder.seed + index)
+        for index in range(num_docs)
+    ]
@@ -0,0 +1,226 @@
+"""
+Executor dos benchmarks de vazão do PDF Text Extractor.
+
+Mede páginas/s e MB/s de CleanPDFExtractor.extract_text_from_pdf,
+PDFTextCleaner.clean_text e PDFBatchProcessor.process_directory sobre um
+corpus sintético determinístico, grava os resultados em JSON e compara
+com um resultado de referência.
+
+Uso:
+    python -m benchmarks.run -o results.json
+    python -m benchmarks.run --baseline results.json --threshold 0.1
+"""
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Any
+
+from pdf_text_extractor import CleanPDFExtractor, PDFBatchProcessor, PDFTextCleaner
+from .corpus import generate_corpus
+
+MEGABYTE = 1024 * 1024
+
+# Métricas comparadas com a referência (maior é melhor)
+COMPARED_METRICS = ("pages_per_second", "mb_per_second")
+
+
+def _best_time(function: Callable[[], Any], repeat: int) -> float:
+    """
+    Executa uma função várias vezes e retorna o menor tempo.
+
+    Args:
+        function: Função sem argumentos
+        repeat: Número de execuções
+
+    Returns:
+        Menor tempo de execução, em segundos
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _throughput(seconds: float, pages: int, num_bytes: int) -> Dict[str, Any]:
+    """Monta o resultado de um benchmark a partir do tempo e do volume processado."""
+    return {
+        "seconds": round(seconds, 4),
+        "pages": pages,
+        "megabytes": round(num_bytes / MEGABYTE, 4),
+        "pages_per_second": round(pages / seconds, 2) if seconds > 0 else 0,
+        "mb_per_second": round(num_bytes / MEGABYTE / seconds, 4) if seconds > 0 else 0,
+    }
+
+
+def run_benchmarks(
+    corpus: List[Path],
+    pages_per_doc: int,
+    repeat: int = 3,
+    workers: int = 1,
+    config: Dict[str, Any] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Executa os benchmarks sobre um corpus de PDFs.
+
+    Args:
+        corpus: Arquivos PDF do corpus
+        pages_per_doc: Páginas por documento
+        repeat: Execuções de cada benchmark (vale o menor tempo)
+        workers: Processos usados em process_directory
+        config: Configuração repassada ao extrator e ao processador
+
+    Returns:
+        Dicionário com o resultado de cada benchmark
+    """
+    config = dict(config or {})
+    extractor = CleanPDFExtractor(config)
+    cleaner = PDFTextCleaner()
+
+    total_pages = len(corpus) * pages_per_doc
+    pdf_bytes = sum(pdf_file.stat().st_size for pdf_file in corpus)
+    raw_texts = [extractor.extract_text_from_pdf(str(pdf_file)) for pdf_file in corpus]
+    text_bytes = sum(len(text.encode("utf-8")) for text in raw_texts)
+
+    results = {}
+
+    results["extract_text_from_pdf"] = _throughput(
+        _best_time(
+            lambda: [extractor.extract_text_from_pdf(str(pdf_file)) for pdf_file in corpus],
+            repeat,
+        ),
+        total_pages, pdf_bytes,
+    )
+
+    results["clean_text"] = _throughput(
+        _best_time(lambda: [cleaner.clean_text(text) for text in raw_texts], repeat),
+        total_pages, text_bytes,
+    )
+    results["clean_text"]["prefilter"] = cleaner.get_prefilter_stats()
+
+    input_dir = corpus[0].parent
+    with tempfile.TemporaryDirectory() as output_dir:
+        processor = PDFBatchProcessor({**config, "max_workers": workers})
+        results["process_directory"] = _throughput(
+            _best_time(lambda: processor.process_directory(input_dir, output_dir), repeat),
+            total_pages, pdf_bytes,
+        )
+
+    return results
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.1
+) -> List[str]:
+    """
+    Compara resultados com uma referência.
+
+    Args:
+        current: Resultados da execução atual
+        baseline: Resultados de referência
+        threshold: Queda relativa tolerada (0.1 = 10%)
+
+    Returns:
+        Lista de descrições das regressões encontradas
+    """
+    regressions = []
+
+    for name, reference in baseline.get("results", {}).items():
+        measured = current.get("results", {}).get(name)
+        if measured is None:
+            continue
+
+        for metric in COMPARED_METRICS:
+            expected = reference.get(metric, 0)
+            if expected > 0 and measured[metric] < expected * (1 - threshold):
+                drop = (1 - measured[metric] / expected) * 100
+                regressions.append(
+                    f"{name}.{metric}: {measured[metric]} < {expected} (queda de {drop:.1f}%)"
+                )
+
+    return regressions
+
+
+def _git_commit() -> str:
+    """Retorna o commit atual do repositório, se disponível."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: List[str] = None) -> int:
+    """Função principal do executor de benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmarks do PDF Text Extractor")
+    parser.add_argument("--docs", type=int, default=10, help="Documentos no corpus (padrão: 10)")
+    parser.add_argument("--pages", type=int, default=20, help="Páginas por documento (padrão: 20)")
+    parser.add_argument("--no-tables", action="store_true", help="Gerar páginas sem tabelas")
+    parser.add_argument("--seed", type=int, default=0, help="Semente do corpus (padrão: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções por benchmark (padrão: 3)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Processos em process_directory (padrão: 1)")
+    parser.add_argument("--corpus-dir", help="Diretório do corpus (padrão: temporário)")
+    parser.add_argument("-o", "--output", help="Arquivo JSON de resultados")
+    parser.add_argument("--baseline", help="Arquivo JSON de referência para comparação")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Queda tolerada em relação à referência (padrão: 0.1)")
+    args = parser.parse_args(argv)
+
+    # Os logs do pacote distorcem as medições
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = generate_corpus(
+            args.corpus_dir or tmp_dir, args.docs, args.pages,
+            tables=not args.no_tables, seed=args.seed,
+        )
+        results = run_benchmarks(corpus, args.pages, args.repeat, args.workers)
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "docs": args.docs,
+            "pages": args.pages,
+            "tables": not args.no_tables,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "workers": args.workers,
+        },
+        "results": results,
+    }
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("parameters") != report["parameters"]:
+            print("Aviso: parâmetros diferentes da referência", file=sys.stderr)
+
+        regressions = compare_results(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regressão: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,20 @@
 """
 Script principal para execução do PDF Text Extractor.
+
+As dependências pesadas (pdfplumber, python-dotenv) só são importadas
+depois da análise dos argumentos, pelo caminho de código que as usa; assim,
+"--help" e erros de argumentos respondem sem carregá-las.
 """
 import argparse
 import logging
 import sys
 from pathlib import Path
-from pdf_text_extractor import CleanPDFExtractor, PDFBatchProcessor
-from pdf_text_extractor.config import Config
 
 
 def setup_logging(log_level: str = "INFO"):
     """Configura o sistema de logging."""
+    from pdf_text_extractor.config import Config
+    
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     
@@ -33,12 +37,25 @@ def process_single_file(pdf_path: str, output_path: str = None, config: dict = N
         output_path: Caminho opcional para salvar o resultado
         config: Configuração personalizada
     """
+    from pdf_text_extractor import CleanPDFExtractor
+    from pdf_text_extractor.config import Config
+    from pdf_text_extractor.writers import StreamingTextWriter
+    
     logger = logging.getLogger(__name__)
     logger.info(f"Processando arquivo único: {pdf_path}")
     
     extractor = CleanPDFExtractor(config or Config.get_config_dict())
     
     try:
+        if output_path and extractor.config.get("stream_pages"):
+            # Grava página a página, sem manter o texto completo em memória
+            output_file = Path(output_path)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            with StreamingTextWriter(output_file) as writer:
+                extractor.extract_to_writer(pdf_path, writer)
+            logger.info(f"Texto limpo salvo em: {output_path}")
+            return None
+        
         clean_text = extractor.extract_clean_text(pdf_path)
         
         if output_path:
@@ -71,6 +88,9 @@ def process_directory(input_dir: str, output_dir: str, config: dict = None, recu
         config: Configuração personalizada
         recursive: Processar subdiretórios
     """
+    from pdf_text_extractor import PDFBatchProcessor
+    from pdf_text_extractor.config import Config
+    
     logger = logging.getLogger(__name__)
     logger.info(f"Processando diretório: {input_dir}")
     
@@ -81,7 +101,9 @@ def process_directory(input_dir: str, output_dir: str, config: dict = None, recu
         
         # Exibe resumo
         successful = sum(1 for r in results if r["status"] == "success")
-        failed = sum(1 for r in results if r["status"] == "error")
+        failed = sum(1 for r in results if r["status"] in ("error", "timeout", "oom"))
+        interrupted = sum(1 for r in results if r["status"] in ("timeout", "oom"))
+        duplicates = sum(1 for r in results if r["status"] == "duplicate")
         
         print("\n" + "="*80)
         print("PROCESSAMENTO CONCLUÍDO")
@@ -89,6 +111,10 @@ def process_directory(input_dir: str, output_dir: str, config: dict = None, recu
         print(f"Total de arquivos: {len(results)}")
         print(f"Sucesso: {successful}")
         print(f"Falhas: {failed}")
+        if interrupted:
+            print(f"Interrompidos (tempo limite ou memória): {interrupted}")
+        if duplicates:
+            print(f"Duplicatas: {duplicates}")
         print(f"Relatório salvo em: {output_dir}/processing_report.json")
         print("="*80)
         
@@ -99,15 +125,159 @@ def process_directory(input_dir: str, output_dir: str, config: dict = None, recu
         raise
 
 
+def serve(argv: list):
+    """
+    Executa o servidor de extração (python main.py serve ...).
+    
+    Args:
+        argv: Argumentos após "serve"
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Servidor HTTP local de extração com pool de processos pré-aquecido"
+    )
+    
+    parser.add_argument("--host", help="Endereço de escuta (padrão: SERVER_HOST, 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="Porta de escuta (padrão: SERVER_PORT, 8765)")
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        help="Processos trabalhadores (padrão: MAX_WORKERS, 4)"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        help="Requisições em espera antes de responder 503 (padrão: SERVER_QUEUE_SIZE, 32)"
+    )
+    parser.add_argument(
+        "-t", "--template",
+        choices=["legal_docs", "corporate", "nlp_ready"],
+        help="Template de configuração pré-definido"
+    )
+    parser.add_argument("--cache-dir", help="Diretório do cache de resultados (padrão: CACHE_DIR)")
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="Nível de logging (padrão: INFO)"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    from pdf_text_extractor.config import Config
+    from pdf_text_extractor.server import ExtractionServer
+    
+    setup_logging(args.log_level)
+    
+    config = Config.get_template_config(args.template) if args.template else Config.get_config_dict()
+    if args.cache_dir:
+        config["cache_dir"] = args.cache_dir
+    
+    server = ExtractionServer(
+        config,
+        host=args.host or Config.SERVER_HOST,
+        port=args.port if args.port is not None else Config.SERVER_PORT,
+        workers=args.workers if args.workers is not None else Config.MAX_WORKERS,
+        queue_size=args.queue_size if args.queue_size is not None else Config.SERVER_QUEUE_SIZE,
+        max_request_mb=Config.SERVER_MAX_REQUEST_MB,
+    )
+    server.serve_forever()
+
+
+def watch(argv: list):
+    """
+    Monitora um diretório e processa os PDFs à medida que chegam (python main.py watch ...).
+    
+    Args:
+        argv: Argumentos após "watch"
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py watch",
+        description="Processa continuamente os PDFs novos e modificados de um diretório"
+    )
+    
+    parser.add_argument("input", nargs="?", help="Diretório monitorado (padrão: INPUT_DIR)")
+    parser.add_argument("-o", "--output", help="Diretório de saída (padrão: OUTPUT_DIR)")
+    parser.add_argument(
+        "-r", "--recursive",
+        action="store_true",
+        help="Monitorar também os subdiretórios"
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        help="Processos trabalhadores (padrão: MAX_WORKERS, 4)"
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        help="Intervalo entre varreduras, em segundos (padrão: WATCH_POLL_INTERVAL, 1)"
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        help="Segundos sem mudanças para considerar um PDF completo (padrão: WATCH_SETTLE_SECONDS, 2)"
+    )
+    parser.add_argument(
+        "-t", "--template",
+        choices=["legal_docs", "corporate", "nlp_ready"],
+        help="Template de configuração pré-definido"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["txt", "json", "csv", "jsonl", "parquet"],
+        default="txt",
+        help="Formato de saída (padrão: txt)"
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="Nível de logging (padrão: INFO)"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    from pdf_text_extractor.config import Config
+    from pdf_text_extractor.watcher import FolderWatcher
+    
+    setup_logging(args.log_level)
+    
+    config = Config.get_template_config(args.template) if args.template else Config.get_config_dict()
+    config["output_format"] = args.format
+    config.setdefault("max_workers", Config.MAX_WORKERS)
+    
+    watcher = FolderWatcher(
+        args.input or Config.INPUT_DIR,
+        args.output or Config.OUTPUT_DIR,
+        config,
+        workers=args.workers,
+        poll_interval=args.poll if args.poll is not None else Config.WATCH_POLL_INTERVAL,
+        settle_seconds=args.settle if args.settle is not None else Config.WATCH_SETTLE_SECONDS,
+        recursive=args.recursive,
+        max_retries=Config.WATCH_MAX_RETRIES,
+        report_interval=Config.WATCH_REPORT_INTERVAL,
+    )
+    watcher.run()
+
+
 def main():
     """Função principal do script."""
+    if sys.argv[1:2] == ["serve"]:
+        serve(sys.argv[2:])
+        return
+    
+    if sys.argv[1:2] == ["watch"]:
+        watch(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
         description="PDF Text Extractor - Sistema Avançado de Processamento Documental"
     )
     
     parser.add_argument(
         "input",
-        help="Arquivo PDF ou diretório de entrada"
+        help="Arquivo PDF, diretório de entrada ou arquivo zip/tar com PDFs (com -d)"
     )
     
     parser.add_argument(
@@ -127,6 +297,12 @@ def main():
         help="Processar subdiretórios recursivamente"
     )
     
+    parser.add_argument(
+        "--archives",
+        action="store_true",
+        help="Ler também os PDFs de arquivos zip/tar encontrados no diretório"
+    )
+    
     parser.add_argument(
         "-t", "--template",
         choices=["legal_docs", "corporate", "nlp_ready"],
@@ -145,11 +321,143 @@ def main():
         help="Preservar estrutura do documento"
     )
     
+    parser.add_argument(
+        "--header-detection",
+        choices=["regex", "repeated"],
+        help=(
+            "Remoção de cabeçalhos e rodapés: padrões regex ou linhas repetidas "
+            "entre páginas (padrão: HEADER_DETECTION, regex)"
+        )
+    )
+    
+    parser.add_argument(
+        "--crop-top",
+        type=float,
+        help="Altura, em pontos, da faixa de cabeçalho excluída antes da extração (padrão: CROP_TOP, 0)"
+    )
+    
+    parser.add_argument(
+        "--crop-bottom",
+        type=float,
+        help="Altura, em pontos, da faixa de rodapé excluída antes da extração (padrão: CROP_BOTTOM, 0)"
+    )
+    
+    parser.add_argument(
+        "--crop-learn",
+        type=int,
+        metavar="PAGES",
+        help=(
+            "Aprender as faixas de cabeçalho e rodapé nas primeiras PAGES páginas "
+            "de cada documento; 0 desabilita (padrão: CROP_LEARN_PAGES, 0)"
+        )
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Extrair e gravar página a página, com uso de memória limitado"
+    )
+    
+    parser.add_argument(
+        "--pipeline",
+        type=int,
+        metavar="PAGES",
+        help=(
+            "Com --stream, limpar e gravar as páginas em threads próprias, "
+            "com filas de PAGES páginas; 0 desabilita (padrão: PIPELINE_DEPTH, 0)"
+        )
+    )
+    
+    parser.add_argument(
+        "--time-pages",
+        action="store_true",
+        help="Registrar no relatório o tempo de cada etapa por página"
+    )
+    
+    parser.add_argument(
+        "--page-threshold",
+        type=int,
+        help=(
+            "Extrair em paralelo por página os PDFs com pelo menos este número "
+            "de páginas; 0 desabilita (padrão: PAGE_PARALLEL_THRESHOLD, 500)"
+        )
+    )
+    
+    parser.add_argument(
+        "--ocr",
+        action="store_true",
+        help="Aplicar OCR (Tesseract) às páginas sem camada de texto"
+    )
+    
+    parser.add_argument(
+        "--ocr-dpi",
+        type=int,
+        help="Resolução da renderização das páginas para OCR (padrão: OCR_DPI, 300)"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retomar o lote: pular arquivos inalterados já processados e repetir os que falharam"
+    )
+    
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Tempo máximo por documento, em segundos, em processo isolado (padrão: DOC_TIMEOUT, 0 = sem limite)"
+    )
+    
+    parser.add_argument(
+        "--memory-limit",
+        type=float,
+        metavar="MB",
+        help="Limite de memória (RLIMIT_AS) de cada processo isolado (padrão: MEMORY_LIMIT_MB, 0 = sem limite)"
+    )
+    
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        metavar="N",
+        help="Reciclar cada processo isolado após N documentos (padrão: MAX_TASKS_PER_WORKER, 0 = nunca)"
+    )
+    
+    parser.add_argument(
+        "--schedule",
+        choices=["lpt", "input"],
+        help=(
+            "Ordem de despacho em paralelo: lpt, maior custo estimado primeiro, "
+            "ou input, ordem dos arquivos (padrão: SCHEDULE, lpt)"
+        )
+    )
+    
+    parser.add_argument(
+        "--dedup",
+        choices=["none", "exact", "near"],
+        help=(
+            "Duplicatas no lote: exact extrai uma única vez os arquivos idênticos; "
+            "near também marca quase duplicatas pelo texto limpo (padrão: DEDUP, none)"
+        )
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        help="Diretório do cache de resultados (padrão: CACHE_DIR)"
+    )
+    
     parser.add_argument(
         "--format",
-        choices=["txt", "json", "csv"],
+        choices=["txt", "json", "csv", "jsonl", "parquet"],
         default="txt",
-        help="Formato de saída (padrão: txt)"
+        help=(
+            "Formato de saída (padrão: txt); jsonl e parquet gravam todos os "
+            "documentos do lote em arquivos consolidados"
+        )
+    )
+    
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        help="Número de processos no processamento em lote (padrão: MAX_WORKERS, 4)"
     )
     
     parser.add_argument(
@@ -161,6 +469,9 @@ def main():
     
     args = parser.parse_args()
     
+    # Carrega a configuração (e o .env) só depois de validar os argumentos
+    from pdf_text_extractor.config import Config
+    
     # Configura logging
     setup_logging(args.log_level)
     logger = logging.getLogger(__name__)
@@ -178,7 +489,74 @@ def main():
     if args.preserve_structure:
         config["preserve_structure"] = True
     
+    if args.page_threshold is not None:
+        config["page_parallel_threshold"] = args.page_threshold
+    
+    if args.ocr:
+        config["ocr_enabled"] = True
+    
+    if args.ocr_dpi is not None:
+        config["ocr_dpi"] = args.ocr_dpi
+    
+    if args.resume:
+        config["resume"] = True
+    
+    if args.archives:
+        config["read_archives"] = True
+    
+    if args.timeout is not None:
+        config["doc_timeout"] = args.timeout
+    
+    if args.memory_limit is not None:
+        config["memory_limit_mb"] = args.memory_limit
+    
+    if args.recycle_after is not None:
+        config["max_tasks_per_worker"] = args.recycle_after
+    
+    if args.schedule:
+        config["schedule"] = args.schedule
+    
+    if args.dedup:
+        config["dedup"] = args.dedup
+    
+    if args.cache_dir:
+        config["cache_dir"] = args.cache_dir
+    
+    if args.header_detection:
+        config["header_detection"] = args.header_detection
+    
+    if args.crop_top is not None:
+        config["crop_top"] = args.crop_top
+    
+    if args.crop_bottom is not None:
+        config["crop_bottom"] = args.crop_bottom
+    
+    if args.crop_learn is not None:
+        config["crop_learn_pages"] = args.crop_learn
+    
+    if args.stream:
+        config["stream_pages"] = True
+    
+    if args.pipeline is not None:
+        config["pipeline_depth"] = args.pipeline
+    
+    if args.time_pages:
+        config["time_pages"] = True
+    
     config["output_format"] = args.format
+    config.setdefault("max_workers", Config.MAX_WORKERS)
+    config.setdefault("batch_size", Config.BATCH_SIZE)
+    config.setdefault("page_parallel_threshold", Config.PAGE_PARALLEL_THRESHOLD)
+    config.setdefault("shard_max_records", Config.SHARD_MAX_RECORDS)
+    config.setdefault("ocr_dpi", Config.OCR_DPI)
+    config.setdefault("ocr_lang", Config.OCR_LANG)
+    config.setdefault("ocr_min_chars", Config.OCR_MIN_CHARS)
+    config.setdefault("ocr_workers", Config.OCR_WORKERS)
+    config.setdefault("write_buffer_records", Config.WRITE_BUFFER_RECORDS)
+    config.setdefault("near_dup_threshold", Config.NEAR_DUP_THRESHOLD)
+    
+    if args.workers is not None:
+        config["max_workers"] = args.workers
     
     # Processa
     try:
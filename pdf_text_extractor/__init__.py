@@ -9,12 +9,46 @@ e códigos de documento.
 __version__ = "1.0.0"
 __author__ = "Seu Nome"
 
-from .cleaner import PDFTextCleaner
-from .extractor import CleanPDFExtractor
-from .batch_processor import PDFBatchProcessor
+import importlib
+from typing import TYPE_CHECKING
+
+# Classes públicas e os módulos que as definem. Cada módulo só é importado
+# no primeiro acesso à classe, de modo que "import pdf_text_extractor" não
+# carrega o pdfplumber nem o pdfminer.
+_LAZY_EXPORTS = {
+    "PDFTextCleaner": ".cleaner",
+    "CleanPDFExtractor": ".extractor",
+    "PDFDocumentSession": ".document",
+    "PDFBatchProcessor": ".batch_processor",
+    "PDFSource": ".sources",
+}
+
+if TYPE_CHECKING:
+    from .cleaner import PDFTextCleaner
+    from .document import PDFDocumentSession
+    from .extractor import CleanPDFExtractor
+    from .batch_processor import PDFBatchProcessor
+    from .sources import PDFSource
 
 __all__ = [
     "PDFTextCleaner",
     "CleanPDFExtractor",
+    "PDFDocumentSession",
     "PDFBatchProcessor",
+    "PDFSource",
 ]
+
+
+def __getattr__(name):
+    """Importa sob demanda as classes públicas do pacote."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -2,16 +2,145 @@
 Módulo de processamento em lote de PDFs.
 """
 import logging
-import json
-import csv
+import tarfile
+import tempfile
+import time
+from concurrent.futures import Executor
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, AsyncIterator, Callable, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
-import pandas as pd
+from .dedup import MinHashSignature, NearDuplicateIndex, find_exact_duplicates
 from .extractor import CleanPDFExtractor
+from .isolation import IsolatedWorkerPool, is_allocation_failure
+from .manifest import RunManifest
+from .report import StreamingReport
+from .scheduling import CostEstimator
+from .sources import PDFSource, as_source, is_archive, is_random_access, iter_archive_members, list_archive_members
+from .writers import CONSOLIDATED_FORMATS, ShardedRecordWriter, StreamingTextWriter
 
 logger = logging.getLogger(__name__)
 
+# Processador mantido por processo trabalhador no modo paralelo
+_worker_processor = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    """
+    Inicializa o processador usado por um processo trabalhador.
+    
+    Os trabalhadores já ocupam os núcleos com um documento cada: a extração
+    paralela por página usa um único processo (sem pools aninhados), salvo
+    page_workers explícito na configuração.
+    
+    Args:
+        config: Configuração repassada pelo processo principal
+    """
+    global _worker_processor
+    _worker_processor = PDFBatchProcessor({"page_workers": 1, **(config or {})})
+
+
+def _process_batch_in_worker(pdf_files: List[Path], output_dir: Path) -> List[Dict[str, Any]]:
+    """
+    Processa um lote de arquivos dentro de um processo trabalhador.
+    
+    Args:
+        pdf_files: Arquivos PDF do lote
+        output_dir: Diretório de saída
+    
+    Returns:
+        Lista de resultados, na mesma ordem dos arquivos
+    """
+    return [_worker_processor._process_file_safely(pdf_file, output_dir) for pdf_file in pdf_files]
+
+
+def _process_file_in_worker(pdf_file: Path, output_dir: Path) -> Dict[str, Any]:
+    """
+    Processa um único arquivo dentro de um processo trabalhador.
+    
+    Args:
+        pdf_file: Arquivo PDF
+        output_dir: Diretório de saída
+    
+    Returns:
+        Resultado do processamento
+    """
+    return _worker_processor._process_file_safely(pdf_file, output_dir)
+
+
+def _error_result(pdf_file: Any, error: str, status: str = "error") -> Dict[str, Any]:
+    """
+    Monta a linha de resultado de um arquivo que falhou.
+    
+    Args:
+        pdf_file: Arquivo PDF ou membro de arquivo compactado
+        error: Descrição do erro
+        status: "error", ou "timeout" e "oom" para arquivos interrompidos
+    
+    Returns:
+        Linha de resultado com o status da falha
+    """
+    return {
+        "filename": pdf_file.name,
+        **as_source(pdf_file).report_fields(),
+        "status": status,
+        "error": error,
+    }
+
+
+def _duplicate_result(pdf_file: Any, canonical: Any, canonical_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Monta a linha de resultado de uma duplicata exata a partir do resultado
+    do arquivo original, cuja saída é reaproveitada.
+    
+    Args:
+        pdf_file: Arquivo duplicado
+        canonical: Arquivo original com o mesmo conteúdo
+        canonical_result: Resultado do arquivo original
+    
+    Returns:
+        Linha de resultado com status "duplicate" (ou o erro do original)
+    """
+    result = {
+        key: value for key, value in canonical_result.items()
+        if not key.startswith("time_")
+        and key not in ("archive", "member", "page_timings", "cache_hit", "near_duplicate_of", "similarity")
+    }
+    result.update({
+        "filename": pdf_file.name,
+        **as_source(pdf_file).report_fields(),
+        "status": "duplicate" if canonical_result["status"] == "success" else canonical_result["status"],
+        "duplicate_of": as_source(canonical).identity,
+        "processing_time": 0.0,
+    })
+    return result
+
+
+def _iter_batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Divide uma sequência em lotes de tamanho fixo, consumindo-a sob demanda."""
+    items = iter(items)
+    while True:
+        batch = list(islice(items, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _progress(done: int, total: Optional[int]) -> str:
+    """Contador de progresso para os logs ("3/10", ou "3" com total desconhecido)."""
+    return f"{done}/{total}" if total is not None else str(done)
+
+
+class _TeeWriter:
+    """Escritor que repassa cada bloco a vários escritores."""
+    
+    def __init__(self, *writers):
+        self.writers = writers
+    
+    def write(self, text: str):
+        for writer in self.writers:
+            writer.write(text)
+
 
 class PDFBatchProcessor:
     """
@@ -29,15 +158,58 @@ class PDFBatchProcessor:
         self.config = config or {}
         self.extractor = CleanPDFExtractor(config)
         self.output_format = self.config.get("output_format", "txt")
+        self.max_workers = max(1, int(self.config.get("max_workers", 1)))
+        self.batch_size = max(1, int(self.config.get("batch_size", 10)))
+        self.stream_pages = self.config.get("stream_pages", False)
+        self.resume = self.config.get("resume", False)
+        self.read_archives = self.config.get("read_archives", False)
         self.results = []
         
+        # Tar comprimido: membros lidos em fluxo para a memória; os maiores que
+        # archive_spool_threshold_mb vão para cópias temporárias em disco
+        self.archive_spool_above = int(float(self.config.get("archive_spool_threshold_mb", 64)) * 1024 * 1024)
+        self._spool_dir: Optional[tempfile.TemporaryDirectory] = None
+        
+        # Isolamento de documentos patológicos: tempo limite e limite de
+        # memória por documento e reciclagem dos processos (0 desabilita)
+        self.doc_timeout = self.config.get("doc_timeout", 0)
+        self.memory_limit_mb = self.config.get("memory_limit_mb", 0)
+        self.max_tasks_per_worker = self.config.get("max_tasks_per_worker", 0)
+        self.isolated = bool(self.doc_timeout or self.memory_limit_mb or self.max_tasks_per_worker)
+        
+        # Duplicatas: "exact" agrupa arquivos idênticos antes da extração;
+        # "near" também marca quase duplicatas pelo texto limpo (MinHash/LSH)
+        self.dedup = self.config.get("dedup", "none")
+        self.near_dedup = self.dedup == "near"
+        self.near_dup_threshold = self.config.get("near_dup_threshold", 0.8)
+        self._near_index: Optional[NearDuplicateIndex] = None
+        # Documentos indexados: identificação -> (arquivo, linha do relatório, resultado)
+        self._near_rows: Dict[str, Tuple[Path, int, Dict[str, Any]]] = {}
+        
+        # Ordem de despacho no modo paralelo: "lpt" (maior custo estimado
+        # primeiro) ou "input" (ordem em que os arquivos foram encontrados)
+        self.schedule = self.config.get("schedule", "lpt")
+        self.cost_estimator = CostEstimator(
+            seconds_per_page=self.config.get("schedule_seconds_per_page", 0.05),
+            seconds_per_mb=self.config.get("schedule_seconds_per_mb", 0.1),
+        )
+        
+        # Saída consolidada (jsonl/parquet): registros gravados pelo processo principal
+        self.consolidated = self.output_format in CONSOLIDATED_FORMATS
+        self.shard_max_records = self.config.get("shard_max_records", 10000)
+        self.write_buffer_records = self.config.get("write_buffer_records", 100)
+        self._record_writer: Optional[ShardedRecordWriter] = None
+        # Registros ainda não legíveis no disco e sua posição de gravação
+        self._unflushed: List[Tuple[Path, Dict[str, Any], int]] = []
+        
         logger.info("PDFBatchProcessor inicializado")
     
     def process_directory(
         self, 
         input_dir: str, 
         output_dir: str,
-        recursive: bool = False
+        recursive: bool = False,
+        workers: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Processa todos os PDFs em um diretório.
@@ -46,58 +218,755 @@ class PDFBatchProcessor:
             input_dir: Diretório de entrada com PDFs
             output_dir: Diretório de saída para textos limpos
             recursive: Se True, processa subdiretórios recursivamente
-            
+            workers: Número de processos trabalhadores (padrão: max_workers
+                da configuração). Com 1, o processamento é sequencial.
+        
         Returns:
             Lista de resultados do processamento
         """
-        input_path = Path(input_dir)
         output_path = Path(output_dir)
         
         # Cria diretório de saída se não existir
         output_path.mkdir(parents=True, exist_ok=True)
         
-        # Encontra todos os PDFs
-        if recursive:
-            pdf_files = list(input_path.rglob("*.pdf"))
-        else:
-            pdf_files = list(input_path.glob("*.pdf"))
+        pdf_files, archives = self._find_pdf_files(input_dir, recursive)
+        if not pdf_files and not archives:
+            return []
         
-        logger.info(f"Encontrados {len(pdf_files)} arquivos PDF em {input_dir}")
+        # Manifesto gravado a cada arquivo; com resume, reaproveita resultados
+        manifest = RunManifest(output_path / RunManifest.FILENAME, resume=self.resume)
+        previous_results, pending_files = self._split_completed(manifest, pdf_files)
+        unique_files, duplicates = self._split_duplicates(pending_files)
+        self._open_record_writer(output_path)
         
-        if not pdf_files:
-            logger.warning("Nenhum arquivo PDF encontrado")
-            return []
+        # Relatório gravado à medida que os arquivos terminam
+        report = StreamingReport(output_path)
+        for result in previous_results.values():
+            report.add(result)
+        
+        num_workers = max(1, workers if workers is not None else self.max_workers)
+        if not archives:
+            num_workers = min(num_workers, max(1, len(unique_files)))
         
         # Processa cada PDF
-        results = []
         start_time = datetime.now()
         
-        for idx, pdf_file in enumerate(pdf_files, 1):
-            logger.info(f"Processando [{idx}/{len(pdf_files)}]: {pdf_file.name}")
-            
-            try:
-                result = self._process_single_file(pdf_file, output_path)
-                results.append(result)
-                
-            except Exception as e:
-                logger.error(f"Erro ao processar {pdf_file.name}: {str(e)}")
-                results.append({
-                    "filename": pdf_file.name,
-                    "status": "error",
-                    "error": str(e),
-                })
+        # Em paralelo, os documentos mais caros são despachados primeiro
+        costs: Dict[Path, float] = {}
+        if num_workers > 1 and self.schedule == "lpt":
+            unique_files, costs = self.cost_estimator.order_largest_first(unique_files)
+        
+        processed: Dict[Any, Dict[str, Any]] = {}
         
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
+        def record_result(pdf_file: Path, result: Dict[str, Any]):
+            if pdf_file in costs:
+                result["estimated_cost"] = costs[pdf_file]
+            signature = result.pop("minhash", None)
+            self._record_result(manifest, pdf_file, result)
+            row = report.add(result)
+            self._index_near_duplicate(pdf_file, result, signature, row)
+            processed[pdf_file] = result
+            as_source(pdf_file).release()
         
-        # Gera relatório consolidado
-        self._generate_report(results, output_path, processing_time)
+        # Membros de tar comprimido lidos em fluxo depois da lista
+        streamed_files: List[Any] = []
+        queue = chain(unique_files, self._stream_archives(
+            archives, manifest, streamed_files, previous_results, duplicates, report.add
+        ))
+        total = None if archives else len(unique_files)
+        
+        try:
+            if self.isolated:
+                self._process_isolated(queue, output_path, num_workers, on_result=record_result)
+            elif num_workers > 1:
+                self._process_parallel(
+                    queue, output_path, num_workers, on_result=record_result,
+                    batch_size=1 if costs else None,
+                )
+            else:
+                for idx, pdf_file in enumerate(queue, 1):
+                    logger.info(f"Processando [{_progress(idx, total)}]: {pdf_file.name}")
+                    record_result(pdf_file, self._process_file_safely(pdf_file, output_path))
+            
+            # Fecha os shards antes das duplicatas, que apontam para eles
+            self._close_record_writer(manifest)
+            
+            # Duplicatas exatas reaproveitam a saída já gravada do original
+            for pdf_file, canonical in duplicates.items():
+                record_result(pdf_file, _duplicate_result(pdf_file, canonical, processed[canonical]))
+            
+            near_duplicates = self._resolve_near_duplicates(manifest)
+            manifest.compact()
+            
+            end_time = datetime.now()
+            processing_time = (end_time - start_time).total_seconds()
+            
+            # Finaliza o relatório consolidado a partir dos agregados
+            report.finalize(
+                processing_time, skipped=len(previous_results) if self.resume else None,
+                annotations=near_duplicates,
+            )
+        finally:
+            self._close_record_writer(manifest)
+            manifest.close()
+            report.close()
+            self.extractor.close()
+            self._remove_spool()
+        
+        # Consolida resultados anteriores e novos, na ordem dos arquivos
+        results = [
+            previous_results[pdf_file] if pdf_file in previous_results else processed[pdf_file]
+            for pdf_file in pdf_files + streamed_files
+        ]
         
         self.results = results
         logger.info(f"Processamento concluído em {processing_time:.2f} segundos")
         
         return results
     
+    async def process_directory_async(
+        self,
+        input_dir: str,
+        output_dir: str,
+        recursive: bool = False,
+        concurrency: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Processa todos os PDFs em um diretório sem bloquear o event loop.
+        
+        A extração e a gravação da saída de cada arquivo rodam em um
+        executor; o manifesto e as linhas do relatório são gravados em
+        threads. Os resultados são entregues à medida que os arquivos
+        terminam, fora da ordem de entrada; o relatório consolidado é
+        finalizado ao final. Com dedup=near, as quase duplicatas só são
+        conhecidas ao final do lote: os campos near_duplicate_of e
+        similarity são acrescentados aos resultados já entregues quando a
+        iteração termina.
+        
+        Args:
+            input_dir: Diretório de entrada com PDFs
+            output_dir: Diretório de saída para textos limpos
+            recursive: Se True, processa subdiretórios recursivamente
+            concurrency: Número máximo de arquivos em processamento ao
+                mesmo tempo (padrão: max_workers da configuração)
+            executor: Executor a usar, ex.: ThreadPoolExecutor (padrão: um
+                pool de processos próprio com concurrency processos)
+        
+        Yields:
+            Resultado de cada arquivo, incluindo os reaproveitados por resume
+        """
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+        
+        loop = asyncio.get_running_loop()
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        pdf_files, archives = await loop.run_in_executor(None, self._find_pdf_files, input_dir, recursive)
+        if not pdf_files and not archives:
+            return
+        
+        manifest = await loop.run_in_executor(
+            None, RunManifest, output_path / RunManifest.FILENAME, self.resume
+        )
+        previous_results, pending_files = await loop.run_in_executor(
+            None, self._split_completed, manifest, pdf_files
+        )
+        unique_files, duplicates = await loop.run_in_executor(
+            None, self._split_duplicates, pending_files
+        )
+        self._open_record_writer(output_path)
+        report = await loop.run_in_executor(None, StreamingReport, output_path)
+        
+        concurrency = max(1, concurrency if concurrency is not None else self.max_workers)
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(
+                max_workers=concurrency,
+                initializer=_init_worker,
+                initargs=(self.config,),
+            )
+        
+        logger.info(
+            f"Modo assíncrono: {len(unique_files)} arquivos, "
+            f"até {concurrency} em processamento"
+        )
+        
+        start_time = datetime.now()
+        processed = 0
+        running: Dict[asyncio.Future, Path] = {}
+        
+        costs: Dict[Path, float] = {}
+        if concurrency > 1 and self.schedule == "lpt":
+            unique_files, costs = await loop.run_in_executor(
+                None, self.cost_estimator.order_largest_first, unique_files
+            )
+        # Membros de tar comprimido lidos em fluxo, em thread, depois da lista
+        resumed: List[Dict[str, Any]] = []
+        queue = chain(unique_files, self._stream_archives(
+            archives, manifest, [], previous_results, duplicates, resumed.append
+        ))
+        total = None if archives else len(unique_files)
+        finished: Dict[Any, Dict[str, Any]] = {}
+        
+        async def next_file():
+            return await loop.run_in_executor(None, next, queue, None)
+        
+        def submit(pdf_file: Path):
+            if own_executor:
+                future = loop.run_in_executor(executor, _process_file_in_worker, pdf_file, output_path)
+            else:
+                future = loop.run_in_executor(executor, self._process_file_safely, pdf_file, output_path)
+            running[future] = pdf_file
+        
+        try:
+            for pdf_file in pdf_files:
+                if pdf_file in previous_results:
+                    report.add(previous_results[pdf_file])
+                    yield previous_results[pdf_file]
+            
+            # Mantém no máximo concurrency arquivos em andamento
+            while len(running) < concurrency:
+                next_pdf = await next_file()
+                if next_pdf is None:
+                    break
+                submit(next_pdf)
+            
+            while running or resumed:
+                # Resultados reaproveitados de membros lidos em fluxo
+                while resumed:
+                    result = resumed.pop(0)
+                    await loop.run_in_executor(None, report.add, result)
+                    yield result
+                if not running:
+                    break
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                
+                for future in done:
+                    pdf_file = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Falha do próprio processo trabalhador (ex.: processo encerrado)
+                        logger.error(f"Erro ao processar {pdf_file.name}: {str(e)}")
+                        result = _error_result(pdf_file, str(e))
+                    
+                    next_pdf = await next_file()
+                    if next_pdf is not None:
+                        submit(next_pdf)
+                    
+                    if pdf_file in costs:
+                        result["estimated_cost"] = costs[pdf_file]
+                    signature = result.pop("minhash", None)
+                    await loop.run_in_executor(None, self._record_result, manifest, pdf_file, result)
+                    row = await loop.run_in_executor(None, report.add, result)
+                    self._index_near_duplicate(pdf_file, result, signature, row)
+                    as_source(pdf_file).release()
+                    finished[pdf_file] = result
+                    processed += 1
+                    logger.info(f"Processados [{_progress(processed, total)}]")
+                    yield result
+            
+            # Fecha os shards antes das duplicatas, que apontam para eles
+            await loop.run_in_executor(None, self._close_record_writer, manifest)
+            
+            # Duplicatas exatas reaproveitam a saída já gravada do original
+            for pdf_file, canonical in duplicates.items():
+                result = _duplicate_result(pdf_file, canonical, finished[canonical])
+                await loop.run_in_executor(None, manifest.record, pdf_file, result)
+                await loop.run_in_executor(None, report.add, result)
+                yield result
+            
+            near_duplicates = await loop.run_in_executor(None, self._resolve_near_duplicates, manifest)
+            await loop.run_in_executor(None, manifest.compact)
+            
+            processing_time = (datetime.now() - start_time).total_seconds()
+            await loop.run_in_executor(
+                None, report.finalize, processing_time,
+                len(previous_results) if self.resume else None, near_duplicates,
+            )
+        finally:
+            for future in running:
+                future.cancel()
+            self._close_record_writer(manifest)
+            manifest.close()
+            report.close()
+            self.extractor.close()
+            self._remove_spool()
+            if own_executor:
+                executor.shutdown(wait=False)
+        
+        logger.info(f"Processamento concluído em {processing_time:.2f} segundos")
+    
+    def _open_record_writer(self, output_dir: Path):
+        """
+        Abre o escritor de shards quando o formato de saída é consolidado.
+        
+        Args:
+            output_dir: Diretório de saída
+        """
+        self._unflushed = []
+        if self.consolidated:
+            self._record_writer = ShardedRecordWriter(
+                output_dir,
+                self.output_format,
+                max_records=self.shard_max_records,
+                buffer_records=self.write_buffer_records,
+            )
+    
+    def _record_result(self, manifest: RunManifest, pdf_file: Path, result: Dict[str, Any]):
+        """
+        Registra o resultado de um arquivo no manifesto e, na saída
+        consolidada, acrescenta seu registro ao shard atual.
+        
+        Na saída consolidada, a entrada do manifesto só é gravada depois que
+        o registro pode ser lido do disco (no Parquet, com o shard fechado),
+        para que uma execução retomada não pule documentos que ficaram no
+        buffer ou em um shard sem rodapé.
+        
+        Args:
+            manifest: Manifesto da execução
+            pdf_file: Arquivo PDF
+            result: Linha de resultado; o registro é removido dela
+        """
+        record = result.pop("record", None)
+        if record is None:
+            manifest.record(pdf_file, result)
+            return
+        
+        start = time.perf_counter()
+        result["output_file"] = str(self._record_writer.write(record))
+        result["time_write"] = round(time.perf_counter() - start, 6)
+        position = self._record_writer.records_written + self._record_writer.pending_records
+        self._unflushed.append((pdf_file, result, position))
+        
+        if self._record_writer.pending_records == 0:
+            self._flush_records(manifest)
+    
+    def _flush_records(self, manifest: RunManifest):
+        """
+        Grava os registros pendentes e as entradas de manifesto dos que já
+        podem ser lidos do disco (no Parquet, os dos shards fechados).
+        
+        Args:
+            manifest: Manifesto da execução
+        """
+        if self._record_writer is None:
+            return
+        self._record_writer.flush()
+        
+        durable = self._record_writer.durable_records
+        count = 0
+        for pdf_file, result, position in self._unflushed:
+            if position > durable:
+                break
+            manifest.record(pdf_file, result)
+            count += 1
+        del self._unflushed[:count]
+    
+    def _close_record_writer(self, manifest: Optional[RunManifest] = None):
+        """
+        Fecha o escritor de shards, se aberto.
+        
+        Args:
+            manifest: Manifesto onde gravar as entradas dos registros que o
+                fechamento tornou legíveis
+        """
+        if self._record_writer is not None:
+            self._record_writer.close()
+            if manifest is not None:
+                self._flush_records(manifest)
+            self._record_writer = None
+        self._unflushed = []
+    
+    def _find_pdf_files(self, input_dir: str, recursive: bool = False) -> Tuple[List[Any], List[Path]]:
+        """
+        Encontra os PDFs de um diretório.
+        
+        Se input_dir for um arquivo zip ou tar, seus PDFs são processados
+        diretamente, sem extração para o disco. Com read_archives, os
+        arquivos compactados encontrados no diretório também são lidos.
+        Os membros de zip e tar sem compressão são listados aqui; os tar
+        comprimidos são apenas retornados, para serem lidos em fluxo
+        durante o processamento (veja _stream_archives).
+        
+        Args:
+            input_dir: Diretório de entrada com PDFs, ou arquivo compactado
+            recursive: Se True, inclui subdiretórios
+        
+        Returns:
+            Tupla (arquivos PDF (Path) e membros de arquivos compactados
+            (PDFSource); tar comprimidos a ler em fluxo)
+        """
+        input_path = Path(input_dir)
+        
+        if input_path.is_file() and is_archive(input_path):
+            archives = [input_path]
+            pdf_files = []
+        else:
+            # Encontra todos os PDFs
+            glob = input_path.rglob if recursive else input_path.glob
+            pdf_files = list(glob("*.pdf"))
+            archives = []
+            if self.read_archives:
+                archives = sorted(
+                    path for path in glob("*") if path.is_file() and is_archive(path)
+                )
+        
+        streamed = []
+        for archive in archives:
+            if is_random_access(archive):
+                pdf_files.extend(list_archive_members(archive))
+            else:
+                streamed.append(archive)
+        
+        logger.info(f"Encontrados {len(pdf_files)} arquivos PDF em {input_dir}")
+        if streamed:
+            logger.info(f"{len(streamed)} tar comprimidos serão lidos em fluxo")
+        
+        if not pdf_files and not streamed:
+            logger.warning("Nenhum arquivo PDF encontrado")
+        
+        return pdf_files, streamed
+    
+    def _stream_archives(
+        self,
+        archives: List[Path],
+        manifest: RunManifest,
+        listed: List[Any],
+        previous_results: Dict[Any, Dict[str, Any]],
+        duplicates: Dict[Any, Any],
+        on_previous: Callable[[Dict[str, Any]], Any]
+    ) -> Iterator[PDFSource]:
+        """
+        Lê os tar comprimidos em uma única passagem e entrega os membros a
+        processar, com o conteúdo em memória.
+        
+        Cada membro só é lido quando pedido ao iterador, de modo que a
+        leitura antecipada fica limitada aos documentos em andamento; os
+        maiores que archive_spool_threshold_mb são copiados para um
+        diretório temporário. Membros já processados (com resume) e
+        duplicatas exatas de membros anteriores (com dedup) são separados
+        aqui, como _split_completed e _split_duplicates fazem com a lista.
+        
+        Args:
+            archives: Tar comprimidos
+            manifest: Manifesto da execução
+            listed: Recebe todos os membros lidos, na ordem dos arquivos
+            previous_results: Recebe os resultados reaproveitados
+            duplicates: Recebe duplicata -> membro original
+            on_previous: Função chamada com cada resultado reaproveitado
+        
+        Yields:
+            Membros a processar; a cópia em memória é liberada com release
+            depois que o resultado é registrado
+        """
+        if not archives:
+            return
+        if self._spool_dir is None:
+            self._spool_dir = tempfile.TemporaryDirectory(prefix="pdf_extractor_")
+        canonical_by_hash: Dict[str, PDFSource] = {}
+        
+        for archive in archives:
+            count = 0
+            try:
+                for source in iter_archive_members(
+                    archive, load=True, spool_dir=Path(self._spool_dir.name),
+                    spool_above=self.archive_spool_above,
+                ):
+                    count += 1
+                    listed.append(source)
+                    
+                    previous = manifest.get_completed_result(source) if self.resume else None
+                    if previous is not None:
+                        previous_results[source] = previous
+                        on_previous(previous)
+                        source.release()
+                        continue
+                    
+                    if self.dedup in ("exact", "near"):
+                        canonical = canonical_by_hash.setdefault(source.sha256(), source)
+                        if canonical is not source:
+                            duplicates[source] = canonical
+                            source.release()
+                            continue
+                    
+                    yield source
+            except (OSError, tarfile.TarError) as e:
+                logger.error(f"Erro ao ler o arquivo compactado {archive}: {str(e)}")
+            
+            logger.info(f"Lidos {count} PDFs de {archive}")
+    
+    def _remove_spool(self):
+        """Remove as cópias temporárias dos membros grandes de tar comprimido."""
+        if self._spool_dir is not None:
+            self._spool_dir.cleanup()
+            self._spool_dir = None
+    
+    def _split_completed(
+        self,
+        manifest: RunManifest,
+        pdf_files: List[Path]
+    ) -> Tuple[Dict[Path, Dict[str, Any]], List[Path]]:
+        """
+        Separa os arquivos já processados em execuções anteriores (com resume).
+        
+        Args:
+            manifest: Manifesto da execução
+            pdf_files: Arquivos PDF encontrados
+        
+        Returns:
+            Tupla (resultados anteriores por arquivo; arquivos a processar)
+        """
+        if not self.resume:
+            return {}, pdf_files
+        
+        previous_results = {}
+        pending_files = []
+        for pdf_file in pdf_files:
+            previous = manifest.get_completed_result(pdf_file)
+            if previous is not None:
+                previous_results[pdf_file] = previous
+            else:
+                pending_files.append(pdf_file)
+        
+        logger.info(
+            f"Retomada: {len(previous_results)} arquivos inalterados já processados, "
+            f"{len(pending_files)} a processar"
+        )
+        
+        return previous_results, pending_files
+    
+    def _split_duplicates(self, pdf_files: List[Path]) -> Tuple[List[Path], Dict[Path, Path]]:
+        """
+        Separa as duplicatas exatas, que não são extraídas (com dedup).
+        
+        Também reinicia o índice de quase duplicatas da execução.
+        
+        Args:
+            pdf_files: Arquivos PDF a processar
+        
+        Returns:
+            Tupla (arquivos a extrair; duplicata -> arquivo original)
+        """
+        self._near_index = NearDuplicateIndex(self.near_dup_threshold) if self.near_dedup else None
+        self._near_rows = {}
+        
+        if self.dedup not in ("exact", "near"):
+            return pdf_files, {}
+        
+        return find_exact_duplicates(pdf_files)
+    
+    def _index_near_duplicate(
+        self,
+        pdf_file: Path,
+        result: Dict[str, Any],
+        signature: Optional[List[int]],
+        row: int
+    ):
+        """
+        Indexa a assinatura MinHash de um arquivo processado (com dedup=near).
+        
+        Args:
+            pdf_file: Arquivo PDF
+            result: Linha de resultado, marcada depois por _resolve_near_duplicates
+            signature: Assinatura removida da linha de resultado (None sem texto)
+            row: Posição da linha no relatório
+        """
+        if signature is None or self._near_index is None:
+            return
+        
+        key = as_source(pdf_file).identity
+        self._near_index.add(key, signature)
+        self._near_rows[key] = (pdf_file, row, result)
+    
+    def _resolve_near_duplicates(self, manifest: RunManifest) -> Dict[int, Dict[str, Any]]:
+        """
+        Marca as quase duplicatas ao final do lote.
+        
+        Os grupos são formados só depois que todos os arquivos terminaram,
+        e o original de cada grupo é o de menor identificação: o resultado
+        não depende da ordem de conclusão no processamento paralelo. As
+        linhas de resultado marcadas são atualizadas e regravadas no
+        manifesto.
+        
+        Args:
+            manifest: Manifesto da execução
+        
+        Returns:
+            Posição da linha no relatório -> campos near_duplicate_of e similarity
+        """
+        if self._near_index is None:
+            return {}
+        
+        annotations = {}
+        for key, (canonical, similarity) in self._near_index.resolve().items():
+            pdf_file, row, result = self._near_rows[key]
+            fields = {"near_duplicate_of": canonical, "similarity": similarity}
+            result.update(fields)
+            manifest.record(pdf_file, result)
+            annotations[row] = fields
+        
+        if annotations:
+            logger.info(f"Quase duplicatas: {len(annotations)} de {len(self._near_index)} documentos")
+        return annotations
+    
+    def _process_isolated(
+        self,
+        pdf_files: Iterable[Any],
+        output_dir: Path,
+        num_workers: int,
+        on_result: Callable[[Path, Dict[str, Any]], None]
+    ) -> List[Dict[str, Any]]:
+        """
+        Processa cada PDF em um processo isolado, com tempo limite, limite
+        de memória e reciclagem dos processos.
+        
+        Args:
+            pdf_files: Arquivos PDF a processar, consumidos sob demanda
+            output_dir: Diretório de saída
+            num_workers: Número de processos trabalhadores
+            on_result: Função chamada com (arquivo, resultado) para cada
+                arquivo, assim que ele termina
+        
+        Returns:
+            Lista de resultados, na mesma ordem de pdf_files
+        """
+        logger.info(
+            f"Modo isolado: {num_workers} processos, tempo limite {self.doc_timeout or '-'}s, "
+            f"memória {self.memory_limit_mb or '-'} MB, reciclagem a cada "
+            f"{self.max_tasks_per_worker or '-'} documentos"
+        )
+        
+        results: Dict[Path, Dict[str, Any]] = {}
+        order: List[Any] = []
+        total = len(pdf_files) if isinstance(pdf_files, list) else None
+        
+        def collect(pdf_file: Path, result: Dict[str, Any]):
+            results[pdf_file] = result
+            on_result(pdf_file, result)
+            logger.info(f"Processados [{_progress(len(results), total)}]")
+        
+        def consume() -> Iterator[Any]:
+            for pdf_file in pdf_files:
+                order.append(pdf_file)
+                yield pdf_file
+        
+        pool = IsolatedWorkerPool(
+            self.config,
+            num_workers,
+            timeout=self.doc_timeout,
+            memory_limit_mb=self.memory_limit_mb,
+            max_tasks=self.max_tasks_per_worker,
+        )
+        pool.run(consume(), output_dir, collect)
+        
+        return [results[pdf_file] for pdf_file in order]
+    
+    def _process_parallel(
+        self,
+        pdf_files: Iterable[Any],
+        output_dir: Path,
+        num_workers: int,
+        on_result: Optional[Callable[[Path, Dict[str, Any]], None]] = None,
+        batch_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Processa os PDFs em um pool de processos, em lotes de batch_size.
+        
+        Os lotes são despachados na ordem de pdf_files e cada processo livre
+        recebe o próximo; os resultados são registrados à medida que os
+        lotes terminam. No máximo dois lotes por processo ficam em
+        andamento, de modo que pdf_files é consumido sob demanda.
+        
+        Args:
+            pdf_files: Arquivos PDF a processar
+            output_dir: Diretório de saída
+            num_workers: Número de processos trabalhadores
+            on_result: Função chamada com (arquivo, resultado) para cada
+                arquivo, assim que seu lote termina
+            batch_size: Arquivos por lote (padrão: batch_size da
+                configuração); 1 no escalonamento LPT, para que os
+                documentos longos não se acumulem no mesmo lote
+        
+        Returns:
+            Lista de resultados, na mesma ordem de pdf_files
+        """
+        batch_size = batch_size or self.batch_size
+        total = len(pdf_files) if isinstance(pdf_files, list) else None
+        logger.info(
+            f"Modo paralelo: {num_workers} processos, "
+            f"lotes de até {batch_size} arquivos"
+        )
+        
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        
+        batches = _iter_batches(pdf_files, batch_size)
+        batch_results_by_index: Dict[int, List[Dict[str, Any]]] = {}
+        dispatched: List[List[Any]] = []
+        completed = 0
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(self.config,),
+        ) as executor:
+            futures = {}
+            
+            def submit_next():
+                batch = next(batches, None)
+                if batch is not None:
+                    futures[executor.submit(_process_batch_in_worker, batch, output_dir)] = len(dispatched)
+                    dispatched.append(batch)
+            
+            for _ in range(2 * num_workers):
+                submit_next()
+            
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures.pop(future)
+                    batch = dispatched[index]
+                    try:
+                        batch_results = future.result()
+                    except Exception as e:
+                        # Falha do próprio processo trabalhador (ex.: processo encerrado)
+                        logger.error(f"Erro no lote de {len(batch)} arquivos: {str(e)}")
+                        batch_results = [_error_result(pdf_file, str(e)) for pdf_file in batch]
+                    submit_next()
+                    
+                    if on_result is not None:
+                        for pdf_file, result in zip(batch, batch_results):
+                            on_result(pdf_file, result)
+                    
+                    batch_results_by_index[index] = batch_results
+                    completed += len(batch_results)
+                    logger.info(f"Processados [{_progress(completed, total)}]")
+        
+        return [result for index in range(len(dispatched)) for result in batch_results_by_index[index]]
+    
+    def _process_file_safely(self, pdf_file: Path, output_dir: Path) -> Dict[str, Any]:
+        """
+        Processa um arquivo isolando erros em uma linha de resultado.
+        
+        Args:
+            pdf_file: Caminho do arquivo PDF ou membro de arquivo compactado
+            output_dir: Diretório de saída
+        
+        Returns:
+            Resultado do processamento ou registro de erro
+        """
+        try:
+            return self._process_single_file(pdf_file, output_dir)
+        except Exception as e:
+            if is_allocation_failure(e):
+                # Sob RLIMIT_AS, o processo isolado é descartado em seguida
+                logger.error(f"Memória esgotada ao processar {pdf_file.name}")
+                return _error_result(pdf_file, "Memória esgotada", status="oom")
+            logger.error(f"Erro ao processar {pdf_file.name}: {str(e)}")
+            return _error_result(pdf_file, str(e))
+    
     def _process_single_file(
         self, 
         pdf_file: Path, 
@@ -107,26 +976,51 @@ class PDFBatchProcessor:
         Processa um único arquivo PDF.
         
         Args:
-            pdf_file: Caminho do arquivo PDF
+            pdf_file: Caminho do arquivo PDF ou membro de arquivo compactado
             output_dir: Diretório de saída
-            
+        
         Returns:
             Dicionário com resultado do processamento
         """
         file_start = datetime.now()
+        output_file = output_dir / f"{as_source(pdf_file).output_stem}_clean.{self.output_format}"
+        timer = self.extractor.create_timer(pdf_file)
+        record = None
+        signature = MinHashSignature() if self.near_dedup else None
         
-        # Extrai texto com metadados
-        data = self.extractor.extract_with_metadata(str(pdf_file))
-        
-        # Salva texto limpo
-        output_file = output_dir / f"{pdf_file.stem}_clean.{self.output_format}"
-        self._save_output(data["clean_text"], output_file)
+        if self.consolidated:
+            # O registro é gravado no shard pelo processo principal
+            data = self.extractor.extract_with_metadata(pdf_file, timer)
+            output_file = None
+            record = {
+                "filename": pdf_file.name,
+                "filepath": data["filepath"],
+                "num_pages": data["num_pages"],
+                "metadata": data["metadata"],
+                "stats": data["stats"],
+                "clean_text": data["clean_text"],
+            }
+        elif self.stream_pages:
+            # Extrai, limpa e grava página a página, com memória limitada
+            with StreamingTextWriter(output_file, self.output_format) as writer:
+                if signature is not None:
+                    writer = _TeeWriter(writer, signature)
+                data = self.extractor.extract_to_writer(pdf_file, writer, timer)
+        else:
+            # Extrai texto com metadados
+            data = self.extractor.extract_with_metadata(pdf_file, timer)
+            
+            # Salva texto limpo
+            with timer.stage("write"):
+                self._save_output(data["clean_text"], output_file)
         
         file_end = datetime.now()
         processing_time = (file_end - file_start).total_seconds()
         
-        return {
+        result = {
             "filename": pdf_file.name,
+            # Arquivo compactado e membro, para PDFs lidos de zip/tar
+            **as_source(pdf_file).report_fields(),
             "status": "success",
             "num_pages": data["num_pages"],
             "original_chars": data["stats"]["original_length"],
@@ -135,94 +1029,52 @@ class PDFBatchProcessor:
             "reduction_percentage": data["stats"]["reduction_percentage"],
             "content_preserved": data["stats"]["content_preserved_percentage"],
             "processing_time": round(processing_time, 2),
-            "output_file": str(output_file),
+            "output_file": str(output_file) if output_file is not None else None,
         }
-    
-    def _save_output(self, text: str, output_file: Path):
-        """
-        Salva o texto processado no formato especificado.
         
-        Args:
-            text: Texto a ser salvo
-            output_file: Caminho do arquivo de saída
-        """
-        if self.output_format == "txt":
-            output_file.write_text(text, encoding="utf-8")
+        # Páginas analisadas e puladas pela pré-verificação de tabelas
+        table_stats = data.get("table_stats", {})
+        result["table_pages_analysed"] = table_stats.get("pages_analysed", 0)
+        result["table_pages_skipped"] = table_stats.get("pages_skipped", 0)
         
-        elif self.output_format == "json":
-            data = {
-                "text": text,
-                "length": len(text),
-                "timestamp": datetime.now().isoformat(),
-            }
-            output_file.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        # Páginas sem camada de texto que passaram por OCR
+        result["ocr_pages"] = data.get("ocr_pages", 0)
         
-        elif self.output_format == "csv":
-            # Para CSV, salva linha por linha
-            lines = text.split('\n')
-            with output_file.open('w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["line_number", "text"])
-                for idx, line in enumerate(lines, 1):
-                    writer.writerow([idx, line])
+        # Passagens de padrões de limpeza aplicadas e dispensadas pelo pré-filtro
+        prefilter = data.get("prefilter")
+        if prefilter is not None:
+            result["patterns_applied"] = prefilter["applied"]
+            result["patterns_skipped"] = prefilter["skipped"]
+            result["patterns_skipped_by_name"] = prefilter["skipped_by_pattern"]
         
-        logger.debug(f"Texto salvo em: {output_file}")
-    
-    def _generate_report(
-        self, 
-        results: List[Dict[str, Any]], 
-        output_dir: Path,
-        total_time: float
-    ):
-        """
-        Gera relatório consolidado do processamento.
+        if "cache_hit" in data:
+            result["cache_hit"] = data["cache_hit"]
         
-        Args:
-            results: Lista de resultados do processamento
-            output_dir: Diretório de saída
-            total_time: Tempo total de processamento
-        """
-        report_file = output_dir / "processing_report.json"
-        
-        # Calcula estatísticas gerais
-        successful = [r for r in results if r["status"] == "success"]
-        failed = [r for r in results if r["status"] == "error"]
-        
-        total_pages = sum(r.get("num_pages", 0) for r in successful)
-        total_chars_removed = sum(r.get("chars_removed", 0) for r in successful)
-        avg_reduction = sum(r.get("reduction_percentage", 0) for r in successful) / len(successful) if successful else 0
-        avg_preserved = sum(r.get("content_preserved", 0) for r in successful) / len(successful) if successful else 0
-        
-        report = {
-            "timestamp": datetime.now().isoformat(),
-            "summary": {
-                "total_files": len(results),
-                "successful": len(successful),
-                "failed": len(failed),
-                "total_pages": total_pages,
-                "total_processing_time": round(total_time, 2),
-                "avg_time_per_file": round(total_time / len(results), 2) if results else 0,
-                "docs_per_second": round(len(results) / total_time, 2) if total_time > 0 else 0,
-            },
-            "statistics": {
-                "total_chars_removed": total_chars_removed,
-                "avg_reduction_percentage": round(avg_reduction, 2),
-                "avg_content_preserved": round(avg_preserved, 2),
-            },
-            "files": results,
-        }
+        # Tempo de cada etapa (abertura, texto, tabelas, limpeza, escrita)
+        for stage, seconds in timer.as_dict().items():
+            result[f"time_{stage}"] = seconds
+        
+        if timer.per_page:
+            result["page_timings"] = timer.get_page_timings()
         
-        # Salva relatório JSON
-        report_file.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        if record is not None:
+            result["record"] = record
         
-        # Gera também um relatório CSV
-        if successful:
-            df = pd.DataFrame(successful)
-            csv_report = output_dir / "processing_report.csv"
-            df.to_csv(csv_report, index=False, encoding="utf-8")
+        # Assinatura do texto limpo, comparada no processo principal
+        if signature is not None:
+            if "clean_text" in data:
+                signature.update(data["clean_text"])
+            result["minhash"] = signature.digest()
         
-        logger.info(f"Relatório gerado em: {report_file}")
+        return result
+    
+    def _save_output(self, text: str, output_file: Path):
+        """
+        Salva o texto processado no formato especificado.
         
-        # Log do resumo
-        logger.info(f"Resumo: {len(successful)} sucesso, {len(failed)} falhas")
-        logger.info(f"Velocidade: {report['summary']['docs_per_second']:.2f} docs/segundo")
+        Args:
+            text: Texto a ser salvo
+            output_file: Caminho do arquivo de saída
+        """
+        with StreamingTextWriter(output_file, self.output_format) as writer:
+            writer.write(text)
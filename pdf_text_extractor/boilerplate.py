@@ -0,0 +1,221 @@
+"""
+Módulo de detecção estatística de cabeçalhos e rodapés repetidos.
+"""
+import logging
+import re
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sequências de dígitos (números de página, datas, totais) e espaços
+_DIGITS = re.compile(r'\d+')
+_SPACES = re.compile(r'\s+')
+
+
+class RepeatedLineDetector:
+    """
+    Detecta cabeçalhos e rodapés pela repetição entre páginas, sem padrões
+    escritos à mão para cada família de documentos.
+    
+    As primeiras e as últimas linhas de cada página são normalizadas
+    (dígitos viram "#" e espaços são unificados, de modo que "PÁGINA 3" e
+    "PÁGINA 4" coincidem) e contadas por página. As linhas dessas faixas
+    que se repetem em mais de min_share das páginas são removidas.
+    """
+    
+    def __init__(self, edge_lines: int = 3, min_share: float = 0.5, min_pages: int = 3):
+        """
+        Inicializa o detector.
+        
+        Args:
+            edge_lines: Linhas não vazias consideradas no topo e no pé de
+                cada página
+            min_share: Fração de páginas acima da qual uma linha é
+                considerada repetida
+            min_pages: Número mínimo de páginas para aplicar a detecção
+        """
+        self.edge_lines = edge_lines
+        self.min_share = min_share
+        self.min_pages = min_pages
+    
+    @staticmethod
+    def normalize(line: str) -> str:
+        """
+        Normaliza uma linha para comparação entre páginas.
+        
+        Args:
+            line: Linha do texto da página
+        
+        Returns:
+            Linha sem variação de numeração e de espaços
+        """
+        return _SPACES.sub(' ', _DIGITS.sub('#', line)).strip()
+    
+    def _edge_keys(self, lines: List[str]) -> List[Tuple[int, str]]:
+        """
+        Índices e formas normalizadas das linhas de borda de uma página.
+        
+        As tabelas são acrescentadas ao fim do texto da página após uma
+        linha em branco; por isso o pé da página é procurado tanto no fim
+        do texto quanto no fim do primeiro bloco, antes da primeira linha
+        em branco.
+        
+        Args:
+            lines: Linhas do texto da página
+        
+        Returns:
+            Lista de (índice da linha, linha normalizada)
+        """
+        filled = [index for index, line in enumerate(lines) if line.strip()]
+        
+        body_end = len(filled)
+        for position in range(1, len(filled)):
+            if filled[position] != filled[position - 1] + 1:
+                body_end = position
+                break
+        
+        edges = set(filled[:self.edge_lines])
+        edges.update(filled[max(0, body_end - self.edge_lines):body_end])
+        edges.update(filled[-self.edge_lines:])
+        return [(index, self.normalize(lines[index])) for index in sorted(edges)]
+    
+    def _repeated(self, page_keys: Sequence[List[Tuple[int, str]]]) -> Set[str]:
+        """Linhas normalizadas presentes em mais de min_share das páginas."""
+        if len(page_keys) < self.min_pages:
+            return set()
+        
+        counts: Dict[str, int] = {}
+        for keys in page_keys:
+            # Cada linha conta uma única vez por página
+            for key in {key for _, key in keys}:
+                counts[key] = counts.get(key, 0) + 1
+        
+        threshold = self.min_share * len(page_keys)
+        return {key for key, count in counts.items() if count > threshold}
+    
+    def detect(self, page_texts: Sequence[str]) -> Set[str]:
+        """
+        Encontra as linhas repetidas nas bordas das páginas.
+        
+        Args:
+            page_texts: Texto de cada página, na ordem do documento
+        
+        Returns:
+            Conjunto das linhas normalizadas consideradas cabeçalho ou rodapé
+        """
+        return self._repeated([self._edge_keys(text.split('\n')) for text in page_texts])
+    
+    def strip_page(self, page_text: str, repeated: Set[str]) -> str:
+        """
+        Remove de uma página as linhas de borda já identificadas como repetidas.
+        
+        Usado na extração página a página, com as linhas aprendidas por
+        detect nas primeiras páginas do documento.
+        
+        Args:
+            page_text: Texto da página
+            repeated: Linhas normalizadas retornadas por detect
+        
+        Returns:
+            Texto da página sem essas linhas de borda
+        """
+        if not repeated:
+            return page_text
+        
+        lines = page_text.split('\n')
+        drop = {index for index, key in self._edge_keys(lines) if key in repeated}
+        if not drop:
+            return page_text
+        return '\n'.join(line for index, line in enumerate(lines) if index not in drop)
+    
+    def strip_pages(self, page_texts: Sequence[str]) -> List[str]:
+        """
+        Remove de cada página as linhas de borda repetidas entre páginas.
+        
+        As páginas são percorridas uma única vez para a contagem; só as
+        linhas de borda, já normalizadas, são revisitadas na remoção.
+        
+        Args:
+            page_texts: Texto de cada página, na ordem do documento
+        
+        Returns:
+            Texto de cada página sem cabeçalhos e rodapés repetidos
+        """
+        page_lines = [text.split('\n') for text in page_texts]
+        page_keys = [self._edge_keys(lines) for lines in page_lines]
+        repeated = self._repeated(page_keys)
+        if not repeated:
+            return list(page_texts)
+        
+        stripped = []
+        removed = 0
+        for lines, keys in zip(page_lines, page_keys):
+            drop = {index for index, key in keys if key in repeated}
+            if drop:
+                removed += len(drop)
+                lines = [line for index, line in enumerate(lines) if index not in drop]
+            stripped.append('\n'.join(lines))
+        
+        logger.debug(
+            f"Cabeçalhos e rodapés repetidos: {len(repeated)} linhas distintas, "
+            f"{removed} ocorrências removidas"
+        )
+        
+        return stripped
+    
+    def learn_margins(
+        self,
+        page_lines: Sequence[List[Dict[str, Any]]],
+        page_bboxes: Sequence[Tuple[float, float, float, float]],
+        max_fraction: float = 0.25,
+        padding: float = 1.0
+    ) -> Tuple[float, float]:
+        """
+        Aprende as faixas de cabeçalho e rodapé a partir da geometria das
+        primeiras páginas de um documento.
+        
+        As linhas de cada página (com posição, como em
+        page.extract_text_lines do pdfplumber) são ordenadas de cima para
+        baixo; as linhas repetidas entre as edge_lines primeiras definem o
+        cabeçalho, e as repetidas entre as edge_lines últimas, o rodapé.
+        
+        Args:
+            page_lines: Linhas de cada página, com text, top e bottom
+            page_bboxes: Caixa (x0, top, x1, bottom) de cada página
+            max_fraction: Fração máxima da altura da página em cada faixa;
+                faixas maiores são descartadas
+            padding: Folga acrescentada a cada faixa, em pontos
+            
+        Returns:
+            Tupla (margem superior, margem inferior) em pontos; 0 quando
+            não há faixa
+        """
+        bands = []
+        for lines in page_lines:
+            lines = sorted((line for line in lines if line["text"].strip()), key=lambda line: line["top"])
+            header = [(self.normalize(line["text"]), line) for line in lines[:self.edge_lines]]
+            footer = [(self.normalize(line["text"]), line) for line in lines[-self.edge_lines:]]
+            bands.append((header, footer))
+        
+        repeated = self._repeated(
+            [[(0, key) for key, _ in header + footer] for header, footer in bands]
+        )
+        
+        top_margin = bottom_margin = 0.0
+        for (header, footer), (_, page_top, _, page_bottom) in zip(bands, page_bboxes):
+            for key, line in header:
+                if key in repeated:
+                    top_margin = max(top_margin, line["bottom"] - page_top + padding)
+            for key, line in footer:
+                if key in repeated:
+                    bottom_margin = max(bottom_margin, page_bottom - line["top"] + padding)
+        
+        height = min((bottom - top for _, top, _, bottom in page_bboxes), default=0)
+        if top_margin > max_fraction * height:
+            logger.warning(f"Faixa de cabeçalho aprendida muito alta ({top_margin:.1f} pt); ignorada")
+            top_margin = 0.0
+        if bottom_margin > max_fraction * height:
+            logger.warning(f"Faixa de rodapé aprendida muito alta ({bottom_margin:.1f} pt); ignorada")
+            bottom_margin = 0.0
+        
+        return round(top_margin, 2), round(bottom_margin, 2)
@@ -0,0 +1,174 @@
+"""
+Módulo de cache em disco dos resultados de extração.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato das entradas; alterar invalida o cache existente
+CACHE_FORMAT_VERSION = 1
+
+# Fração do limite a que a remoção LRU reduz o cache: a varredura do
+# diretório só se repete depois que o cache volta a crescer esse tanto
+EVICT_LOW_WATER = 0.9
+
+
+class ExtractionCache:
+    """
+    Cache endereçado por conteúdo: a chave é o hash dos bytes do PDF
+    combinado com a configuração que afeta o resultado. As entradas ficam
+    em arquivos JSON e são removidas por LRU quando o limite é excedido.
+    """
+    
+    def __init__(self, cache_dir: str, max_size_mb: float = 1024):
+        """
+        Inicializa o cache.
+        
+        Args:
+            cache_dir: Diretório onde as entradas são armazenadas
+            max_size_mb: Tamanho máximo do cache em megabytes
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._size = self._scan_size()
+        
+        logger.info(f"Cache de extração em {self.cache_dir} ({self._size} bytes)")
+    
+    def make_key(self, content_hash: str, settings: Dict[str, Any]) -> str:
+        """
+        Gera a chave de cache de um documento.
+        
+        Args:
+            content_hash: Hash do conteúdo do PDF
+            settings: Configuração que afeta o resultado da extração
+            
+        Returns:
+            Chave hexadecimal
+        """
+        payload = json.dumps(
+            {"version": CACHE_FORMAT_VERSION, "content": content_hash, "settings": settings},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        """Caminho do arquivo de uma entrada."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca uma entrada no cache.
+        
+        Args:
+            key: Chave da entrada
+            
+        Returns:
+            Dados armazenados, ou None se ausente
+        """
+        entry = self._entry_path(key)
+        
+        try:
+            data = json.loads(entry.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        
+        # Atualiza o horário de acesso usado na remoção LRU
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        
+        self.hits += 1
+        return data
+    
+    def put(self, key: str, data: Dict[str, Any]):
+        """
+        Armazena uma entrada no cache, removendo as menos usadas se necessário.
+        
+        Args:
+            key: Chave da entrada
+            data: Dados serializáveis em JSON
+        """
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        content = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        
+        if len(content) > self.max_size:
+            logger.debug(f"Entrada maior que o limite do cache, ignorada: {key}")
+            return
+        
+        # Uma entrada substituída deixa de contar no tamanho
+        try:
+            replaced = entry.stat().st_size
+        except OSError:
+            replaced = 0
+        
+        # Escrita atômica: outros processos nunca leem uma entrada parcial
+        fd, tmp_path = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, entry)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        
+        self._size += len(content) - replaced
+        if self._size > self.max_size:
+            self._evict()
+    
+    def _iter_entries(self):
+        """Itera sobre as entradas existentes e seus metadados de arquivo."""
+        for entry in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield entry, stat
+    
+    def _scan_size(self) -> int:
+        """Soma o tamanho das entradas existentes."""
+        return sum(stat.st_size for _, stat in self._iter_entries())
+    
+    def _evict(self):
+        """
+        Remove as entradas acessadas há mais tempo até o cache ficar abaixo
+        de EVICT_LOW_WATER do limite.
+        
+        O diretório é varrido aqui (e não a cada put) para incluir as
+        entradas gravadas por outros processos; a folga abaixo do limite
+        evita uma nova varredura a cada entrada seguinte.
+        """
+        entries = sorted(self._iter_entries(), key=lambda item: item[1].st_mtime)
+        size = sum(stat.st_size for _, stat in entries)
+        target = int(self.max_size * EVICT_LOW_WATER)
+        removed = 0
+        
+        for entry, stat in entries:
+            if size <= target:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            size -= stat.st_size
+            removed += 1
+        
+        self._size = size
+        logger.debug(f"Cache: {removed} entradas removidas (LRU)")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna contadores de acertos e falhas do cache."""
+        return {"hits": self.hits, "misses": self.misses}
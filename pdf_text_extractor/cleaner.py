@@ -3,10 +3,90 @@ Módulo de limpeza de texto extraído de PDFs.
 """
 import re
 import logging
-from typing import Dict, List
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+from .prefilter import LiteralScanner, required_literals
 
 logger = logging.getLogger(__name__)
 
+# Padrão de cabeçalho usado por padrão em remove_headers
+DEFAULT_HEADER_PATTERN = r'(?:RELINT|SEPOL|SSINTE).*?(?=\n|$)'
+
+# Formas equivalentes e mais rápidas dos padrões padrão, usadas na compilação:
+# - ".*?(?=\n|$)" sem MULTILINE termina sempre na primeira quebra de linha ou
+#   no fim do texto, exatamente como "[^\n]*", sem testar o lookahead a cada
+#   caractere;
+# - iniciar pelo conjunto do primeiro caractere permite ao motor saltar
+#   rapidamente as posições que não podem casar, e os lookbehinds fazem a
+#   tentativa numérica começar só no início de cada sequência de dígitos (o
+#   único ponto onde o padrão original pode casar), sem retrocesso quadrático.
+_EQUIVALENT_PATTERNS = {
+    DEFAULT_HEADER_PATTERN: r'(?:RELINT|SEPOL|SSINTE)[^\n]*',
+    r'RESUMO:.*?(?=\n|$)': r'RESUMO:[^\n]*',
+    r'(?:PÁGINA|página)\s*\d+|\d+\s*/\s*\d+': (
+        r'[\dPp](?:(?<=P)ÁGINA\s*\d+|(?<=p)ágina\s*\d+|(?<!\d\d)(?<=\d)\d*\s*/\s*\d+)'
+    ),
+    r'\b\d{10,}\b': r'\d(?<!\w\d)\d{9,}\b',
+}
+
+_MULTIPLE_SPACES = re.compile(r'\s{2,}')
+
+
+class _LiteralGate:
+    """
+    Decide, para um texto em limpeza, quais passagens de padrões podem casar.
+    
+    Na primeira consulta, todos os literais dos padrões são procurados de
+    uma só vez (e de novo se um padrão consultado depois tiver literais
+    ainda não procurados, como os de header_patterns); depois de uma
+    passagem que altera o texto (a remoção pode unir trechos e formar um
+    literal), só os literais do padrão consultado são verificados no texto
+    atual.
+    """
+    
+    def __init__(self, cleaner: "PDFTextCleaner", stats: Optional[Dict[str, Any]] = None):
+        self._cleaner = cleaner
+        # Contadores do limpador e, opcionalmente, os do documento em limpeza
+        self._stats = [cleaner.prefilter_stats] + ([stats] if stats is not None else [])
+        self._present: FrozenSet[str] = frozenset()
+        self._scanned: FrozenSet[str] = frozenset()
+        self._stale = False
+    
+    def _count(self, key: str, name: Optional[str] = None):
+        for stats in self._stats:
+            stats[key] += 1
+            if name is not None:
+                skipped = stats["skipped_by_pattern"]
+                skipped[name] = skipped.get(name, 0) + 1
+    
+    def allows(self, name: str, pattern: str, text: str) -> bool:
+        """Indica se o padrão pode casar no texto atual e atualiza os contadores."""
+        cleaner = self._cleaner
+        literals = cleaner._literals(name, pattern)
+        if literals is None:
+            self._count("applied")
+            return True
+        
+        if self._stale:
+            possible = any(literal in text for literal in literals)
+        else:
+            if not literals <= self._scanned:
+                scanner = cleaner._scanner(literals)
+                self._present = scanner.scan(text)
+                self._scanned = scanner.literals
+                self._count("scans")
+            possible = not literals.isdisjoint(self._present)
+        
+        if possible:
+            self._count("applied")
+        else:
+            self._count("skipped", name)
+        return possible
+    
+    def changed(self):
+        """Registra que uma passagem alterou o texto."""
+        self._stale = True
+
 
 class PDFTextCleaner:
     """
@@ -14,18 +94,43 @@ class PDFTextCleaner:
     usando padrões regex avançados.
     """
     
-    def __init__(self, custom_patterns: Dict[str, str] = None):
+    def __init__(self, custom_patterns: Dict[str, str] = None, custom_literals: Dict[str, List[str]] = None):
         """
         Inicializa o limpador de texto com padrões regex.
         
         Args:
             custom_patterns: Dicionário opcional com padrões regex customizados
+            custom_literals: Literais declarados por nome de padrão: o padrão
+                só é aplicado a textos que contêm algum deles. Sem declaração,
+                os literais são derivados do próprio padrão
         """
         self.patterns = self._initialize_patterns()
         if custom_patterns:
             self.patterns.update(custom_patterns)
+        self._defaults = self._initialize_patterns()
+        self._compiled: Dict[str, Tuple[str, Pattern]] = {}
+        self._compile_patterns()
+        
+        # Pré-filtro por literais: passagens que não podem casar são dispensadas
+        self.pattern_literals: Dict[str, FrozenSet[str]] = {
+            name: frozenset(literals) for name, literals in (custom_literals or {}).items()
+        }
+        self._derived_literals: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._literal_scanner: Optional[LiteralScanner] = None
+        self.prefilter_stats = self.new_prefilter_stats()
         logger.info(f"PDFTextCleaner inicializado com {len(self.patterns)} padrões")
     
+    @staticmethod
+    def new_prefilter_stats() -> Dict[str, Any]:
+        """
+        Cria contadores zerados do pré-filtro por literais.
+        
+        Returns:
+            Dicionário com buscas de literais, passagens aplicadas e
+            dispensadas (no total e por padrão)
+        """
+        return {"scans": 0, "applied": 0, "skipped": 0, "skipped_by_pattern": {}}
+    
     def _initialize_patterns(self) -> Dict[str, str]:
         """Inicializa os padrões regex para limpeza de texto."""
         return {
@@ -33,7 +138,7 @@ class PDFTextCleaner:
             "page_numbers": r'(?:PÁGINA|página)\s*\d+|\d+\s*/\s*\d+',
             
             # Filtro de cabeçalhos repetitivos
-            "headers_relint": r'(?:RELINT|SEPOL|SSINTE).*?(?=\n|$)',
+            "headers_relint": DEFAULT_HEADER_PATTERN,
             
             # Limpeza de códigos de documento
             "document_codes": r'\b\d{10,}\b',
@@ -49,6 +154,112 @@ class PDFTextCleaner:
             "footer_pattern": r'RESUMO:.*?(?=\n|$)',
         }
     
+    def _compile_patterns(self):
+        """Compila o conjunto de padrões uma única vez por limpador."""
+        for name, pattern in self.patterns.items():
+            self._compile(name, pattern)
+    
+    @property
+    def _default_pipeline(self) -> bool:
+        """Indica se clean_text usa os padrões padrão, pré-requisito das passagens fundidas."""
+        return all(
+            self.patterns.get(name) == self._defaults[name]
+            for name in (
+                "page_numbers", "headers_relint", "document_codes",
+                "multiple_spaces", "multiple_newlines", "page_marker",
+            )
+        )
+    
+    def _compile(self, name: str, pattern: str) -> Pattern:
+        """
+        Retorna o padrão compilado, recompilando se self.patterns mudou.
+        
+        Args:
+            name: Nome do padrão em self.patterns
+            pattern: Padrão regex atual
+            
+        Returns:
+            Padrão compilado
+        """
+        cached = self._compiled.get(name)
+        if cached is None or cached[0] != pattern:
+            cached = (pattern, re.compile(_EQUIVALENT_PATTERNS.get(pattern, pattern)))
+            self._compiled[name] = cached
+        return cached[1]
+    
+    def _pattern(self, name: str) -> Pattern:
+        """Retorna o padrão compilado de self.patterns[name]."""
+        return self._compile(name, self.patterns[name])
+    
+    def _literals(self, name: Optional[str], pattern: str) -> Optional[FrozenSet[str]]:
+        """
+        Retorna os literais de que um padrão depende.
+        
+        Args:
+            name: Nome do padrão (para literais declarados), ou None
+            pattern: Padrão regex
+            
+        Returns:
+            Literais declarados para o nome ou derivados do padrão; None se
+            o padrão deve ser sempre aplicado
+        """
+        if name in self.pattern_literals:
+            return self.pattern_literals[name] or None
+        if pattern not in self._derived_literals:
+            self._derived_literals[pattern] = required_literals(pattern)
+        return self._derived_literals[pattern]
+    
+    def _scanner(self, literals: FrozenSet[str]) -> LiteralScanner:
+        """Buscador dos literais de todos os padrões, reconstruído se surgirem novos literais."""
+        scanner = self._literal_scanner
+        if scanner is None or not literals <= scanner.literals:
+            all_literals = set(literals)
+            for name, pattern in list(self.patterns.items()) + [("_default_header", DEFAULT_HEADER_PATTERN)]:
+                all_literals |= self._literals(name, pattern) or set()
+            if scanner is not None:
+                all_literals |= scanner.literals
+            scanner = self._literal_scanner = LiteralScanner(all_literals)
+        return scanner
+    
+    def _sub(self, gate: _LiteralGate, name: str, repl: str, text: str) -> Tuple[str, int]:
+        """
+        Aplica o padrão self.patterns[name], se o pré-filtro permitir.
+        
+        Args:
+            gate: Pré-filtro do texto em limpeza
+            name: Nome do padrão
+            repl: Texto de substituição
+            text: Texto atual
+            
+        Returns:
+            Tupla (texto resultante, número de substituições)
+        """
+        pattern = self.patterns[name]
+        if not gate.allows(name, pattern, text):
+            return text, 0
+        text, count = self._compile(name, pattern).subn(repl, text)
+        if count:
+            gate.changed()
+        return text, count
+    
+    def get_prefilter_stats(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores do pré-filtro por literais.
+        
+        Returns:
+            Dicionário com a implementação da busca, as buscas de literais
+            realizadas, as passagens aplicadas e as dispensadas (no total e
+            por padrão)
+        """
+        scanner = self._literal_scanner
+        return {
+            "backend": scanner.backend if scanner is not None else None,
+            "scans": self.prefilter_stats["scans"],
+            "applied": self.prefilter_stats["applied"],
+            "skipped": self.prefilter_stats["skipped"],
+            "skipped_by_pattern": dict(self.prefilter_stats["skipped_by_pattern"]),
+        }
+    
     def clean_text(self, text: str) -> str:
         """
         Remove numeração de páginas e aplica filtros de limpeza.
@@ -59,47 +270,131 @@ class PDFTextCleaner:
         Returns:
             Texto limpo e processado
         """
+        return self._clean_text(text)[0]
+    
+    def _clean_text(
+        self,
+        text: str,
+        header_regex: bool = True,
+        prefilter_stats: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, bool]:
+        """
+        Aplica os filtros de clean_text.
+        
+        Args:
+            text: Texto bruto extraído do PDF
+            header_regex: Se False, dispensa a passagem de headers_relint
+            prefilter_stats: Contadores do pré-filtro a atualizar além dos
+                do limpador (ex.: os de um documento)
+            
+        Returns:
+            Tupla (texto limpo, se algum marcador de página foi removido)
+        """
         if not text:
-            return ""
+            return "", False
+        
+        # Passagens cujos literais (ex.: "RELINT", "PÁGINA") não aparecem no
+        # texto são dispensadas
+        gate = _LiteralGate(self, prefilter_stats)
         
         # Remove numeração de páginas
-        text = re.sub(self.patterns["page_numbers"], '', text)
+        text, _ = self._sub(gate, "page_numbers", '', text)
         
         # Remove cabeçalhos RELINT
-        text = re.sub(self.patterns["headers_relint"], '', text)
+        if header_regex:
+            text, _ = self._sub(gate, "headers_relint", '', text)
         
         # Remove códigos longos de documento
-        text = re.sub(self.patterns["document_codes"], '', text)
+        text, _ = self._sub(gate, "document_codes", '', text)
         
         # Normaliza espaços múltiplos
-        text = re.sub(self.patterns["multiple_spaces"], ' ', text)
+        text, _ = self._sub(gate, "multiple_spaces", ' ', text)
         
-        # Normaliza quebras de linha excessivas
-        text = re.sub(self.patterns["multiple_newlines"], '\n\n', text)
+        # Normaliza quebras de linha excessivas. Com os padrões padrão não
+        # restam dois espaços em branco seguidos, e a passagem é dispensada.
+        default_pipeline = self._default_pipeline
+        if not default_pipeline:
+            text, _ = self._sub(gate, "multiple_newlines", '\n\n', text)
         
         # Remove marcadores de página
-        text = re.sub(self.patterns["page_marker"], '', text)
+        text, markers_removed = self._sub(gate, "page_marker", '', text)
+        
+        return text.strip(), markers_removed > 0
+    
+    def clean_document(
+        self,
+        text: str,
+        remove_headers: bool = True,
+        normalize_spaces: bool = True,
+        header_regex: bool = True,
+        prefilter_stats: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Aplica clean_text, remove_headers e normalize_spaces em sequência,
+        com o mesmo resultado das três chamadas separadas.
         
-        return text.strip()
+        Com os padrões padrão, a saída de clean_text já não contém
+        cabeçalhos nem espaços a normalizar, a menos que a remoção de um
+        marcador de página tenha unido trechos do texto; só nesse caso as
+        passagens seguintes são executadas.
+        
+        Args:
+            text: Texto bruto extraído do PDF
+            remove_headers: Se True, remove cabeçalhos repetitivos
+            normalize_spaces: Se True, normaliza espaços e quebras de linha
+            header_regex: Se False, os cabeçalhos já foram removidos por
+                RepeatedLineDetector e as duas passagens de padrões de
+                cabeçalho (headers_relint e remove_headers) são dispensadas
+            prefilter_stats: Contadores do pré-filtro a atualizar além dos
+                do limpador (ex.: os de um documento, de new_prefilter_stats)
+            
+        Returns:
+            Texto limpo
+        """
+        text, markers_removed = self._clean_text(text, header_regex, prefilter_stats)
+        
+        if not markers_removed and self._default_pipeline:
+            return text
+        
+        if remove_headers and header_regex:
+            text = self.remove_headers(text, prefilter_stats=prefilter_stats)
+        
+        if normalize_spaces:
+            text = self.normalize_spaces(text)
+        
+        return text
     
-    def remove_headers(self, text: str, header_patterns: List[str] = None) -> str:
+    def remove_headers(
+        self,
+        text: str,
+        header_patterns: List[str] = None,
+        prefilter_stats: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         Remove cabeçalhos repetitivos do texto.
         
         Args:
             text: Texto a ser processado
             header_patterns: Lista opcional de padrões de cabeçalho customizados
+            prefilter_stats: Contadores do pré-filtro a atualizar além dos
+                do limpador
             
         Returns:
             Texto sem cabeçalhos repetitivos
         """
+        gate = _LiteralGate(self, prefilter_stats)
+        
         if header_patterns is None:
-            header_patterns = [
-                r'(?:RELINT|SEPOL|SSINTE).*?(?=\n|$)',
-            ]
+            if not gate.allows("_default_header", DEFAULT_HEADER_PATTERN, text):
+                return text
+            return self._compile("_default_header", DEFAULT_HEADER_PATTERN).sub('', text)
         
         for pattern in header_patterns:
-            text = re.sub(pattern, '', text)
+            if not gate.allows(pattern, pattern, text):
+                continue
+            text, count = re.subn(_EQUIVALENT_PATTERNS.get(pattern, pattern), '', text)
+            if count:
+                gate.changed()
         
         return text
     
@@ -113,16 +408,18 @@ class PDFTextCleaner:
         Returns:
             Texto com espaçamento normalizado
         """
-        # Remove espaços múltiplos
-        text = re.sub(r'\s{2,}', ' ', text)
-        
-        # Normaliza quebras de linha
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        # Remove espaços múltiplos. Depois disso não há dois espaços em branco
+        # seguidos: não restam quebras de linha excessivas, e só o início e o
+        # fim do texto podem ter um espaço a remover das bordas das linhas.
+        text = _MULTIPLE_SPACES.sub(' ', text)
         
         # Remove espaços no início e fim de linhas
-        lines = [line.strip() for line in text.split('\n')]
+        if text and text[0] != '\n' and text[0].isspace():
+            text = text[1:]
+        if text and text[-1] != '\n' and text[-1].isspace():
+            text = text[:-1]
         
-        return '\n'.join(lines)
+        return text
     
     def get_cleaning_stats(self, original_text: str, cleaned_text: str) -> Dict[str, int]:
         """
@@ -132,17 +429,30 @@ class PDFTextCleaner:
             original_text: Texto original
             cleaned_text: Texto limpo
             
+        Returns:
+            Dicionário com estatísticas de limpeza
+        """
+        return self.get_length_stats(len(original_text), len(cleaned_text))
+    
+    def get_length_stats(self, original_length: int, cleaned_length: int) -> Dict[str, int]:
+        """
+        Calcula estatísticas de limpeza a partir dos comprimentos dos textos.
+        
+        Args:
+            original_length: Comprimento do texto original
+            cleaned_length: Comprimento do texto limpo
+            
         Returns:
             Dicionário com estatísticas de limpeza
         """
         return {
-            "original_length": len(original_text),
-            "cleaned_length": len(cleaned_text),
-            "characters_removed": len(original_text) - len(cleaned_text),
+            "original_length": original_length,
+            "cleaned_length": cleaned_length,
+            "characters_removed": original_length - cleaned_length,
             "reduction_percentage": round(
-                ((len(original_text) - len(cleaned_text)) / len(original_text) * 100), 2
-            ) if len(original_text) > 0 else 0,
+                ((original_length - cleaned_length) / original_length * 100), 2
+            ) if original_length > 0 else 0,
             "content_preserved_percentage": round(
-                (len(cleaned_text) / len(original_text) * 100), 2
-            ) if len(original_text) > 0 else 0,
+                (cleaned_length / original_length * 100), 2
+            ) if original_length > 0 else 0,
         }
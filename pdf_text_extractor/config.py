@@ -2,51 +2,167 @@
 Módulo de configuração para o PDF Text Extractor.
 """
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv
+from typing import Dict, Any, Optional
 
-# Carrega variáveis de ambiente do arquivo .env
-load_dotenv()
 
-
-class Config:
-    """Classe de configuração centralizada."""
-    
-    # Diretórios
-    INPUT_DIR = os.getenv("INPUT_DIR", "data/input")
-    OUTPUT_DIR = os.getenv("OUTPUT_DIR", "data/output")
-    
-    # Configurações de Processamento
-    MIN_TEXT_LENGTH = int(os.getenv("MIN_TEXT_LENGTH", "50"))
-    EXTRACT_TABLES = os.getenv("EXTRACT_TABLES", "True").lower() == "true"
-    PRESERVE_STRUCTURE = os.getenv("PRESERVE_STRUCTURE", "False").lower() == "true"
-    REMOVE_HEADERS = os.getenv("REMOVE_HEADERS", "True").lower() == "true"
-    NORMALIZE_SPACES = os.getenv("NORMALIZE_SPACES", "True").lower() == "true"
+class _EnvConfig(type):
+    """Lê a configuração na primeira vez que um de seus valores é acessado."""
     
-    # Formato de Saída
-    OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "txt")
+    def __getattr__(cls, name: str) -> Any:
+        # Chamado apenas para atributos ainda inexistentes
+        if name.isupper() and not cls.__dict__.get("_loaded"):
+            cls.load()
+            return getattr(cls, name)
+        raise AttributeError(f"type object {cls.__name__!r} has no attribute {name!r}")
+
+
+class Config(metaclass=_EnvConfig):
+    """
+    Classe de configuração centralizada.
     
-    # Configurações de Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE = os.getenv("LOG_FILE", "logs/pdf_extractor.log")
+    Os valores vêm das variáveis de ambiente e do arquivo .env, lidos no
+    primeiro acesso a um deles (ou em load), e não na importação do
+    módulo: importar o pacote não carrega o python-dotenv.
+    """
     
-    # Configurações de Performance
-    MAX_WORKERS = int(os.getenv("MAX_WORKERS", "4"))
-    BATCH_SIZE = int(os.getenv("BATCH_SIZE", "10"))
+    _loaded = False
     
-    # Padrões Customizados
-    CUSTOM_PATTERNS = os.getenv("CUSTOM_PATTERNS", None)
+    @classmethod
+    def load(cls, dotenv_path: Optional[str] = None):
+        """
+        Carrega o arquivo .env e lê a configuração das variáveis de ambiente.
+        
+        Args:
+            dotenv_path: Caminho do arquivo .env (padrão: procurado a partir
+                do diretório atual)
+        """
+        from dotenv import load_dotenv
+        
+        # Variáveis já definidas no ambiente têm precedência sobre o .env
+        load_dotenv(dotenv_path)
+        
+        # Diretórios
+        cls.INPUT_DIR = os.getenv("INPUT_DIR", "data/input")
+        cls.OUTPUT_DIR = os.getenv("OUTPUT_DIR", "data/output")
+        
+        # Configurações de Processamento
+        cls.MIN_TEXT_LENGTH = int(os.getenv("MIN_TEXT_LENGTH", "50"))
+        cls.EXTRACT_TABLES = os.getenv("EXTRACT_TABLES", "True").lower() == "true"
+        cls.TABLE_PRECHECK = os.getenv("TABLE_PRECHECK", "True").lower() == "true"
+        cls.PRESERVE_STRUCTURE = os.getenv("PRESERVE_STRUCTURE", "False").lower() == "true"
+        cls.REMOVE_HEADERS = os.getenv("REMOVE_HEADERS", "True").lower() == "true"
+        cls.HEADER_DETECTION = os.getenv("HEADER_DETECTION", "regex")
+        cls.REPEATED_LINE_SHARE = float(os.getenv("REPEATED_LINE_SHARE", "0.5"))
+        cls.REPEATED_LINE_EDGE = int(os.getenv("REPEATED_LINE_EDGE", "3"))
+        cls.REPEATED_LINE_WINDOW = int(os.getenv("REPEATED_LINE_WINDOW", "50"))
+        cls.CROP_TOP = float(os.getenv("CROP_TOP", "0"))
+        cls.CROP_BOTTOM = float(os.getenv("CROP_BOTTOM", "0"))
+        cls.CROP_LEARN_PAGES = int(os.getenv("CROP_LEARN_PAGES", "0"))
+        cls.NORMALIZE_SPACES = os.getenv("NORMALIZE_SPACES", "True").lower() == "true"
+        cls.RESUME = os.getenv("RESUME", "False").lower() == "true"
+        cls.READ_ARCHIVES = os.getenv("READ_ARCHIVES", "False").lower() == "true"
+        cls.ARCHIVE_SPOOL_THRESHOLD_MB = float(os.getenv("ARCHIVE_SPOOL_THRESHOLD_MB", "64"))
+        cls.DEDUP = os.getenv("DEDUP", "none")
+        cls.NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+        cls.STREAM_PAGES = os.getenv("STREAM_PAGES", "False").lower() == "true"
+        cls.PIPELINE_DEPTH = int(os.getenv("PIPELINE_DEPTH", "0"))
+        cls.TIME_PAGES = os.getenv("TIME_PAGES", "False").lower() == "true"
+        
+        # Formato de Saída
+        cls.OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "txt")
+        cls.SHARD_MAX_RECORDS = int(os.getenv("SHARD_MAX_RECORDS", "10000"))
+        cls.WRITE_BUFFER_RECORDS = int(os.getenv("WRITE_BUFFER_RECORDS", "100"))
+        
+        # Configurações de Logging
+        cls.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+        cls.LOG_FILE = os.getenv("LOG_FILE", "logs/pdf_extractor.log")
+        
+        # Configurações de Performance
+        cls.MAX_WORKERS = int(os.getenv("MAX_WORKERS", "4"))
+        cls.BATCH_SIZE = int(os.getenv("BATCH_SIZE", "10"))
+        cls.PAGE_PARALLEL_THRESHOLD = int(os.getenv("PAGE_PARALLEL_THRESHOLD", "500"))
+        cls.SCHEDULE = os.getenv("SCHEDULE", "lpt")
+        cls.SCHEDULE_SECONDS_PER_PAGE = float(os.getenv("SCHEDULE_SECONDS_PER_PAGE", "0.05"))
+        cls.SCHEDULE_SECONDS_PER_MB = float(os.getenv("SCHEDULE_SECONDS_PER_MB", "0.1"))
+        
+        # Isolamento de documentos patológicos (0 desabilita cada limite)
+        cls.DOC_TIMEOUT = float(os.getenv("DOC_TIMEOUT", "0"))
+        cls.MEMORY_LIMIT_MB = float(os.getenv("MEMORY_LIMIT_MB", "0"))
+        cls.MAX_TASKS_PER_WORKER = int(os.getenv("MAX_TASKS_PER_WORKER", "0"))
+        
+        # Servidor de extração (python main.py serve)
+        cls.SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+        cls.SERVER_PORT = int(os.getenv("SERVER_PORT", "8765"))
+        cls.SERVER_QUEUE_SIZE = int(os.getenv("SERVER_QUEUE_SIZE", "32"))
+        cls.SERVER_MAX_REQUEST_MB = float(os.getenv("SERVER_MAX_REQUEST_MB", "100"))
+        
+        # Monitoramento de diretório (python main.py watch)
+        cls.WATCH_POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", "1.0"))
+        cls.WATCH_SETTLE_SECONDS = float(os.getenv("WATCH_SETTLE_SECONDS", "2.0"))
+        cls.WATCH_MAX_RETRIES = int(os.getenv("WATCH_MAX_RETRIES", "2"))
+        cls.WATCH_REPORT_INTERVAL = float(os.getenv("WATCH_REPORT_INTERVAL", "60"))
+        
+        # OCR das páginas sem camada de texto (requer pytesseract e Tesseract)
+        cls.OCR_ENABLED = os.getenv("OCR_ENABLED", "False").lower() == "true"
+        cls.OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+        cls.OCR_LANG = os.getenv("OCR_LANG", "por")
+        cls.OCR_MIN_CHARS = int(os.getenv("OCR_MIN_CHARS", "10"))
+        cls.OCR_WORKERS = int(os.getenv("OCR_WORKERS", "2"))
+        
+        # Cache de Resultados
+        cls.CACHE_DIR = os.getenv("CACHE_DIR", None)
+        cls.CACHE_MAX_SIZE_MB = float(os.getenv("CACHE_MAX_SIZE_MB", "1024"))
+        
+        # Padrões Customizados
+        cls.CUSTOM_PATTERNS = os.getenv("CUSTOM_PATTERNS", None)
+        
+        
+        cls._loaded = True
     
     @classmethod
     def get_config_dict(cls) -> Dict[str, Any]:
         """Retorna um dicionário com todas as configurações."""
         return {
             "extract_tables": cls.EXTRACT_TABLES,
+            "table_precheck": cls.TABLE_PRECHECK,
             "preserve_structure": cls.PRESERVE_STRUCTURE,
             "min_text_length": cls.MIN_TEXT_LENGTH,
             "remove_headers": cls.REMOVE_HEADERS,
+            "header_detection": cls.HEADER_DETECTION,
+            "repeated_line_share": cls.REPEATED_LINE_SHARE,
+            "repeated_line_edge": cls.REPEATED_LINE_EDGE,
+            "repeated_line_window": cls.REPEATED_LINE_WINDOW,
+            "crop_top": cls.CROP_TOP,
+            "crop_bottom": cls.CROP_BOTTOM,
+            "crop_learn_pages": cls.CROP_LEARN_PAGES,
             "normalize_spaces": cls.NORMALIZE_SPACES,
             "output_format": cls.OUTPUT_FORMAT,
+            "shard_max_records": cls.SHARD_MAX_RECORDS,
+            "write_buffer_records": cls.WRITE_BUFFER_RECORDS,
+            "stream_pages": cls.STREAM_PAGES,
+            "pipeline_depth": cls.PIPELINE_DEPTH,
+            "time_pages": cls.TIME_PAGES,
+            "resume": cls.RESUME,
+            "read_archives": cls.READ_ARCHIVES,
+            "archive_spool_threshold_mb": cls.ARCHIVE_SPOOL_THRESHOLD_MB,
+            "dedup": cls.DEDUP,
+            "near_dup_threshold": cls.NEAR_DUP_THRESHOLD,
+            "max_workers": cls.MAX_WORKERS,
+            "batch_size": cls.BATCH_SIZE,
+            "page_parallel_threshold": cls.PAGE_PARALLEL_THRESHOLD,
+            "doc_timeout": cls.DOC_TIMEOUT,
+            "memory_limit_mb": cls.MEMORY_LIMIT_MB,
+            "max_tasks_per_worker": cls.MAX_TASKS_PER_WORKER,
+            "schedule": cls.SCHEDULE,
+            "schedule_seconds_per_page": cls.SCHEDULE_SECONDS_PER_PAGE,
+            "schedule_seconds_per_mb": cls.SCHEDULE_SECONDS_PER_MB,
+            "ocr_enabled": cls.OCR_ENABLED,
+            "ocr_dpi": cls.OCR_DPI,
+            "ocr_lang": cls.OCR_LANG,
+            "ocr_min_chars": cls.OCR_MIN_CHARS,
+            "ocr_workers": cls.OCR_WORKERS,
+            "cache_dir": cls.CACHE_DIR,
+            "cache_max_size_mb": cls.CACHE_MAX_SIZE_MB,
         }
     
     @classmethod
@@ -59,6 +175,10 @@ class Config:
                 "remove_headers": False,
                 "normalize_spaces": True,
                 "min_text_length": 50,
+                # Cabeçalhos e rodapés fazem parte do documento: sem recorte
+                "crop_top": 0,
+                "crop_bottom": 0,
+                "crop_learn_pages": 0,
             },
             "corporate": {
                 "extract_tables": True,
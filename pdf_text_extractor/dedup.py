@@ -0,0 +1,310 @@
+"""
+Módulo de detecção de documentos duplicados e quase duplicados.
+"""
+import hashlib
+import logging
+import random
+import re
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .sources import PDFInput, as_source
+
+logger = logging.getLogger(__name__)
+
+# Palavras do texto limpo, base dos shingles
+_WORDS = re.compile(r'\w+')
+
+# Valor inicial de cada mínimo (maior que qualquer hash de 64 bits)
+_MAX_HASH = 1 << 64
+
+# Shingles por bloco no cálculo com numpy: limita a matriz num_perm x bloco
+_VECTOR_BLOCK = 4096
+
+
+def find_exact_duplicates(pdf_files: Sequence[PDFInput]) -> Tuple[List[PDFInput], Dict[PDFInput, PDFInput]]:
+    """
+    Agrupa os arquivos de conteúdo idêntico byte a byte.
+    
+    Os arquivos são agrupados primeiro pelo tamanho; o hash SHA-256 só é
+    calculado para os arquivos cujo tamanho coincide com o de outro, de
+    modo que um lote sem duplicatas não é lido por inteiro.
+    
+    Args:
+        pdf_files: Arquivos PDF ou membros de arquivos compactados
+    
+    Returns:
+        Tupla (arquivos únicos, na ordem original; duplicata -> primeiro
+        arquivo com o mesmo conteúdo)
+    """
+    by_size: Dict[Any, List[PDFInput]] = {}
+    for pdf_file in pdf_files:
+        try:
+            size = as_source(pdf_file).stat()[0]
+        except (OSError, KeyError):
+            size = None
+        # Tamanho desconhecido: o arquivo é tratado como único
+        by_size.setdefault(size if size is not None else object(), []).append(pdf_file)
+    
+    duplicates: Dict[PDFInput, PDFInput] = {}
+    for group in by_size.values():
+        if len(group) < 2:
+            continue
+        
+        canonical_by_hash: Dict[str, PDFInput] = {}
+        for pdf_file in group:
+            try:
+                content_hash = as_source(pdf_file).sha256()
+            except (OSError, KeyError):
+                continue
+            canonical = canonical_by_hash.setdefault(content_hash, pdf_file)
+            if canonical is not pdf_file:
+                duplicates[pdf_file] = canonical
+    
+    unique_files = [pdf_file for pdf_file in pdf_files if pdf_file not in duplicates]
+    
+    if duplicates:
+        logger.info(
+            f"Duplicatas exatas: {len(duplicates)} de {len(pdf_files)} arquivos "
+            f"reaproveitam a extração de outro arquivo"
+        )
+    
+    return unique_files, duplicates
+
+
+class MinHashSignature:
+    """
+    Assinatura MinHash dos shingles de palavras de um texto.
+    
+    O texto pode ser entregue em blocos (update ou write, como um escritor
+    de saída): os mínimos são atualizados a cada bloco e só as últimas
+    palavras ficam em memória para formar os shingles entre blocos. A
+    assinatura é a mesma do texto completo entregue de uma só vez.
+    
+    Cada shingle recebe um único hash de 64 bits; as num_perm permutações
+    são obtidas por XOR com máscaras fixas, sem recalcular o hash. Com o
+    pacote opcional numpy, o XOR e o mínimo de cada permutação são
+    calculados em blocos vetorizados; sem ele, em Python puro, com o
+    mesmo resultado.
+    """
+    
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        """
+        Inicializa a assinatura vazia.
+        
+        Args:
+            num_perm: Número de permutações (tamanho da assinatura)
+            shingle_size: Palavras por shingle
+            seed: Semente das máscaras; assinaturas só são comparáveis com
+                os mesmos num_perm e seed
+        """
+        self.shingle_size = shingle_size
+        self._masks = [random.Random(seed + index).getrandbits(64) for index in range(num_perm)]
+        self._mins = [_MAX_HASH] * num_perm
+        
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        self._numpy = numpy
+        self._mask_column = None
+        if numpy is not None:
+            self._mask_column = numpy.array(self._masks, dtype=numpy.uint64)[:, None]
+        self._words: List[str] = []
+        self._tail = ""
+        self.shingles = 0
+    
+    def update(self, text: str):
+        """
+        Acrescenta um bloco do texto.
+        
+        Args:
+            text: Bloco de texto
+        """
+        text = self._tail + text
+        
+        # A palavra no fim do bloco pode continuar no próximo
+        match = re.search(r'\w+$', text)
+        cut = match.start() if match else len(text)
+        self._tail = text[cut:]
+        
+        self._add_words(_WORDS.findall(text, 0, cut))
+    
+    def write(self, text: str):
+        """Acrescenta um bloco do texto (interface de escritor)."""
+        self.update(text)
+    
+    def _add_words(self, words: List[str]):
+        """Atualiza os mínimos com os shingles que terminam nas novas palavras."""
+        if not words:
+            return
+        
+        words = self._words + [word.lower() for word in words]
+        size = self.shingle_size
+        
+        hashes = {
+            int.from_bytes(
+                hashlib.blake2b(" ".join(words[start:start + size]).encode("utf-8"), digest_size=8).digest(),
+                "big",
+            )
+            for start in range(len(words) - size + 1)
+        }
+        self._words = words[-(size - 1):] if size > 1 else []
+        
+        if not hashes:
+            return
+        
+        self.shingles += len(hashes)
+        if self._numpy is not None:
+            self._mins = self._vector_mins(hashes)
+        else:
+            self._mins = [
+                min(current, min(map(mask.__xor__, hashes)))
+                for current, mask in zip(self._mins, self._masks)
+            ]
+    
+    def _vector_mins(self, hashes: Set[int]) -> List[int]:
+        """Mínimos atualizados com o numpy: uma matriz máscaras x shingles por bloco."""
+        numpy = self._numpy
+        values = numpy.fromiter(hashes, dtype=numpy.uint64, count=len(hashes))
+        
+        mins = self._mins
+        for start in range(0, len(values), _VECTOR_BLOCK):
+            block = numpy.bitwise_xor(self._mask_column, values[start:start + _VECTOR_BLOCK]).min(axis=1)
+            mins = [min(current, value) for current, value in zip(mins, block.tolist())]
+        return mins
+    
+    def digest(self) -> Optional[Tuple[int, ...]]:
+        """
+        Finaliza a assinatura.
+        
+        Returns:
+            Tupla com os num_perm mínimos, ou None se o texto não tem
+            palavras suficientes para um shingle
+        """
+        if self._tail:
+            tail, self._tail = self._tail, ""
+            self._add_words([tail])
+        
+        if not self.shingles:
+            return None
+        return tuple(self._mins)
+    
+    @classmethod
+    def of_text(cls, text: str, **kwargs) -> Optional[Tuple[int, ...]]:
+        """
+        Calcula a assinatura de um texto completo.
+        
+        Args:
+            text: Texto limpo
+            **kwargs: Parâmetros de MinHashSignature
+        
+        Returns:
+            Assinatura, ou None para textos sem shingles
+        """
+        signature = cls(**kwargs)
+        signature.update(text)
+        return signature.digest()
+
+
+class NearDuplicateIndex:
+    """
+    Índice LSH (locality-sensitive hashing) de assinaturas MinHash.
+    
+    A assinatura é dividida em bandas; documentos com alguma banda idêntica
+    são candidatos, e a similaridade de Jaccard estimada (fração de
+    mínimos iguais) decide se são quase duplicatas. Cada documento é
+    comparado apenas com os candidatos, não com todo o lote.
+    
+    Os documentos são indexados na ordem em que terminam, e os grupos só
+    são formados em resolve, percorrendo-os pela identificação: o original
+    de cada grupo é o de menor identificação, qualquer que seja a ordem de
+    conclusão no processamento paralelo.
+    """
+    
+    def __init__(self, threshold: float = 0.8, bands: int = 32):
+        """
+        Inicializa o índice vazio.
+        
+        Args:
+            threshold: Similaridade estimada mínima para quase duplicatas
+            bands: Número de bandas da assinatura
+        """
+        self.threshold = threshold
+        self.bands = bands
+        # Cada banda é indexada pelo hash de seus valores; colisões apenas
+        # acrescentam candidatos, descartados pela similaridade
+        self._buckets: List[Dict[int, List[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, array] = {}
+    
+    def __len__(self) -> int:
+        return len(self._signatures)
+    
+    def _band_keys(self, signature: Sequence[int]) -> List[int]:
+        """Divide a assinatura em bandas de tamanho igual."""
+        rows = max(1, len(signature) // self.bands)
+        return [hash(tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+    
+    @staticmethod
+    def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+        """
+        Estima a similaridade de Jaccard entre dois documentos.
+        
+        Args:
+            first: Assinatura do primeiro documento
+            second: Assinatura do segundo documento
+        
+        Returns:
+            Fração dos mínimos iguais
+        """
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+    
+    def add(self, key: str, signature: Sequence[int]):
+        """
+        Indexa um documento.
+        
+        Args:
+            key: Identificação do documento
+            signature: Assinatura MinHash do texto limpo
+        """
+        # Valores de 64 bits sem sinal: 8 bytes por mínimo em vez de um int por posição
+        signature = array("Q", signature)
+        self._signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append(key)
+    
+    def resolve(self) -> Dict[str, Tuple[str, float]]:
+        """
+        Agrupa os documentos indexados em quase duplicatas.
+        
+        Os documentos são percorridos em ordem de identificação; cada um é
+        comparado com os originais já encontrados que compartilham alguma
+        banda e, se nenhum atingir o limite, passa a ser o original de um
+        novo grupo.
+        
+        Returns:
+            Quase duplicata -> (documento original, similaridade estimada)
+        """
+        matches: Dict[str, Tuple[str, float]] = {}
+        originals = set()
+        
+        for key in sorted(self._signatures):
+            signature = self._signatures[key]
+            best = None
+            seen = set()
+            for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+                for candidate in buckets[band_key]:
+                    if candidate in seen or candidate not in originals:
+                        continue
+                    seen.add(candidate)
+                    score = self.similarity(signature, self._signatures[candidate])
+                    # Empates ficam com o original de menor identificação
+                    if score >= self.threshold and (best is None or (-score, candidate) < (-best[1], best[0])):
+                        best = (candidate, score)
+            
+            if best is None:
+                originals.add(key)
+            else:
+                matches[key] = (best[0], round(best[1], 4))
+        
+        return matches
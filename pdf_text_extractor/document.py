@@ -0,0 +1,409 @@
+"""
+Módulo de sessão de documento PDF.
+"""
+import logging
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple, Union
+from .sources import PDFInput, as_source
+from .timing import StageTimer
+
+logger = logging.getLogger(__name__)
+
+
+class PDFDocumentSession:
+    """
+    Sessão sobre um PDF aberto uma única vez, que fornece texto,
+    tabelas, metadados e número de páginas a partir do mesmo parse.
+    """
+    
+    def __init__(
+        self,
+        pdf_path: PDFInput,
+        extract_tables: bool = True,
+        pages: Optional[Iterable[int]] = None,
+        table_precheck: bool = True,
+        timer: Optional[StageTimer] = None,
+        crop_margins: Optional[Tuple[float, float]] = None,
+        ocr=None
+    ):
+        """
+        Abre o documento PDF.
+        
+        Args:
+            pdf_path: Caminho para o arquivo PDF, bytes, objeto de arquivo
+                binário ou PDFSource (ex.: membro de um arquivo zip)
+            extract_tables: Se True, inclui as tabelas no texto das páginas
+            pages: Números das páginas (a partir de 1) a considerar; por
+                padrão, todas
+            table_precheck: Se True, pula a detecção de tabelas em páginas
+                sem geometria de tabela
+            timer: Medidor dos tempos de abertura e de extração de texto
+                e tabelas (padrão: um medidor próprio)
+            crop_margins: Faixas (superior, inferior), em pontos, excluídas
+                de cada página antes da extração de texto e tabelas
+            ocr: PageOCR para as páginas sem camada de texto (opcional)
+                
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado
+        """
+        self.source = as_source(pdf_path)
+        self.name = self.source.name
+        # Caminho em disco; None para documentos em memória ou em arquivos compactados
+        self.path = self.source.path
+        
+        if not self.source.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {pdf_path}")
+        
+        self.extract_tables = extract_tables
+        self.table_precheck = table_precheck
+        self.table_stats = {"pages_analysed": 0, "pages_skipped": 0}
+        self.timer = timer if timer is not None else StageTimer()
+        self.crop_margins = tuple(crop_margins) if crop_margins else (0.0, 0.0)
+        self.ocr = ocr
+        self.ocr_pages = 0
+        self._content_hash: Optional[str] = None
+        
+        # Importado sob demanda: o pdfplumber é a dependência mais pesada do pacote
+        import pdfplumber
+        
+        with self.timer.stage("open"):
+            self._pdf = pdfplumber.open(
+                self.source.open(), pages=list(pages) if pages is not None else None
+            )
+        self._tables: Dict[int, List[list]] = {}
+        self._crops: Dict[int, Any] = {}
+        self._page_texts: Optional[List[str]] = None
+    
+    def __enter__(self) -> "PDFDocumentSession":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Fecha o documento e libera os recursos do pdfplumber."""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadados do PDF (dicionário Info)."""
+        return self._pdf.metadata or {}
+    
+    @property
+    def num_pages(self) -> int:
+        """Número de páginas do documento."""
+        return len(self._pdf.pages)
+    
+    def iter_pages(self) -> Iterator[Any]:
+        """Itera sobre as páginas do documento."""
+        return iter(self._pdf.pages)
+    
+    def release_page(self, page):
+        """
+        Libera o cache de objetos e de layout de uma página já processada.
+        
+        Args:
+            page: Página do pdfplumber
+        """
+        page.close()
+        self._tables.pop(page.page_number, None)
+        self._crops.pop(page.page_number, None)
+    
+    def crop_page(self, page):
+        """
+        Exclui da página as faixas de cabeçalho e rodapé (crop_margins).
+        
+        Os caracteres fora da área recortada não chegam a ser agrupados em
+        palavras, linhas ou tabelas; na horizontal, a área cobre a página
+        e todos os seus caracteres. O recorte de cada página é
+        reaproveitado, e recortar uma página já recortada não a altera.
+        
+        Args:
+            page: Página do pdfplumber
+            
+        Returns:
+            Página recortada, ou a própria página sem faixas configuradas
+        """
+        top_margin, bottom_margin = self.crop_margins
+        if not (top_margin or bottom_margin):
+            return page
+        
+        cropped = self._crops.get(page.page_number)
+        if cropped is None:
+            x0, top, x1, bottom = page.bbox
+            if top + top_margin >= bottom - bottom_margin:
+                return page
+            # Só as faixas verticais são recortadas: glyphs que ultrapassam a
+            # MediaBox na horizontal continuam na página, como sem recorte
+            chars = page.chars
+            if chars:
+                x0 = min(x0, min(char["x0"] for char in chars))
+                x1 = max(x1, max(char["x1"] for char in chars))
+            cropped = page.crop((x0, top + top_margin, x1, bottom - bottom_margin), strict=False)
+            self._crops[page.page_number] = cropped
+        return cropped
+    
+    def learn_crop_margins(self, detector, num_pages: int) -> Tuple[float, float]:
+        """
+        Aprende as faixas de cabeçalho e rodapé nas primeiras páginas e
+        passa a recortá-las em todas as páginas.
+        
+        Args:
+            detector: RepeatedLineDetector usado na comparação das linhas
+            num_pages: Número de páginas iniciais analisadas
+            
+        Returns:
+            Faixas aprendidas (superior, inferior), em pontos
+        """
+        pages = self._pdf.pages[:num_pages]
+        with self.timer.stage("extract_text"):
+            page_lines = [page.extract_text_lines() for page in pages]
+        
+        self.crop_margins = detector.learn_margins(page_lines, [page.bbox for page in pages])
+        self._crops.clear()
+        logger.debug(f"Faixas de recorte aprendidas: {self.crop_margins}")
+        
+        return self.crop_margins
+    
+    def get_page_tables(self, page) -> List[list]:
+        """
+        Extrai as tabelas de uma página, reaproveitando extrações anteriores.
+        
+        Args:
+            page: Página do pdfplumber
+            
+        Returns:
+            Lista de tabelas (listas de linhas)
+        """
+        page = self.crop_page(page)
+        
+        if page.page_number not in self._tables:
+            if self.table_precheck and not self.may_have_tables(page):
+                self.table_stats["pages_skipped"] += 1
+                self._tables[page.page_number] = []
+            else:
+                self.table_stats["pages_analysed"] += 1
+                with self.timer.stage("extract_tables", page.page_number):
+                    self._tables[page.page_number] = page.extract_tables() or []
+        return self._tables[page.page_number]
+    
+    @staticmethod
+    def may_have_tables(page) -> bool:
+        """
+        Verifica de forma barata se a página pode conter tabelas.
+        
+        Com as configurações padrão do pdfplumber (estratégia "lines"), uma
+        tabela é formada pelas bordas de linhas, retângulos e curvas e
+        exige ao menos duas bordas horizontais e duas verticais. Páginas sem
+        essa geometria não podem ter tabelas, e a análise completa de
+        bordas e interseções é dispensada.
+        
+        Args:
+            page: Página do pdfplumber
+            
+        Returns:
+            False se a página certamente não tem tabelas
+        """
+        if not (page.lines or page.rects or page.curves):
+            return False
+        
+        horizontal = vertical = 0
+        for edge in page.edges:
+            if edge["orientation"] == "h":
+                horizontal += 1
+            elif edge["orientation"] == "v":
+                vertical += 1
+            if horizontal >= 2 and vertical >= 2:
+                return True
+        
+        return False
+    
+    def extract_tables_all(self) -> List[List[list]]:
+        """
+        Extrai as tabelas de todas as páginas.
+        
+        Returns:
+            Lista com as tabelas de cada página, na ordem das páginas
+        """
+        return [self.get_page_tables(page) for page in self.iter_pages()]
+    
+    def extract_page_text(self, page) -> str:
+        """
+        Extrai o texto de uma página, incluindo tabelas se configurado.
+        
+        Args:
+            page: Página do pdfplumber
+            
+        Returns:
+            Texto da página
+        """
+        page = self.crop_page(page)
+        
+        with self.timer.stage("extract_text", page.page_number):
+            page_text = page.extract_text() or ""
+        
+        if self.extract_tables:
+            for table in self.get_page_tables(page):
+                table_text = self.format_table(table)
+                page_text += f"\n\n{table_text}"
+        
+        return page_text
+    
+    def _submit_ocr(self, page) -> Optional[Future]:
+        """
+        Envia a página ao OCR se ela não tiver camada de texto.
+        
+        Args:
+            page: Página do pdfplumber
+            
+        Returns:
+            Future do OCR, ou None se a página tem texto nativo
+        """
+        if self.ocr is None or not self.ocr.needs_ocr(self.crop_page(page)):
+            return None
+        
+        if self._content_hash is None and self.ocr.cache is not None:
+            self._content_hash = self.source.sha256()
+        
+        return self.ocr.submit(self.source, page.page_number, self._content_hash, self.crop_margins)
+    
+    def _collect_ocr(self, page_number: int, future: Future) -> str:
+        """Aguarda o OCR de uma página e registra seu tempo."""
+        text, seconds = self.ocr.collect(future, page_number, self._content_hash)
+        self.timer.add("ocr", seconds, page_number)
+        self.ocr_pages += 1
+        return text
+    
+    def iter_page_texts(self, release_pages: bool = True) -> Iterator[str]:
+        """
+        Extrai o texto do documento página a página.
+        
+        Páginas enviadas ao OCR não interrompem a extração das seguintes:
+        os textos já extraídos aguardam, em ordem, até o OCR terminar.
+        
+        Args:
+            release_pages: Se True, libera o cache de cada página assim que
+                seu texto é extraído, mantendo a memória limitada
+                
+        Yields:
+            Texto de cada página, na ordem do documento
+        """
+        pending: deque = deque()
+        
+        for page in self.iter_pages():
+            logger.debug(f"Processando página {page.page_number}/{self.num_pages}")
+            future = self._submit_ocr(page)
+            pending.append((page.page_number, future if future is not None else self.extract_page_text(page)))
+            
+            if release_pages:
+                self.release_page(page)
+            
+            while pending and not (isinstance(pending[0][1], Future) and not pending[0][1].done()):
+                yield self._resolve(*pending.popleft())
+        
+        while pending:
+            yield self._resolve(*pending.popleft())
+    
+    def _resolve(self, page_number: int, text_or_future: Union[str, Future]) -> str:
+        """Retorna o texto extraído ou aguarda o OCR da página."""
+        if isinstance(text_or_future, Future):
+            return self._collect_ocr(page_number, text_or_future)
+        return text_or_future
+    
+    def extract_page_texts(self) -> List[str]:
+        """
+        Extrai o texto de todas as páginas do documento.
+        
+        Returns:
+            Texto de cada página, na ordem do documento
+        """
+        if self._page_texts is None:
+            texts = []
+            
+            # O OCR roda no próprio pool enquanto as demais páginas são extraídas
+            for page in self.iter_pages():
+                logger.debug(f"Processando página {page.page_number}/{self.num_pages}")
+                future = self._submit_ocr(page)
+                texts.append((page.page_number, future if future is not None else self.extract_page_text(page)))
+            
+            self._page_texts = [self._resolve(*item) for item in texts]
+        
+        return self._page_texts
+    
+    def extract_text(self) -> str:
+        """
+        Extrai o texto completo do documento.
+        
+        Returns:
+            Texto de todas as páginas, separadas por linha em branco
+        """
+        return "\n\n".join(self.extract_page_texts())
+    
+    @staticmethod
+    def format_table(table: list) -> str:
+        """
+        Formata uma tabela extraída em texto.
+        
+        Args:
+            table: Lista de listas representando a tabela
+            
+        Returns:
+            Texto formatado da tabela
+        """
+        if not table:
+            return ""
+        
+        formatted_rows = []
+        for row in table:
+            # Remove valores None e converte para string
+            clean_row = [str(cell) if cell is not None else "" for cell in row]
+            formatted_rows.append(" | ".join(clean_row))
+        
+        return "\n".join(formatted_rows)
+
+
+def extract_page_range(
+    pdf_path: str,
+    first_page: int,
+    last_page: int,
+    extract_tables: bool = True,
+    table_precheck: bool = True,
+    crop_margins: Optional[Tuple[float, float]] = None,
+    ocr=None,
+    content_hash: Optional[str] = None
+) -> Tuple[List[str], Dict[str, int], Dict[str, Any]]:
+    """
+    Extrai o texto de um intervalo de páginas em uma sessão própria.
+    
+    Usada pelos processos trabalhadores da extração paralela por página:
+    cada processo abre o arquivo e processa apenas a sua fatia.
+    
+    Args:
+        pdf_path: Caminho para o arquivo PDF
+        first_page: Primeira página do intervalo (a partir de 1)
+        last_page: Última página do intervalo (inclusive)
+        extract_tables: Se True, inclui as tabelas no texto das páginas
+        table_precheck: Se True, pula a detecção de tabelas em páginas
+            sem geometria de tabela
+        crop_margins: Faixas (superior, inferior) excluídas de cada página
+        ocr: PageOCR executado no próprio processo (ver PageOCR.inline)
+        content_hash: Hash do documento, calculado uma vez no processo
+            principal, para o cache do OCR (opcional)
+            
+    Returns:
+        Tupla (texto de cada página do intervalo, em ordem; contadores de
+        páginas analisadas e puladas na detecção de tabelas, e de páginas
+        com OCR; tempos por etapa e por página, ver StageTimer.export)
+    """
+    pages = range(first_page, last_page + 1)
+    timer = StageTimer(per_page=True)
+    with PDFDocumentSession(
+        pdf_path, extract_tables=extract_tables, pages=pages,
+        table_precheck=table_precheck, timer=timer, crop_margins=crop_margins, ocr=ocr,
+    ) as document:
+        document._content_hash = content_hash
+        page_texts = list(document.iter_page_texts())
+        return page_texts, {**document.table_stats, "ocr_pages": document.ocr_pages}, timer.export()
@@ -1,11 +1,19 @@
 """
 Módulo de extração de texto de PDFs.
 """
-import pdfplumber
 import logging
-from pathlib import Path
-from typing import Dict, Optional, Any
+import math
+from itertools import islice
+from concurrent.futures import Executor
+from typing import Dict, Iterator, List, Optional, Any
+from .boilerplate import RepeatedLineDetector
+from .cache import ExtractionCache
 from .cleaner import PDFTextCleaner
+from .document import PDFDocumentSession, extract_page_range
+from .ocr import PageOCR
+from .pipeline import PagePipeline
+from .sources import PDFInput, PDFSource, as_source
+from .timing import StageTimer
 
 logger = logging.getLogger(__name__)
 
@@ -30,82 +38,350 @@ class CleanPDFExtractor:
         self.min_text_length = self.config.get("min_text_length", 50)
         self.remove_headers = self.config.get("remove_headers", True)
         self.normalize_spaces = self.config.get("normalize_spaces", True)
+        self.table_precheck = self.config.get("table_precheck", True)
+        
+        # Detecção de cabeçalhos e rodapés: padrões regex ou repetição entre páginas
+        self.header_detection = self.config.get("header_detection", "regex")
+        repeated_lines = RepeatedLineDetector(
+            edge_lines=self.config.get("repeated_line_edge", 3),
+            min_share=self.config.get("repeated_line_share", 0.5),
+        )
+        self.line_detector = repeated_lines if self.header_detection == "repeated" else None
+        # Páginas iniciais em que as linhas repetidas são aprendidas na
+        # extração página a página
+        self.repeated_line_window = max(1, self.config.get("repeated_line_window", 50))
+        
+        # Faixas de cabeçalho e rodapé recortadas antes da extração (em
+        # pontos), fixas ou aprendidas nas primeiras páginas de cada documento
+        self.crop_margins = (
+            float(self.config.get("crop_top", 0)),
+            float(self.config.get("crop_bottom", 0)),
+        )
+        self.crop_learn_pages = self.config.get("crop_learn_pages", 0)
+        self.crop_detector = repeated_lines
+        
+        # Paralelismo por página para documentos grandes (0 desabilita)
+        self.page_parallel_threshold = self.config.get("page_parallel_threshold", 0)
+        self.page_workers = self.config.get("page_workers", self.config.get("max_workers", 1))
+        
+        # Extração, limpeza e escrita página a página em estágios
+        # concorrentes, com filas de pipeline_depth páginas (0 desabilita)
+        self.pipeline_depth = self.config.get("pipeline_depth", 0)
+        
+        # Cache de resultados em disco (opcional)
+        self.cache = None
+        if self.config.get("cache_dir"):
+            self.cache = ExtractionCache(
+                self.config["cache_dir"],
+                self.config.get("cache_max_size_mb", 1024),
+            )
+        
+        # OCR das páginas sem camada de texto, em um pool de processos próprio
+        self.ocr = None
+        if self.config.get("ocr_enabled", False):
+            self.ocr = PageOCR(
+                dpi=self.config.get("ocr_dpi", 300),
+                lang=self.config.get("ocr_lang", "por"),
+                min_chars=self.config.get("ocr_min_chars", 10),
+                max_workers=self.config.get("ocr_workers", 2),
+                cache=self.cache,
+            )
+        
+        # Medição de tempo por etapa: por página e callbacks opcionais
+        self.time_pages = self.config.get("time_pages", False)
+        self.timing_callbacks = list(self.config.get("timing_callbacks") or [])
         
         logger.info("CleanPDFExtractor inicializado")
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def create_timer(self, pdf_path: PDFInput) -> StageTimer:
+        """
+        Cria o medidor de tempo por etapa de um documento.
+        
+        Args:
+            pdf_path: Caminho para o arquivo PDF, bytes, objeto de arquivo ou PDFSource
+        
+        Returns:
+            Medidor configurado com time_pages e timing_callbacks
+        """
+        return StageTimer(
+            per_page=self.time_pages,
+            callbacks=self.timing_callbacks,
+            context={"filename": as_source(pdf_path).name},
+        )
+    
+    def open_document(self, pdf_path: PDFInput, timer: Optional[StageTimer] = None) -> PDFDocumentSession:
+        """
+        Abre um PDF uma única vez para extrair texto, tabelas e metadados.
+        
+        Args:
+            pdf_path: Caminho para o arquivo PDF, bytes, objeto de arquivo
+                binário (ex.: BytesIO ou mmap) ou PDFSource
+            timer: Medidor de tempo por etapa (opcional)
+        
+        Returns:
+            Sessão do documento (usar como gerenciador de contexto)
+        
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado
+        """
+        try:
+            document = PDFDocumentSession(
+                pdf_path,
+                extract_tables=self.extract_tables,
+                table_precheck=self.table_precheck,
+                timer=timer,
+                crop_margins=self.crop_margins,
+                ocr=self.ocr,
+            )
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao abrir {pdf_path}: {str(e)}")
+            raise
+        
+        if self.crop_learn_pages > 0 and not any(self.crop_margins):
+            try:
+                document.learn_crop_margins(self.crop_detector, self.crop_learn_pages)
+            except Exception:
+                document.close()
+                raise
+        
+        return document
+    
+    def extract_text_from_pdf(self, pdf_path: PDFInput) -> str:
         """
         Extrai texto de um arquivo PDF.
         
         Args:
-            pdf_path: Caminho para o arquivo PDF
-            
+            pdf_path: Caminho para o arquivo PDF, bytes, objeto de arquivo ou PDFSource
+        
         Returns:
             Texto extraído do PDF
-            
+        
         Raises:
             FileNotFoundError: Se o arquivo não for encontrado
             Exception: Para outros erros de processamento
         """
-        pdf_file = Path(pdf_path)
+        with self.open_document(pdf_path) as document:
+            return "\n\n".join(self._extract_page_texts(document))
+    
+    def _extract_page_texts(self, document: PDFDocumentSession) -> List[str]:
+        """
+        Extrai o texto bruto de cada página de uma sessão de documento aberta.
         
-        if not pdf_file.exists():
-            raise FileNotFoundError(f"Arquivo não encontrado: {pdf_path}")
+        Args:
+            document: Sessão do documento
         
-        logger.info(f"Extraindo texto de: {pdf_path}")
+        Returns:
+            Texto de cada página, na ordem do documento
+        """
+        logger.info(f"Extraindo texto de: {document.source}")
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                text_parts = []
-                
-                for page_num, page in enumerate(pdf.pages, 1):
-                    logger.debug(f"Processando página {page_num}/{len(pdf.pages)}")
-                    
-                    # Extrai texto da página
-                    page_text = page.extract_text() or ""
-                    
-                    # Extrai tabelas se configurado
-                    if self.extract_tables:
-                        tables = page.extract_tables()
-                        if tables:
-                            for table in tables:
-                                table_text = self._format_table(table)
-                                page_text += f"\n\n{table_text}"
-                    
-                    text_parts.append(page_text)
-                
-                full_text = "\n\n".join(text_parts)
-                logger.info(f"Texto extraído: {len(full_text)} caracteres")
-                
-                return full_text
-                
+            if self._use_page_parallelism(document):
+                page_texts = list(self._iter_page_texts(document))
+            else:
+                page_texts = document.extract_page_texts()
+            
+            # Inclui os separadores entre páginas do texto completo
+            num_chars = sum(len(text) for text in page_texts) + 2 * max(0, len(page_texts) - 1)
+            logger.info(f"Texto extraído: {num_chars} caracteres")
+            
+            return page_texts
+        
         except Exception as e:
-            logger.error(f"Erro ao extrair texto de {pdf_path}: {str(e)}")
+            logger.error(f"Erro ao extrair texto de {document.source}: {str(e)}")
             raise
     
-    def extract_clean_text(self, pdf_path: str) -> str:
+    def _use_page_parallelism(self, document: PDFDocumentSession) -> bool:
         """
-        Extrai e limpa o texto de um arquivo PDF.
+        Indica se o documento é grande o bastante para extração paralela por página.
         
         Args:
-            pdf_path: Caminho para o arquivo PDF
+            document: Sessão do documento
+        
+        Returns:
+            True se o número de páginas atinge page_parallel_threshold e o
+            documento está em disco (cada processo reabre o arquivo)
+        """
+        return (
+            document.path is not None
+            and self.page_workers > 1
+            and self.page_parallel_threshold > 0
+            and document.num_pages >= self.page_parallel_threshold
+        )
+    
+    def _iter_page_texts(self, document: PDFDocumentSession) -> Iterator[str]:
+        """
+        Itera sobre o texto bruto das páginas, em paralelo se o documento for grande.
+        
+        Args:
+            document: Sessão do documento
+        
+        Yields:
+            Texto de cada página, na ordem do documento
+        """
+        if not self._use_page_parallelism(document):
+            yield from document.iter_page_texts()
+            return
+        
+        # Fatias contíguas menores que num_pages / page_workers equilibram a carga
+        num_pages = document.num_pages
+        chunk_size = max(1, math.ceil(num_pages / (self.page_workers * 4)))
+        ranges = [
+            (first_page, min(first_page + chunk_size - 1, num_pages))
+            for first_page in range(1, num_pages + 1, chunk_size)
+        ]
+        
+        logger.info(
+            f"Extração paralela de {num_pages} páginas: "
+            f"{self.page_workers} processos, {len(ranges)} fatias"
+        )
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # O OCR de cada fatia consulta o mesmo cache em disco; o hash do
+        # documento é calculado aqui, e não uma vez por fatia
+        page_ocr = self.ocr.inline() if self.ocr is not None else None
+        content_hash = None
+        if page_ocr is not None and page_ocr.cache is not None:
+            content_hash = document.source.sha256()
+        
+        with ProcessPoolExecutor(max_workers=min(self.page_workers, len(ranges))) as executor:
+            futures = [
+                executor.submit(
+                    extract_page_range, str(document.path), first_page, last_page,
+                    self.extract_tables, self.table_precheck, document.crop_margins,
+                    page_ocr, content_hash,
+                )
+                for first_page, last_page in ranges
+            ]
             
+            # Reagrupa as fatias na ordem das páginas
+            for future in futures:
+                page_texts, table_stats, timings = future.result()
+                document.ocr_pages += table_stats.pop("ocr_pages", 0)
+                for key, value in table_stats.items():
+                    document.table_stats[key] += value
+                document.timer.merge(timings)
+                yield from page_texts
+    
+    def _clean(
+        self,
+        raw_text: str,
+        timer: Optional[StageTimer] = None,
+        page: Optional[int] = None,
+        header_regex: bool = True,
+        prefilter_stats: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Aplica a limpeza configurada ao texto bruto.
+        
+        Args:
+            raw_text: Texto bruto extraído do PDF
+            timer: Medidor de tempo por etapa (opcional)
+            page: Número da página, quando a limpeza é feita por página
+            header_regex: Se False, os cabeçalhos já foram removidos e as
+                passagens de padrões de cabeçalho são dispensadas
+            prefilter_stats: Contadores do pré-filtro do documento (opcional)
+        
         Returns:
-            Texto limpo extraído do PDF
+            Texto limpo
         """
-        # Extrai texto bruto
-        raw_text = self.extract_text_from_pdf(pdf_path)
+        if timer is None:
+            return self.cleaner.clean_document(
+                raw_text,
+                remove_headers=self.remove_headers,
+                normalize_spaces=self.normalize_spaces,
+                header_regex=header_regex,
+                prefilter_stats=prefilter_stats,
+            )
+        
+        with timer.stage("clean", page):
+            return self._clean(raw_text, header_regex=header_regex, prefilter_stats=prefilter_stats)
+    
+    def _clean_pages(
+        self,
+        page_texts: List[str],
+        timer: Optional[StageTimer] = None,
+        prefilter_stats: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Limpa o documento a partir do texto bruto de cada página.
+        
+        Com header_detection="repeated", os cabeçalhos e rodapés são
+        detectados pela repetição entre páginas e removidos antes da
+        limpeza, no lugar das passagens de padrões de cabeçalho.
+        
+        Args:
+            page_texts: Texto bruto de cada página, na ordem do documento
+            timer: Medidor de tempo por etapa (opcional)
+            prefilter_stats: Contadores do pré-filtro do documento (opcional)
+        
+        Returns:
+            Texto limpo
+        """
+        if self.line_detector is None or not self.remove_headers:
+            return self._clean("\n\n".join(page_texts), timer, prefilter_stats=prefilter_stats)
         
-        # Aplica limpeza
-        clean_text = self.cleaner.clean_text(raw_text)
+        if timer is None:
+            page_texts = self.line_detector.strip_pages(page_texts)
+            return self._clean("\n\n".join(page_texts), header_regex=False, prefilter_stats=prefilter_stats)
         
-        # Remove cabeçalhos se configurado
-        if self.remove_headers:
-            clean_text = self.cleaner.remove_headers(clean_text)
+        with timer.stage("clean"):
+            return self._clean_pages(page_texts, prefilter_stats=prefilter_stats)
+    
+    def _learn_repeated_lines(self, page_texts: Iterator[str], learned: Dict[str, Any]) -> Iterator[str]:
+        """
+        Aprende as linhas repetidas nas primeiras páginas, para a extração página a página.
         
-        # Normaliza espaços se configurado
-        if self.normalize_spaces:
-            clean_text = self.cleaner.normalize_spaces(clean_text)
+        As repeated_line_window primeiras páginas são mantidas em memória
+        até a detecção; as linhas encontradas ficam em learned["lines"]
+        antes da primeira página ser entregue.
+        
+        Args:
+            page_texts: Texto bruto de cada página, na ordem do documento
+            learned: Dicionário que recebe as linhas repetidas
+        
+        Yields:
+            Texto bruto de cada página, sem alteração
+        """
+        page_texts = iter(page_texts)
+        window = list(islice(page_texts, self.repeated_line_window))
+        learned["lines"] = self.line_detector.detect(window)
+        yield from window
+        yield from page_texts
+    
+    def _strip_repeated_page(
+        self,
+        page_text: str,
+        learned: Optional[Dict[str, Any]],
+        timer: Optional[StageTimer] = None,
+        page: Optional[int] = None
+    ) -> str:
+        """Remove de uma página as linhas repetidas aprendidas, se a detecção estiver ativa."""
+        if learned is None:
+            return page_text
+        if timer is None:
+            return self.line_detector.strip_page(page_text, learned["lines"])
+        with timer.stage("clean", page):
+            return self.line_detector.strip_page(page_text, learned["lines"])
+    
+    def extract_clean_text(self, pdf_path: PDFInput) -> str:
+        """
+        Extrai e limpa o texto de um arquivo PDF.
+        
+        Args:
+            pdf_path: Caminho para o arquivo PDF, bytes, objeto de arquivo ou PDFSource
+        
+        Returns:
+            Texto limpo extraído do PDF
+        """
+        # Extrai texto bruto, página a página
+        with self.open_document(pdf_path) as document:
+            page_texts = self._extract_page_texts(document)
+        
+        clean_text = self._clean_pages(page_texts)
         
         # Verifica comprimento mínimo
         if len(clean_text) < self.min_text_length:
@@ -118,44 +394,333 @@ class CleanPDFExtractor:
         
         return clean_text
     
-    def extract_with_metadata(self, pdf_path: str) -> Dict[str, Any]:
+    def iter_clean_pages(self, pdf_path: PDFInput) -> Iterator[str]:
         """
-        Extrai texto e metadados do PDF.
+        Extrai e limpa o texto de um PDF uma página por vez.
+        
+        O cache de layout de cada página é liberado assim que seu texto é
+        extraído, de modo que o uso de memória não cresce com o número de
+        páginas do documento. Com header_detection="repeated", as linhas
+        repetidas são aprendidas nas repeated_line_window primeiras páginas.
         
         Args:
-            pdf_path: Caminho para o arquivo PDF
+            pdf_path: Caminho para o arquivo PDF, bytes, objeto de arquivo ou PDFSource
+        
+        Yields:
+            Texto limpo de cada página, na ordem do documento
+        """
+        logger.info(f"Extraindo texto por página de: {as_source(pdf_path)}")
+        
+        learned = {} if self.line_detector is not None and self.remove_headers else None
+        
+        with self.open_document(pdf_path) as document:
+            page_texts = self._iter_page_texts(document)
+            if learned is not None:
+                page_texts = self._learn_repeated_lines(page_texts, learned)
+            for page_text in page_texts:
+                yield self._clean(self._strip_repeated_page(page_text, learned), header_regex=learned is None)
+    
+    def extract_to_writer(
+        self,
+        pdf_path: PDFInput,
+        writer,
+        timer: Optional[StageTimer] = None
+    ) -> Dict[str, Any]:
+        """
+        Extrai, limpa e escreve o texto de um PDF página a página.
+        
+        Nenhum texto completo é mantido em memória: cada página limpa é
+        entregue ao escritor assim que extraída. Páginas sem texto após a
+        limpeza são omitidas e as demais são separadas por um espaço, como
+        resulta da normalização de espaços sobre o documento completo.
+        
+        Com header_detection="repeated", as linhas repetidas são aprendidas
+        nas repeated_line_window primeiras páginas, mantidas em memória até
+        a detecção, e removidas de todas as páginas; documentos com até
+        essa quantidade de páginas têm as mesmas linhas removidas que na
+        limpeza do documento completo.
+        
+        Com pipeline_depth > 0, a limpeza e a escrita rodam em threads
+        próprias (PagePipeline), enquanto a extração segue nas páginas
+        seguintes; o escritor e os callbacks de tempo passam a ser chamados
+        dessas threads.
+        
+        Com cache_dir, um documento já processado neste modo é escrito a
+        partir do cache, sem abrir o PDF. As entradas deste modo são
+        separadas das de extract_with_metadata, cujo texto pode diferir; o
+        texto limpo é acumulado para o cache apenas enquanto couber no
+        limite de tamanho do cache.
+        
+        Args:
+            pdf_path: Caminho para o arquivo PDF, bytes, objeto de arquivo ou PDFSource
+            writer: Objeto com método write(str), ex.: StreamingTextWriter
+            timer: Medidor de tempo por etapa (padrão: create_timer)
+        
+        Returns:
+            Dicionário com número de páginas, metadados, estatísticas e
+            tempos por etapa
+        """
+        source = as_source(pdf_path)
+        timer = timer if timer is not None else self.create_timer(source)
+        
+        cache_key = None
+        if self.cache is not None:
+            if not source.exists():
+                raise FileNotFoundError(f"Arquivo não encontrado: {pdf_path}")
             
+            with timer.stage("cache"):
+                source = source.load()
+                cache_key = self.cache.make_key(
+                    source.sha256(), {**self._cache_settings(), "stream_pages": True}
+                )
+                cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Resultado obtido do cache: {source}")
+                with timer.stage("write"):
+                    writer.write(cached.pop("clean_text"))
+                return {
+                    **self._source_fields(source),
+                    **cached,
+                    "prefilter": self.cleaner.new_prefilter_stats(),
+                    "cache_hit": True,
+                    **self._timing_fields(timer),
+                }
+        
+        original_length = 0
+        cleaned_length = 0
+        prefilter_stats = self.cleaner.new_prefilter_stats()
+        learned = {} if self.line_detector is not None and self.remove_headers else None
+        # Páginas limpas guardadas para o cache, enquanto couberem no limite
+        cache_pages: Optional[List[str]] = [] if cache_key is not None else None
+        
+        def clean_page(page_number: int, page_text: str) -> str:
+            nonlocal original_length
+            # Considera o separador entre páginas do texto completo
+            original_length += len(page_text) + (2 if page_number > 1 else 0)
+            page_text = self._strip_repeated_page(page_text, learned, timer, page_number)
+            return self._clean(
+                page_text, timer, page_number,
+                header_regex=learned is None, prefilter_stats=prefilter_stats,
+            )
+        
+        def write_page(page_number: int, text: str):
+            nonlocal cleaned_length, cache_pages
+            if not text:
+                return
+            
+            with timer.stage("write", page_number):
+                if cleaned_length:
+                    writer.write(" ")
+                    cleaned_length += 1
+                
+                writer.write(text)
+            cleaned_length += len(text)
+            
+            if cache_pages is not None:
+                cache_pages.append(text)
+                if cleaned_length > self.cache.max_size:
+                    cache_pages = None
+        
+        logger.info(f"Extraindo texto por página de: {source}")
+        
+        with self.open_document(source, timer) as document:
+            metadata = document.metadata
+            num_pages = document.num_pages
+            page_texts = self._iter_page_texts(document)
+            if learned is not None:
+                page_texts = self._learn_repeated_lines(page_texts, learned)
+            
+            if self.pipeline_depth > 0:
+                PagePipeline(self.pipeline_depth).run(page_texts, clean_page, write_page)
+            else:
+                for page_number, page_text in enumerate(page_texts, 1):
+                    write_page(page_number, clean_page(page_number, page_text))
+            
+            table_stats = dict(document.table_stats)
+            ocr_pages = document.ocr_pages
+        
+        logger.info(f"Texto limpo: {cleaned_length} caracteres")
+        
+        result = {
+            "num_pages": num_pages,
+            "metadata": metadata,
+            "stats": self.cleaner.get_length_stats(original_length, cleaned_length),
+            "table_stats": table_stats,
+            "ocr_pages": ocr_pages,
+        }
+        
+        if cache_key is not None:
+            if cache_pages is not None:
+                self.cache.put(cache_key, {**result, "clean_text": " ".join(cache_pages)})
+            result["cache_hit"] = False
+        
+        return {
+            **self._source_fields(source),
+            **result,
+            "prefilter": prefilter_stats,
+            **self._timing_fields(timer),
+        }
+    
+    def extract_with_metadata(
+        self,
+        pdf_path: PDFInput,
+        timer: Optional[StageTimer] = None
+    ) -> Dict[str, Any]:
+        """
+        Extrai texto e metadados do PDF.
+        
+        O arquivo é aberto uma única vez: texto, metadados e número de
+        páginas vêm da mesma sessão de documento.
+        
+        Args:
+            pdf_path: Caminho para o arquivo PDF, bytes, objeto de arquivo ou PDFSource
+            timer: Medidor de tempo por etapa (padrão: create_timer)
+        
         Returns:
-            Dicionário com texto limpo e metadados
+            Dicionário com texto limpo, metadados e tempos por etapa
         """
-        pdf_file = Path(pdf_path)
+        source = as_source(pdf_path)
+        timer = timer if timer is not None else self.create_timer(source)
         
-        # Extrai textos
-        raw_text = self.extract_text_from_pdf(pdf_path)
-        clean_text = self.cleaner.clean_text(raw_text)
+        cache_key = None
+        if self.cache is not None:
+            if not source.exists():
+                raise FileNotFoundError(f"Arquivo não encontrado: {pdf_path}")
+            
+            with timer.stage("cache"):
+                # Membros de arquivos compactados são lidos uma única vez
+                # para o hash e para a extração
+                source = source.load()
+                cache_key = self.cache.make_key(source.sha256(), self._cache_settings())
+                cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Resultado obtido do cache: {source}")
+                return {
+                    **self._source_fields(source),
+                    **cached,
+                    # Nenhuma passagem de limpeza foi executada
+                    "prefilter": self.cleaner.new_prefilter_stats(),
+                    "cache_hit": True,
+                    **self._timing_fields(timer),
+                }
         
-        if self.remove_headers:
-            clean_text = self.cleaner.remove_headers(clean_text)
+        with self.open_document(source, timer) as document:
+            # Extrai textos
+            page_texts = self._extract_page_texts(document)
+            raw_text = "\n\n".join(page_texts)
+            
+            # Extrai metadados do PDF
+            metadata = document.metadata
+            num_pages = document.num_pages
+            table_stats = dict(document.table_stats)
+            ocr_pages = document.ocr_pages
         
-        if self.normalize_spaces:
-            clean_text = self.cleaner.normalize_spaces(clean_text)
+        prefilter_stats = self.cleaner.new_prefilter_stats()
+        clean_text = self._clean_pages(page_texts, timer, prefilter_stats)
         
         # Obtém estatísticas
         stats = self.cleaner.get_cleaning_stats(raw_text, clean_text)
         
-        # Extrai metadados do PDF
-        with pdfplumber.open(pdf_path) as pdf:
-            metadata = pdf.metadata or {}
-            num_pages = len(pdf.pages)
-        
-        return {
-            "filename": pdf_file.name,
-            "filepath": str(pdf_file.absolute()),
+        result = {
             "num_pages": num_pages,
             "raw_text": raw_text,
             "clean_text": clean_text,
             "metadata": metadata,
             "stats": stats,
+            "table_stats": table_stats,
+            "ocr_pages": ocr_pages,
+            "prefilter": prefilter_stats,
+        }
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+            result["cache_hit"] = False
+        
+        return {
+            **self._source_fields(source),
+            **result,
+            **self._timing_fields(timer),
+        }
+    
+    async def extract_async(
+        self,
+        pdf_path: PDFInput,
+        executor: Optional[Executor] = None
+    ) -> Dict[str, Any]:
+        """
+        Versão assíncrona de extract_with_metadata, para uso em serviços asyncio.
+        
+        A extração roda no executor informado, sem bloquear o event loop.
+        Com um ProcessPoolExecutor, o extrator é copiado para o processo
+        trabalhador e a extração não disputa o GIL com o loop.
+        
+        Args:
+            pdf_path: Caminho para o arquivo PDF
+            executor: Executor a usar (padrão: executor padrão do loop)
+        
+        Returns:
+            Dicionário com texto limpo, metadados e tempos por etapa
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.extract_with_metadata, pdf_path)
+    
+    def close(self):
+        """Encerra o pool de OCR, se iniciado; o extrator continua utilizável."""
+        if self.ocr is not None:
+            self.ocr.close()
+    
+    @staticmethod
+    def _source_fields(source: PDFSource) -> Dict[str, Any]:
+        """
+        Monta os campos que identificam o documento nos resultados.
+        
+        Args:
+            source: Fonte do documento
+        
+        Returns:
+            Dicionário com filename, filepath e, para membros de arquivos
+            compactados, archive e member
+        """
+        return {"filename": source.name, "filepath": source.identity, **source.report_fields()}
+    
+    def _timing_fields(self, timer: StageTimer) -> Dict[str, Any]:
+        """
+        Monta os campos de tempo por etapa incluídos nos resultados.
+        
+        Args:
+            timer: Medidor de tempo do documento
+        
+        Returns:
+            Dicionário com timings e, se habilitado, page_timings
+        """
+        fields = {"timings": timer.as_dict()}
+        if timer.per_page:
+            fields["page_timings"] = timer.get_page_timings()
+        return fields
+    
+    def _cache_settings(self) -> Dict[str, Any]:
+        """
+        Retorna a configuração que afeta o resultado, usada na chave do cache.
+        
+        Returns:
+            Dicionário serializável com a configuração relevante
+        """
+        return {
+            "extract_tables": self.extract_tables,
+            "remove_headers": self.remove_headers,
+            "normalize_spaces": self.normalize_spaces,
+            "patterns": self.cleaner.patterns,
+            "header_detection": self.header_detection,
+            "crop_margins": self.crop_margins,
+            "crop_learn_pages": self.crop_learn_pages,
+            "ocr": self.ocr.settings() if self.ocr is not None else None,
+            "repeated_lines": {
+                "edge_lines": self.line_detector.edge_lines,
+                "min_share": self.line_detector.min_share,
+                "min_pages": self.line_detector.min_pages,
+            } if self.line_detector is not None else None,
         }
     
     def _format_table(self, table: list) -> str:
@@ -164,17 +729,8 @@ class CleanPDFExtractor:
         
         Args:
             table: Lista de listas representando a tabela
-            
+        
         Returns:
             Texto formatado da tabela
         """
-        if not table:
-            return ""
-        
-        formatted_rows = []
-        for row in table:
-            # Remove valores None e converte para string
-            clean_row = [str(cell) if cell is not None else "" for cell in row]
-            formatted_rows.append(" | ".join(clean_row))
-        
-        return "\n".join(formatted_rows)
+        return PDFDocumentSession.format_table(table)
@@ -0,0 +1,273 @@
+"""
+Módulo de execução isolada: um processo por documento em andamento, com
+tempo limite, limite de memória e reciclagem dos processos.
+"""
+import errno
+import logging
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Estados de resultado que contam como falha no relatório
+FAILED_STATUSES = ("error", "timeout", "oom")
+
+# Código de saída de um processo encerrado por SIGKILL, enviado pelo OOM
+# killer do kernel quando o processo esgota a memória da máquina
+_SIGKILL_EXITCODE = -9
+
+
+def is_allocation_failure(error: BaseException) -> bool:
+    """
+    Verifica se um erro decorre de falta de memória.
+    
+    Sob RLIMIT_AS, o MemoryError muitas vezes chega embrulhado em outra
+    exceção (ex.: PdfminerException do pdfplumber, sem mensagem); por isso
+    a cadeia de causas e contextos é percorrida.
+    
+    Args:
+        error: Exceção capturada
+    
+    Returns:
+        True para MemoryError ou OSError ENOMEM em qualquer ponto da cadeia
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, MemoryError):
+            return True
+        if isinstance(error, OSError) and error.errno == errno.ENOMEM:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _set_memory_limit(memory_limit_mb: float):
+    """Limita o espaço de endereçamento do processo atual (RLIMIT_AS)."""
+    try:
+        import resource
+    except ImportError:
+        logger.warning("RLIMIT_AS não suportado nesta plataforma; limite de memória ignorado")
+        return
+    
+    limit = int(memory_limit_mb * 1024 * 1024)
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _isolated_worker_main(connection, config: Dict[str, Any], memory_limit_mb: float):
+    """
+    Laço de um processo trabalhador isolado.
+    
+    Recebe (arquivo, diretório de saída) pela conexão e devolve o resultado
+    do processamento; encerra ao receber None.
+    
+    Args:
+        connection: Extremidade do Pipe do processo trabalhador
+        config: Configuração do processamento
+        memory_limit_mb: Limite de RLIMIT_AS em MB (0 desabilita)
+    """
+    from . import batch_processor
+    
+    batch_processor._init_worker(config)
+    if memory_limit_mb:
+        _set_memory_limit(memory_limit_mb)
+    
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        
+        pdf_file, output_dir = task
+        connection.send(batch_processor._worker_processor._process_file_safely(pdf_file, output_dir))
+
+
+class _Worker:
+    """Processo trabalhador isolado e a tarefa em andamento."""
+    
+    def __init__(self, context, config: Dict[str, Any], memory_limit_mb: float):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_isolated_worker_main,
+            args=(child_connection, config, memory_limit_mb),
+        )
+        self.process.start()
+        child_connection.close()
+        self.task: Optional[Any] = None
+        self.started = 0.0
+        self.completed = 0
+    
+    def assign(self, pdf_file: Any, output_dir: Path):
+        self.task = pdf_file
+        self.started = time.monotonic()
+        self.connection.send((pdf_file, output_dir))
+    
+    def stop(self, kill: bool = False):
+        """Encerra o processo: educadamente, ou com SIGKILL."""
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join()
+        self.connection.close()
+
+
+class IsolatedWorkerPool:
+    """
+    Pool de processos em que cada documento pode ser interrompido sozinho.
+    
+    Diferente de um ProcessPoolExecutor, cada processo recebe um documento
+    por vez e é acompanhado pelo processo principal: um documento que
+    excede timeout tem seu processo encerrado (status "timeout"); um
+    processo que esgota o limite de memória produz o status "oom": seja
+    por uma exceção de alocação, seja por terminar sem devolver o resultado
+    com o limite ativo (sob RLIMIT_AS, a falta de memória também aparece
+    como SIGSEGV ou SIGABRT em código nativo) ou pelo OOM killer. Processos são substituídos após
+    qualquer falha, para que o documento seguinte não herde um processo
+    em estado inconsistente, e reciclados a cada max_tasks documentos,
+    descartando o crescimento de memória do pdfminer. O lote continua em
+    todos os casos.
+    """
+    
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        num_workers: int,
+        timeout: float = 0,
+        memory_limit_mb: float = 0,
+        max_tasks: int = 0
+    ):
+        """
+        Inicializa o pool (os processos são criados em run).
+        
+        Args:
+            config: Configuração do processamento
+            num_workers: Número de processos
+            timeout: Tempo máximo por documento, em segundos (0 desabilita)
+            memory_limit_mb: Limite de espaço de endereçamento de cada
+                processo, em MB (0 desabilita)
+            max_tasks: Documentos por processo antes da reciclagem (0 desabilita)
+        """
+        self.config = config
+        self.num_workers = max(1, num_workers)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks = max_tasks
+        self.recycled = 0
+        self._context = multiprocessing.get_context()
+    
+    def _failure(self, pdf_file: Any, status: str, error: str) -> Dict[str, Any]:
+        """Linha de resultado de um documento cujo processo foi encerrado."""
+        from .batch_processor import _error_result
+        
+        logger.error(f"{pdf_file.name}: {error}")
+        return _error_result(pdf_file, error, status=status)
+    
+    def run(
+        self,
+        pdf_files: Iterable[Any],
+        output_dir: Path,
+        on_result: Callable[[Any, Dict[str, Any]], None]
+    ):
+        """
+        Processa os documentos, na ordem de pdf_files, até o fim do lote.
+        
+        Args:
+            pdf_files: Arquivos PDF a processar; o próximo só é pedido
+                quando há um processo livre para ele
+            output_dir: Diretório de saída
+            on_result: Função chamada com (arquivo, resultado) para cada
+                arquivo, assim que ele termina
+        """
+        queue = iter(pdf_files)
+        pending = next(queue, None)
+        workers: List[_Worker] = []
+        
+        def spawn() -> _Worker:
+            return _Worker(self._context, self.config, self.memory_limit_mb)
+        
+        def replace(worker: _Worker, kill: bool):
+            worker.stop(kill=kill)
+            workers.remove(worker)
+            self.recycled += 1
+        
+        try:
+            while pending is not None or any(worker.task is not None for worker in workers):
+                # Distribui documentos aos processos livres, criando-os sob demanda
+                while pending is not None and len(workers) < self.num_workers:
+                    workers.append(spawn())
+                for worker in workers:
+                    if worker.task is None and pending is not None:
+                        worker.assign(pending, output_dir)
+                        pending = next(queue, None)
+                
+                busy = [worker for worker in workers if worker.task is not None]
+                wait_time = None
+                if self.timeout:
+                    now = time.monotonic()
+                    wait_time = max(0.0, min(worker.started + self.timeout - now for worker in busy))
+                
+                ready = set(wait(
+                    [worker.connection for worker in busy] + [worker.process.sentinel for worker in busy],
+                    timeout=wait_time,
+                ))
+                
+                for worker in busy:
+                    pdf_file = worker.task
+                    result = None
+                    kill = False
+                    
+                    if worker.connection in ready:
+                        try:
+                            result = worker.connection.recv()
+                        except EOFError:
+                            pass
+                    if result is None and (worker.connection in ready or worker.process.sentinel in ready):
+                        # O processo terminou sem devolver o resultado
+                        worker.process.join()
+                        exitcode = worker.process.exitcode
+                        if exitcode == _SIGKILL_EXITCODE:
+                            result = self._failure(pdf_file, "oom", "Processo encerrado por falta de memória (SIGKILL)")
+                        elif self.memory_limit_mb and exitcode:
+                            # Sob RLIMIT_AS, a alocação falha também em código nativo
+                            # (sinal) ou ao tratar o próprio MemoryError (código 1)
+                            result = self._failure(
+                                pdf_file, "oom",
+                                f"Processo encerrado com código {exitcode} sob o limite de memória",
+                            )
+                        else:
+                            result = self._failure(pdf_file, "error", f"Processo encerrado com código {exitcode}")
+                        kill = True
+                    elif result is None and self.timeout and time.monotonic() - worker.started >= self.timeout:
+                        result = self._failure(pdf_file, "timeout", f"Tempo limite de {self.timeout}s excedido")
+                        kill = True
+                    
+                    if result is None:
+                        continue
+                    
+                    worker.task = None
+                    worker.completed += 1
+                    on_result(pdf_file, result)
+                    
+                    # Após qualquer falha, o processo é descartado mesmo sem ter sido encerrado
+                    if kill or result["status"] in FAILED_STATUSES:
+                        replace(worker, kill=kill)
+                    elif self.max_tasks and worker.completed >= self.max_tasks:
+                        replace(worker, kill=False)
+        finally:
+            for worker in workers:
+                worker.stop(kill=worker.task is not None)
+        
+        if self.recycled:
+            logger.info(f"Processos substituídos ou reciclados: {self.recycled}")
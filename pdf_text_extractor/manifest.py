@@ -0,0 +1,155 @@
+"""
+Módulo de manifesto de execução para processamento incremental.
+"""
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .sources import PDFInput, as_source
+
+logger = logging.getLogger(__name__)
+
+
+class RunManifest:
+    """
+    Manifesto persistente de uma execução em lote.
+    
+    Cada arquivo processado gera uma linha JSON com caminho, tamanho,
+    data de modificação, hash do conteúdo, status e linha de resultado.
+    As linhas são gravadas em disco após cada arquivo, de modo que uma
+    execução interrompida pode ser retomada a partir do manifesto.
+    """
+    
+    FILENAME = "run_manifest.jsonl"
+    
+    def __init__(self, manifest_file: Path, resume: bool = True):
+        """
+        Abre o manifesto.
+        
+        Args:
+            manifest_file: Caminho do arquivo de manifesto
+            resume: Se True, carrega as entradas existentes; se False,
+                inicia um manifesto vazio
+        """
+        self.manifest_file = Path(manifest_file)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        
+        if resume:
+            self._load()
+        elif self.manifest_file.exists():
+            self.manifest_file.unlink()
+        
+        self._file = self.manifest_file.open("a", encoding="utf-8")
+    
+    def __enter__(self) -> "RunManifest":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _load(self):
+        """Carrega as entradas existentes; a última entrada de cada arquivo prevalece."""
+        if not self.manifest_file.exists():
+            return
+        
+        with self.manifest_file.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Linha incompleta de uma execução interrompida
+                    continue
+                self.entries[entry["path"]] = entry
+        
+        logger.info(f"Manifesto carregado: {len(self.entries)} arquivos em {self.manifest_file}")
+    
+    @staticmethod
+    def _key(pdf_file: PDFInput) -> str:
+        """Chave do arquivo no manifesto (caminho absoluto ou "arquivo.zip:membro")."""
+        return as_source(pdf_file).identity
+    
+    def get_completed_result(self, pdf_file: PDFInput) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o resultado anterior de um arquivo inalterado e já processado.
+        
+        O tamanho e a data de modificação são comparados primeiro; o hash do
+        conteúdo só é recalculado quando a data mudou e o tamanho não.
+        
+        Args:
+            pdf_file: Caminho do arquivo PDF ou membro de arquivo compactado
+            
+        Returns:
+            Linha de resultado anterior, ou None se o arquivo deve ser processado
+        """
+        entry = self.entries.get(self._key(pdf_file))
+        if entry is None or entry["status"] not in ("success", "duplicate"):
+            return None
+        
+        output_file = entry["result"].get("output_file")
+        if output_file and not Path(output_file).exists():
+            return None
+        
+        source = as_source(pdf_file)
+        size, mtime = source.stat()
+        if size != entry["size"]:
+            return None
+        
+        if mtime != entry["mtime"]:
+            if source.sha256() != entry["sha256"]:
+                return None
+            # Conteúdo inalterado: registra a nova data de modificação
+            self._append({**entry, "mtime": mtime})
+        
+        return entry["result"]
+    
+    def record(self, pdf_file: PDFInput, result: Dict[str, Any]):
+        """
+        Registra o resultado de um arquivo e grava a entrada em disco.
+        
+        Args:
+            pdf_file: Caminho do arquivo PDF ou membro de arquivo compactado
+            result: Linha de resultado do processamento
+        """
+        source = as_source(pdf_file)
+        try:
+            size, mtime = source.stat()
+            content_hash = source.sha256()
+        except (OSError, KeyError):
+            size, mtime, content_hash = None, None, None
+        
+        self._append({
+            "path": self._key(pdf_file),
+            "size": size,
+            "mtime": mtime,
+            "sha256": content_hash,
+            "status": result["status"],
+            "result": result,
+            "timestamp": datetime.now().isoformat(),
+        })
+    
+    def _append(self, entry: Dict[str, Any]):
+        """Acrescenta uma entrada ao manifesto e força a gravação em disco."""
+        self.entries[entry["path"]] = entry
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def compact(self):
+        """Reescreve o manifesto mantendo apenas a última entrada de cada arquivo."""
+        self._file.close()
+        
+        tmp_file = self.manifest_file.with_suffix(".tmp")
+        with tmp_file.open("w", encoding="utf-8") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        os.replace(tmp_file, self.manifest_file)
+        
+        self._file = self.manifest_file.open("a", encoding="utf-8")
+    
+    def close(self):
+        """Fecha o arquivo de manifesto."""
+        if not self._file.closed:
+            self._file.close()
@@ -0,0 +1,225 @@
+"""
+Módulo de OCR seletivo das páginas sem camada de texto.
+"""
+import logging
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+from .sources import PDFSource
+
+logger = logging.getLogger(__name__)
+
+
+def _load_engine():
+    """Importa o pytesseract, com uma mensagem clara se estiver ausente."""
+    try:
+        import pytesseract
+    except ImportError:
+        raise ImportError(
+            "O OCR requer o pacote pytesseract e o Tesseract instalado: "
+            "pip install pytesseract"
+        ) from None
+    return pytesseract
+
+
+def ocr_page(
+    source: PDFSource,
+    page_number: int,
+    dpi: int = 300,
+    lang: str = "por",
+    crop_margins: Tuple[float, float] = (0.0, 0.0)
+) -> Tuple[str, float, bool]:
+    """
+    Renderiza uma página e reconhece seu texto com o Tesseract.
+    
+    Executada nos processos do pool de OCR: cada chamada abre o documento
+    e renderiza apenas a página pedida.
+    
+    Args:
+        source: Fonte do documento
+        page_number: Número da página (a partir de 1)
+        dpi: Resolução da renderização
+        lang: Idioma(s) do Tesseract (ex.: "por" ou "por+eng")
+        crop_margins: Faixas (superior, inferior) excluídas da imagem
+    
+    Returns:
+        Tupla (texto reconhecido, segundos gastos em renderização e OCR,
+        False: o resultado não veio do cache)
+    """
+    pytesseract = _load_engine()
+    import pdfplumber
+    
+    start = time.perf_counter()
+    with pdfplumber.open(source.open(), pages=[page_number]) as pdf:
+        page = pdf.pages[0]
+        top_margin, bottom_margin = crop_margins
+        if top_margin or bottom_margin:
+            x0, top, x1, bottom = page.bbox
+            page = page.crop((x0, top + top_margin, x1, bottom - bottom_margin))
+        image = page.to_image(resolution=dpi).original
+    text = pytesseract.image_to_string(image, lang=lang)
+    
+    return text.strip(), time.perf_counter() - start, False
+
+
+class PageOCR:
+    """
+    OCR das páginas escaneadas, em um pool de processos próprio.
+    
+    Só as páginas sem caracteres (ou quase) na camada de texto vão para o
+    OCR. Elas são enviadas ao pool assim que encontradas, e a extração das
+    páginas com texto nativo segue sem esperar por elas. Com um cache de
+    extração, o texto reconhecido de cada página é reaproveitado entre
+    execuções.
+    """
+    
+    def __init__(
+        self,
+        dpi: int = 300,
+        lang: str = "por",
+        min_chars: int = 10,
+        max_workers: int = 2,
+        cache=None
+    ):
+        """
+        Inicializa o OCR.
+        
+        Args:
+            dpi: Resolução da renderização das páginas
+            lang: Idioma(s) do Tesseract
+            min_chars: Páginas com menos caracteres que isso passam por OCR
+            max_workers: Processos do pool de OCR; com 0, o OCR roda no
+                próprio processo (ex.: dentro de um processo trabalhador)
+            cache: ExtractionCache para os textos reconhecidos (opcional)
+        
+        Raises:
+            ImportError: Se o pytesseract não estiver instalado
+        """
+        self.dpi = dpi
+        self.lang = lang
+        self.min_chars = min_chars
+        self.max_workers = max_workers
+        self.cache = cache
+        self._executor = None
+        
+        # Falha cedo, e não no meio de um lote, se o pytesseract faltar
+        _load_engine()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # O pool fica no processo que o criou; o cache em disco só acompanha
+        # as cópias locais (inline), que o abrem no processo de destino
+        state = {**self.__dict__, "_executor": None}
+        if self.max_workers > 0:
+            state["cache"] = None
+        return state
+    
+    def settings(self) -> Dict[str, Any]:
+        """Configuração que afeta o texto reconhecido, usada nas chaves de cache."""
+        return {"dpi": self.dpi, "lang": self.lang, "min_chars": self.min_chars}
+    
+    def inline(self) -> "PageOCR":
+        """Cópia que executa o OCR no próprio processo, sem pool e com o mesmo cache."""
+        copy = object.__new__(PageOCR)
+        copy.__dict__.update({**self.__dict__, "_executor": None, "max_workers": 0})
+        return copy
+    
+    def needs_ocr(self, page) -> bool:
+        """
+        Indica se a página não tem camada de texto aproveitável.
+        
+        Args:
+            page: Página do pdfplumber
+        
+        Returns:
+            True se a página tem menos de min_chars caracteres
+        """
+        return len(page.chars) < self.min_chars
+    
+    def _cache_key(self, content_hash: Optional[str], page_number: int) -> Optional[str]:
+        """Chave do texto reconhecido de uma página no cache, se houver cache."""
+        if self.cache is None or content_hash is None:
+            return None
+        return self.cache.make_key(content_hash, {"ocr_page": page_number, **self.settings()})
+    
+    def submit(
+        self,
+        source: PDFSource,
+        page_number: int,
+        content_hash: Optional[str] = None,
+        crop_margins: Tuple[float, float] = (0.0, 0.0)
+    ) -> Future:
+        """
+        Envia uma página para OCR, ou a obtém do cache.
+        
+        Args:
+            source: Fonte do documento
+            page_number: Número da página (a partir de 1)
+            content_hash: Hash do documento, para o cache (opcional)
+            crop_margins: Faixas (superior, inferior) excluídas da imagem
+        
+        Returns:
+            Future a passar para collect
+        """
+        cache_key = self._cache_key(content_hash, page_number)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                future = Future()
+                future.set_result((cached["text"], 0.0, True))
+                return future
+        
+        # Documentos em memória vão como bytes para o processo de OCR
+        if source.path is None and source.archive is None:
+            source = PDFSource.from_bytes(source.read_bytes(), source.name)
+        
+        args = (source, page_number, self.dpi, self.lang, tuple(crop_margins))
+        if self.max_workers > 0:
+            return self._get_executor().submit(ocr_page, *args)
+        
+        future = Future()
+        try:
+            future.set_result(ocr_page(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def collect(
+        self,
+        future: Future,
+        page_number: int,
+        content_hash: Optional[str] = None
+    ) -> Tuple[str, float]:
+        """
+        Aguarda o OCR de uma página e guarda o texto reconhecido no cache.
+        
+        Args:
+            future: Resultado de submit
+            page_number: Número da página (a partir de 1)
+            content_hash: Hash do documento, para o cache (opcional)
+        
+        Returns:
+            Tupla (texto reconhecido, segundos de OCR; 0 se veio do cache)
+        """
+        text, seconds, cached = future.result()
+        
+        cache_key = self._cache_key(content_hash, page_number)
+        if cache_key is not None and not cached:
+            self.cache.put(cache_key, {"text": text})
+        
+        return text, seconds
+    
+    def _get_executor(self):
+        """Cria o pool de OCR no primeiro uso."""
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info(f"Pool de OCR iniciado com {self.max_workers} processos")
+        return self._executor
+    
+    def close(self):
+        """Encerra o pool de OCR."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,134 @@
+"""
+Módulo do pipeline por página: extração, limpeza e escrita concorrentes.
+"""
+import logging
+import queue
+import threading
+from typing import Any, Callable, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# Marca o fim das páginas em uma fila
+_END = object()
+
+# Intervalo de verificação do estágio seguinte enquanto uma fila está cheia
+_PUT_POLL_SECONDS = 0.05
+
+
+class PagePipeline:
+    """
+    Executa extração, limpeza e escrita de um documento como estágios
+    concorrentes, ligados por filas limitadas.
+    
+    A extração roda na thread que chama run (a sessão do pdfplumber não é
+    compartilhada); a limpeza e a escrita rodam cada uma em sua thread,
+    página a página e na ordem do documento. Cada fila guarda no máximo
+    depth páginas: um estágio mais lento bloqueia o anterior
+    (backpressure), e a memória fica limitada a algumas páginas.
+    
+    A escrita em disco e a espera por processos (OCR, extração paralela
+    por página) liberam o GIL e se sobrepõem à extração; a limpeza, em
+    regex, disputa o GIL com o pdfminer, mas deixa de esperar pela escrita.
+    """
+    
+    def __init__(self, depth: int = 8):
+        """
+        Inicializa o pipeline.
+        
+        Args:
+            depth: Páginas em cada fila entre estágios
+        """
+        self.depth = max(1, depth)
+        self.pages = 0
+        # Vezes em que um estágio esperou por espaço na fila seguinte
+        self.stalls = 0
+        self._lock = threading.Lock()
+    
+    def _put(self, outbox: queue.Queue, item: Any, consumer: threading.Thread) -> bool:
+        """
+        Entrega um item ao estágio seguinte, aguardando espaço na fila.
+        
+        Returns:
+            False se o estágio seguinte terminou (por erro) e não consome mais
+        """
+        try:
+            outbox.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.stalls += 1
+        
+        while consumer.is_alive():
+            try:
+                outbox.put(item, timeout=_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def run(
+        self,
+        pages: Iterable[str],
+        clean: Callable[[int, str], str],
+        write: Callable[[int, str], None]
+    ):
+        """
+        Processa as páginas até a última ou até o primeiro erro.
+        
+        Args:
+            pages: Texto bruto de cada página, na ordem do documento (a
+                extração ocorre ao iterar)
+            clean: Função (número da página, texto bruto) -> texto limpo
+            write: Função (número da página, texto limpo) que grava a página
+        
+        Raises:
+            Exception: O primeiro erro de qualquer estágio
+        """
+        to_clean: queue.Queue = queue.Queue(self.depth)
+        to_write: queue.Queue = queue.Queue(self.depth)
+        errors: List[BaseException] = []
+        
+        def write_stage():
+            try:
+                while True:
+                    item = to_write.get()
+                    if item is _END:
+                        break
+                    write(*item)
+            except BaseException as e:
+                errors.append(e)
+        
+        writer = threading.Thread(target=write_stage, name="pipeline-write", daemon=True)
+        
+        def clean_stage():
+            try:
+                while True:
+                    item = to_clean.get()
+                    if item is _END:
+                        break
+                    page_number, page_text = item
+                    if not self._put(to_write, (page_number, clean(page_number, page_text)), writer):
+                        break
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                self._put(to_write, _END, writer)
+        
+        cleaner = threading.Thread(target=clean_stage, name="pipeline-clean", daemon=True)
+        writer.start()
+        cleaner.start()
+        
+        try:
+            for page_number, page_text in enumerate(pages, 1):
+                if not self._put(to_clean, (page_number, page_text), cleaner):
+                    break
+                self.pages += 1
+        finally:
+            self._put(to_clean, _END, cleaner)
+            cleaner.join()
+            writer.join()
+        
+        if errors:
+            raise errors[0]
+        
+        logger.debug(f"Pipeline por página: {self.pages} páginas, {self.stalls} esperas por fila cheia")
@@ -0,0 +1,172 @@
+"""
+Módulo de pré-filtro por literais dos padrões de limpeza.
+"""
+import logging
+import re
+from typing import FrozenSet, Iterable, Optional
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+logger = logging.getLogger(__name__)
+
+# Literais e conjuntos de literais: um padrão só casa em um texto que
+# contém pelo menos um dos literais do conjunto
+LiteralSet = FrozenSet[str]
+
+
+def _best(candidates: Iterable[LiteralSet]) -> Optional[LiteralSet]:
+    """Conjunto mais seletivo: o de menor literal mais longo, e depois o menor."""
+    candidates = [candidate for candidate in candidates if candidate and min(map(len, candidate)) > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda candidate: (min(map(len, candidate)), -len(candidate)))
+
+
+def _node_literals(op, av) -> Optional[LiteralSet]:
+    """Literais exigidos por um nó da árvore do padrão (None se nenhum)."""
+    if op is _sre_parse.LITERAL:
+        return frozenset([chr(av)])
+    
+    if op is _sre_parse.IN:
+        # Conjunto de caracteres avulsos, como [ab]; faixas e categorias não contam
+        if all(item_op is _sre_parse.LITERAL for item_op, _ in av):
+            return frozenset(chr(code) for _, code in av)
+        return None
+    
+    if op is _sre_parse.SUBPATTERN:
+        _, add_flags, _, pattern = av
+        if add_flags & re.IGNORECASE:
+            return None
+        return _sequence_literals(pattern)
+    
+    if op is _sre_parse.BRANCH:
+        alternatives = set()
+        for pattern in av[1]:
+            literals = _sequence_literals(pattern)
+            if literals is None:
+                return None
+            alternatives |= literals
+        return frozenset(alternatives)
+    
+    if op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT, getattr(_sre_parse, "POSSESSIVE_REPEAT", None)):
+        minimum, _, pattern = av
+        if minimum < 1:
+            return None
+        if len(pattern) == 1 and pattern[0][0] is _sre_parse.LITERAL:
+            # Repetição de um caractere, como \n{3,}
+            return frozenset([chr(pattern[0][1]) * minimum])
+        return _sequence_literals(pattern)
+    
+    if op is getattr(_sre_parse, "ATOMIC_GROUP", None):
+        return _sequence_literals(av)
+    
+    return None
+
+
+def _sequence_literals(pattern) -> Optional[LiteralSet]:
+    """Literais exigidos por uma sequência de nós: o candidato mais seletivo."""
+    candidates = []
+    run = []
+    for op, av in pattern:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            candidates.append(frozenset(["".join(run)]))
+            run = []
+        candidates.append(_node_literals(op, av))
+    if run:
+        candidates.append(frozenset(["".join(run)]))
+    return _best(candidate for candidate in candidates if candidate is not None)
+
+
+def required_literals(pattern: str) -> Optional[LiteralSet]:
+    """
+    Deriva os literais de que um padrão regex depende.
+    
+    Todo texto em que o padrão casa contém pelo menos um dos literais
+    retornados: sem nenhum deles, a passagem do padrão pode ser
+    dispensada. Padrões sem literal obrigatório (como \\s{2,}), com
+    IGNORECASE ou que não podem ser analisados retornam None e são
+    sempre aplicados.
+    
+    Args:
+        pattern: Padrão regex
+    
+    Returns:
+        Conjunto de literais alternativos, ou None
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except (re.error, TypeError, ValueError):
+        return None
+    
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    
+    try:
+        return _sequence_literals(parsed)
+    except (AttributeError, TypeError, ValueError):
+        # Estrutura interna do sre inesperada: o padrão é sempre aplicado
+        return None
+
+
+class LiteralScanner:
+    """
+    Busca simultânea de um conjunto de literais em um texto.
+    
+    Com o pacote opcional pyahocorasick, o texto é percorrido uma única vez
+    por um autômato Aho-Corasick; sem ele, cada literal é procurado com a
+    busca de substrings do Python (em C), mais rápida que uma alternância
+    regex para os poucos literais dos padrões de limpeza.
+    """
+    
+    def __init__(self, literals: Iterable[str]):
+        """
+        Inicializa o buscador.
+        
+        Args:
+            literals: Literais procurados
+        """
+        self.literals: LiteralSet = frozenset(literal for literal in literals if literal)
+        self._automaton = None
+        
+        if len(self.literals) > 1:
+            try:
+                import ahocorasick
+            except ImportError:
+                pass
+            else:
+                automaton = ahocorasick.Automaton()
+                for literal in self.literals:
+                    automaton.add_word(literal, literal)
+                automaton.make_automaton()
+                self._automaton = automaton
+    
+    @property
+    def backend(self) -> str:
+        """Implementação da busca: "aho-corasick" ou "substring"."""
+        return "aho-corasick" if self._automaton is not None else "substring"
+    
+    def scan(self, text: str) -> LiteralSet:
+        """
+        Encontra os literais presentes no texto.
+        
+        Args:
+            text: Texto a examinar
+        
+        Returns:
+            Literais encontrados
+        """
+        if self._automaton is None:
+            return frozenset(literal for literal in self.literals if literal in text)
+        
+        found = set()
+        for _, literal in self._automaton.iter(text):
+            found.add(literal)
+            if len(found) == len(self.literals):
+                break
+        return frozenset(found)
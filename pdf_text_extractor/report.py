@@ -0,0 +1,390 @@
+"""
+Módulo de geração incremental do relatório de processamento.
+"""
+import csv
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .isolation import FAILED_STATUSES
+from .timing import STAGES, TimingAggregator
+
+logger = logging.getLogger(__name__)
+
+# Colunas do relatório CSV (linhas de sucesso e de duplicatas)
+CSV_COLUMNS = [
+    "filename",
+    "archive",
+    "member",
+    "status",
+    "num_pages",
+    "original_chars",
+    "cleaned_chars",
+    "chars_removed",
+    "reduction_percentage",
+    "content_preserved",
+    "processing_time",
+    "estimated_cost",
+    "output_file",
+    "duplicate_of",
+    "near_duplicate_of",
+    "similarity",
+    "table_pages_analysed",
+    "table_pages_skipped",
+    "ocr_pages",
+    "patterns_applied",
+    "patterns_skipped",
+    "cache_hit",
+] + [f"time_{stage}" for stage in STAGES]
+
+
+class StreamingReport:
+    """
+    Relatório de processamento gravado à medida que os arquivos terminam.
+    
+    Cada linha de resultado vai direto para o disco: as linhas de sucesso
+    para processing_report.csv e todas as linhas para um arquivo
+    temporário que forma a lista "files" do processing_report.json. O
+    resumo é mantido em agregados incrementais, de modo que o custo de
+    finalizar o relatório não depende de manter os resultados em memória.
+    """
+    
+    JSON_FILENAME = "processing_report.json"
+    CSV_FILENAME = "processing_report.csv"
+    
+    def __init__(self, output_dir: Path, append: bool = False):
+        """
+        Abre os arquivos do relatório.
+        
+        Args:
+            output_dir: Diretório de saída
+            append: Se True, continua as linhas mantidas por uma sessão
+                anterior (finalize(keep_rows=True)) em vez de recomeçar
+        """
+        self.output_dir = Path(output_dir)
+        self.report_file = self.output_dir / self.JSON_FILENAME
+        self.csv_file = self.output_dir / self.CSV_FILENAME
+        self._rows_file = self.output_dir / f"{self.JSON_FILENAME}.rows"
+        
+        self.total_files = 0
+        self.successful = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.out_of_memory = 0
+        self.duplicates = 0
+        self.near_duplicates = 0
+        self.total_pages = 0
+        self.total_chars_removed = 0
+        self.sum_reduction = 0.0
+        self.sum_preserved = 0.0
+        self.table_pages_analysed = 0
+        self.table_pages_skipped = 0
+        self.ocr_pages = 0
+        self.patterns_applied = 0
+        self.patterns_skipped = 0
+        self.patterns_skipped_by_name: Dict[str, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.scheduled_files = 0
+        self.estimated_cost = 0.0
+        self.actual_cost = 0.0
+        self.file_timings = TimingAggregator(prefix="time_")
+        self.page_timings = TimingAggregator()
+        
+        self._csv = None
+        self._csv_writer = None
+        
+        if append and self._rows_file.exists():
+            # Refaz os agregados e o CSV a partir das linhas anteriores
+            with self._rows_file.open(encoding="utf-8") as rows:
+                for line in rows:
+                    result = json.loads(line)
+                    if self._count(result):
+                        self._write_csv_row(result)
+            self._rows = self._rows_file.open("a", encoding="utf-8")
+        else:
+            self._rows = self._rows_file.open("w", encoding="utf-8")
+    
+    def __enter__(self) -> "StreamingReport":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def add(self, result: Dict[str, Any]) -> int:
+        """
+        Acrescenta a linha de resultado de um arquivo.
+        
+        Args:
+            result: Linha de resultado do processamento
+        
+        Returns:
+            Posição da linha no relatório, usada em finalize(annotations)
+        """
+        row = self.total_files
+        self._rows.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+        if self._count(result):
+            self._write_csv_row(result)
+        return row
+    
+    def _count(self, result: Dict[str, Any]) -> bool:
+        """
+        Acrescenta uma linha de resultado aos agregados.
+        
+        Args:
+            result: Linha de resultado do processamento
+        
+        Returns:
+            True se a linha vai para o CSV (sucessos e duplicatas)
+        """
+        self.total_files += 1
+        if result["status"] in FAILED_STATUSES:
+            self.failed += 1
+        if result["status"] == "timeout":
+            self.timeouts += 1
+        elif result["status"] == "oom":
+            self.out_of_memory += 1
+        if result["status"] == "duplicate":
+            # A saída é a do arquivo original, já contabilizado
+            self.duplicates += 1
+            return True
+        if result["status"] != "success":
+            return False
+        
+        self.successful += 1
+        if "near_duplicate_of" in result:
+            self.near_duplicates += 1
+        self.total_pages += result.get("num_pages", 0)
+        self.total_chars_removed += result.get("chars_removed", 0)
+        self.sum_reduction += result.get("reduction_percentage", 0)
+        self.sum_preserved += result.get("content_preserved", 0)
+        self.table_pages_analysed += result.get("table_pages_analysed", 0)
+        self.table_pages_skipped += result.get("table_pages_skipped", 0)
+        self.ocr_pages += result.get("ocr_pages", 0)
+        self.patterns_applied += result.get("patterns_applied", 0)
+        self.patterns_skipped += result.get("patterns_skipped", 0)
+        for name, count in result.get("patterns_skipped_by_name", {}).items():
+            self.patterns_skipped_by_name[name] = self.patterns_skipped_by_name.get(name, 0) + count
+        
+        # Custo estimado pelo escalonador e tempo real do arquivo
+        if "estimated_cost" in result:
+            self.scheduled_files += 1
+            self.estimated_cost += result["estimated_cost"]
+            self.actual_cost += result.get("processing_time", 0)
+        
+        if "cache_hit" in result:
+            if result["cache_hit"]:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        
+        self.file_timings.add(result)
+        for page in result.get("page_timings", []):
+            self.page_timings.add(page)
+        
+        # Os tempos por página ficam apenas no relatório JSON
+        return True
+    
+    def _write_csv_row(self, result: Dict[str, Any]):
+        """Grava uma linha no CSV, criando o arquivo na primeira linha."""
+        if self._csv_writer is None:
+            self._csv = self.csv_file.open("w", newline="", encoding="utf-8")
+            self._csv_writer = csv.DictWriter(self._csv, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+            self._csv_writer.writeheader()
+        
+        self._csv_writer.writerow(result)
+    
+    def get_summary(self, total_time: float) -> Dict[str, Any]:
+        """
+        Calcula o resumo a partir dos agregados.
+        
+        Args:
+            total_time: Tempo total de processamento
+        
+        Returns:
+            Dicionário com as seções summary, statistics, timings e, quando
+            houver, page_timings, prefilter e cache
+        """
+        successful = self.successful
+        
+        report = {
+            "summary": {
+                "total_files": self.total_files,
+                "successful": successful,
+                "failed": self.failed,
+                "timeouts": self.timeouts,
+                "out_of_memory": self.out_of_memory,
+                "duplicates": self.duplicates,
+                "near_duplicates": self.near_duplicates,
+                "total_pages": self.total_pages,
+                "total_processing_time": round(total_time, 2),
+                "avg_time_per_file": round(total_time / self.total_files, 2) if self.total_files else 0,
+                "docs_per_second": round(self.total_files / total_time, 2) if total_time > 0 else 0,
+            },
+            "statistics": {
+                "total_chars_removed": self.total_chars_removed,
+                "avg_reduction_percentage": round(self.sum_reduction / successful, 2) if successful else 0,
+                "avg_content_preserved": round(self.sum_preserved / successful, 2) if successful else 0,
+                "table_pages_analysed": self.table_pages_analysed,
+                "table_pages_skipped": self.table_pages_skipped,
+                "ocr_pages": self.ocr_pages,
+            },
+            "timings": self.file_timings.summary(),
+        }
+        
+        page_timings = self.page_timings.summary()
+        if page_timings:
+            report["page_timings"] = page_timings
+        
+        # Passagens de padrões dispensadas pelo pré-filtro por literais
+        if self.patterns_applied or self.patterns_skipped:
+            report["prefilter"] = {
+                "applied": self.patterns_applied,
+                "skipped": self.patterns_skipped,
+                "skipped_by_pattern": dict(sorted(self.patterns_skipped_by_name.items())),
+            }
+        
+        # Acertos e falhas do cache de extração, quando habilitado
+        if self.cache_hits or self.cache_misses:
+            report["cache"] = {"hits": self.cache_hits, "misses": self.cache_misses}
+        
+        # Custo estimado x real dos arquivos escalonados (ajuste do estimador)
+        if self.scheduled_files:
+            report["scheduling"] = {
+                "files": self.scheduled_files,
+                "estimated_cost": round(self.estimated_cost, 2),
+                "actual_cost": round(self.actual_cost, 2),
+                "actual_to_estimated": (
+                    round(self.actual_cost / self.estimated_cost, 3) if self.estimated_cost > 0 else None
+                ),
+            }
+        
+        return report
+    
+    def snapshot(self, total_time: float) -> Dict[str, Any]:
+        """
+        Grava o processing_report.json com as linhas já recebidas, sem
+        fechar os arquivos (relatório parcial de execuções longas).
+        
+        Args:
+            total_time: Tempo de processamento até o momento
+        
+        Returns:
+            Resumo do relatório (sem a lista de arquivos)
+        """
+        summary = self.get_summary(total_time)
+        self._rows.flush()
+        if self._csv is not None:
+            self._csv.flush()
+        self._write_json(summary, {})
+        return summary
+    
+    def finalize(
+        self,
+        total_time: float,
+        skipped: Optional[int] = None,
+        annotations: Optional[Dict[int, Dict[str, Any]]] = None,
+        keep_rows: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Grava o processing_report.json final e fecha os arquivos.
+        
+        A lista "files" é copiada linha a linha do arquivo temporário,
+        sem carregar os resultados em memória. Campos conhecidos só ao
+        final do lote (quase duplicatas) são acrescentados às linhas na
+        cópia, e o CSV é então regravado a partir delas.
+        
+        Args:
+            total_time: Tempo total de processamento
+            skipped: Número de arquivos reaproveitados de execuções
+                anteriores (apenas em execuções retomadas)
+            annotations: Posição da linha (retornada por add) -> campos
+                acrescentados a ela; marcam quase duplicatas
+            keep_rows: Se True, mantém o arquivo de linhas (já com as
+                anotações) para uma próxima sessão com append=True
+        
+        Returns:
+            Resumo do relatório (sem a lista de arquivos)
+        """
+        annotations = annotations or {}
+        self.near_duplicates += len(annotations)
+        summary = self.get_summary(total_time)
+        if skipped is not None:
+            summary["summary"]["skipped_unchanged"] = skipped
+        
+        self._rows.close()
+        if self._csv is not None:
+            self._csv.close()
+        if annotations:
+            self._csv_writer = None
+        
+        self._write_json(summary, annotations, keep_rows)
+        
+        if self._csv is not None:
+            self._csv.close()
+        if not keep_rows:
+            self._rows_file.unlink()
+        
+        logger.info(f"Relatório gerado em: {self.report_file}")
+        
+        # Log do resumo
+        logger.info(f"Resumo: {self.successful} sucesso, {self.failed} falhas")
+        logger.info(f"Velocidade: {summary['summary']['docs_per_second']:.2f} docs/segundo")
+        
+        return summary
+    
+    def _write_json(
+        self,
+        summary: Dict[str, Any],
+        annotations: Dict[int, Dict[str, Any]],
+        rewrite_rows: bool = False
+    ):
+        """
+        Grava o processing_report.json a partir do arquivo de linhas.
+        
+        Args:
+            summary: Resumo retornado por get_summary
+            annotations: Campos acrescentados às linhas (ver finalize)
+            rewrite_rows: Se True e houver anotações, grava-as também no
+                arquivo de linhas
+        """
+        head = {"timestamp": datetime.now().isoformat(), **summary}
+        tmp_file = self.report_file.with_suffix(".tmp")
+        rows_tmp = self._rows_file.with_suffix(".tmp") if annotations and rewrite_rows else None
+        
+        with tmp_file.open("w", encoding="utf-8") as f, \
+                self._rows_file.open(encoding="utf-8") as rows:
+            patched = rows_tmp.open("w", encoding="utf-8") if rows_tmp is not None else None
+            # Abre o objeto JSON e acrescenta a lista de arquivos ao final
+            f.write(json.dumps(head, ensure_ascii=False, indent=2)[:-2])
+            f.write(',\n  "files": [')
+            index = -1
+            for index, line in enumerate(rows):
+                line = line.rstrip("\n")
+                if annotations:
+                    result = json.loads(line)
+                    if index in annotations:
+                        result.update(annotations[index])
+                        line = json.dumps(result, ensure_ascii=False, default=str)
+                    if result["status"] in ("success", "duplicate"):
+                        self._write_csv_row(result)
+                if patched is not None:
+                    patched.write(line + "\n")
+                f.write(("\n    " if index == 0 else ",\n    ") + line)
+            f.write("\n  ]\n}" if index >= 0 else "]\n}")
+            if patched is not None:
+                patched.close()
+        
+        os.replace(tmp_file, self.report_file)
+        if rows_tmp is not None:
+            os.replace(rows_tmp, self._rows_file)
+    
+    def close(self):
+        """Fecha os arquivos sem gerar o relatório final (ex.: execução interrompida)."""
+        if not self._rows.closed:
+            self._rows.close()
+        if self._csv is not None and not self._csv.closed:
+            self._csv.close()
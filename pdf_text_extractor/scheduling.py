@@ -0,0 +1,112 @@
+"""
+Módulo de estimativa de custo e ordenação dos documentos de um lote.
+"""
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .sources import PDFInput, as_source
+
+logger = logging.getLogger(__name__)
+
+
+class CostEstimator:
+    """
+    Estima o custo de processamento de cada documento antes da extração.
+    
+    O custo, em segundos, combina o número de páginas (lido com o
+    pypdfium2, dependência do pdfplumber, sem analisar o conteúdo) e o
+    tamanho do arquivo. Membros de arquivos compactados e documentos em
+    memória são estimados apenas pelo tamanho registrado, sem ler o
+    conteúdo. Os pesos podem ser ajustados comparando, no
+    relatório, o custo estimado com o tempo real de cada arquivo.
+    """
+    
+    def __init__(self, seconds_per_page: float = 0.05, seconds_per_mb: float = 0.1):
+        """
+        Inicializa o estimador.
+        
+        Args:
+            seconds_per_page: Custo estimado de cada página
+            seconds_per_mb: Custo estimado de cada MB do arquivo
+        """
+        self.seconds_per_page = seconds_per_page
+        self.seconds_per_mb = seconds_per_mb
+    
+    @staticmethod
+    def count_pages(pdf_file: PDFInput) -> Optional[int]:
+        """
+        Conta as páginas de um PDF pela árvore de páginas, sem extrair texto.
+        
+        Apenas arquivos em disco são abertos: ler um membro de arquivo
+        compactado custaria a descompressão que a estimativa quer evitar.
+        
+        Args:
+            pdf_file: Arquivo PDF ou membro de arquivo compactado
+        
+        Returns:
+            Número de páginas, ou None se o documento não é um arquivo em
+            disco ou não pôde ser aberto
+        """
+        source = as_source(pdf_file)
+        if source.path is None:
+            return None
+        
+        try:
+            import pypdfium2
+        except ImportError:
+            return None
+        
+        try:
+            document = pypdfium2.PdfDocument(str(source.path))
+        except Exception:
+            # Documentos inválidos falham depois, na extração, com o erro completo
+            return None
+        try:
+            return len(document)
+        finally:
+            document.close()
+    
+    def estimate(self, pdf_file: PDFInput) -> Tuple[Optional[int], float]:
+        """
+        Estima o custo de processamento de um documento.
+        
+        Args:
+            pdf_file: Arquivo PDF ou membro de arquivo compactado
+        
+        Returns:
+            Tupla (número de páginas ou None, custo estimado em segundos)
+        """
+        try:
+            size = as_source(pdf_file).stat()[0] or 0
+        except (OSError, KeyError):
+            size = 0
+        
+        pages = self.count_pages(pdf_file)
+        cost = (pages or 0) * self.seconds_per_page + size / (1024 * 1024) * self.seconds_per_mb
+        return pages, round(cost, 4)
+    
+    def order_largest_first(self, pdf_files: Sequence[PDFInput]) -> Tuple[List[PDFInput], Dict[PDFInput, float]]:
+        """
+        Ordena os documentos do mais caro para o mais barato (LPT).
+        
+        Distribuídos nessa ordem a um pool, os documentos longos começam
+        primeiro e os curtos ocupam os processos que ficam livres, em vez
+        de um documento longo terminar sozinho ao final do lote.
+        
+        Args:
+            pdf_files: Arquivos PDF ou membros de arquivos compactados
+        
+        Returns:
+            Tupla (arquivos em ordem decrescente de custo; custo estimado
+            de cada arquivo)
+        """
+        costs = {pdf_file: self.estimate(pdf_file)[1] for pdf_file in pdf_files}
+        ordered = sorted(pdf_files, key=costs.__getitem__, reverse=True)
+        
+        if ordered:
+            logger.info(
+                f"Escalonamento LPT: custo estimado total {sum(costs.values()):.1f}s, "
+                f"maior documento {costs[ordered[0]]:.1f}s"
+            )
+        
+        return ordered, costs
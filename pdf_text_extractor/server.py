@@ -0,0 +1,389 @@
+"""
+Módulo do servidor de extração com pool de processos pré-aquecido.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .sources import PDFSource
+
+logger = logging.getLogger(__name__)
+
+# Extrator mantido por processo trabalhador do servidor
+_worker_extractor = None
+
+
+def _init_server_worker(config: Dict[str, Any]):
+    """
+    Inicializa o extrator de um processo trabalhador e carrega o pdfplumber.
+    
+    Args:
+        config: Configuração repassada pelo processo principal
+    """
+    global _worker_extractor
+    import pdfplumber  # noqa: F401 - importado aqui para não pesar na primeira requisição
+    
+    from .extractor import CleanPDFExtractor
+    
+    _worker_extractor = CleanPDFExtractor(config)
+
+
+def _ping() -> int:
+    """Tarefa vazia usada para iniciar os processos do pool."""
+    return os.getpid()
+
+
+def _extract_in_worker(pdf_input: Any) -> Dict[str, Any]:
+    """
+    Extrai um documento no processo trabalhador.
+    
+    Args:
+        pdf_input: Caminho do arquivo ou PDFSource com o conteúdo
+    
+    Returns:
+        Resultado de extract_with_metadata, sem o texto bruto
+    """
+    result = _worker_extractor.extract_with_metadata(pdf_input)
+    result.pop("raw_text", None)
+    return result
+
+
+class ServerBusy(Exception):
+    """A fila de requisições do servidor está cheia."""
+
+
+class ExtractionServer:
+    """
+    Servidor HTTP local de extração, com pool de processos pré-aquecido.
+    
+    Os processos trabalhadores são iniciados junto com o servidor, cada um
+    com seu CleanPDFExtractor e o pdfplumber já importado; as requisições
+    não pagam a inicialização do interpretador nem das dependências. A fila
+    é limitada: com todos os trabalhadores ocupados e queue_size
+    requisições aguardando, novas requisições recebem 503 imediatamente
+    (backpressure), em vez de acumular memória e latência, e sem que o
+    corpo seja lido.
+    
+    Se um processo trabalhador morrer (ex.: falha em código nativo), o pool
+    inteiro fica inutilizável; ele é recriado e aquecido de novo na
+    requisição seguinte, e /health indica o estado enquanto isso.
+    
+    Endpoints:
+        POST /extract: corpo com o PDF (?filename=nome.pdf opcional) ou
+            JSON {"path": "..."} com o caminho de um arquivo local
+        GET /health: estado do servidor e profundidade da fila
+        GET /metrics: contadores, vazão e latência média
+    """
+    
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        workers: int = 4,
+        queue_size: int = 32,
+        max_request_mb: float = 100
+    ):
+        """
+        Inicializa o servidor (sem iniciar o pool nem abrir a porta).
+        
+        Args:
+            config: Configuração do extrator
+            host: Endereço de escuta (padrão: apenas local)
+            port: Porta de escuta (0 escolhe uma porta livre)
+            workers: Processos trabalhadores
+            queue_size: Requisições aguardando além das que estão em
+                extração; acima disso, 503
+            max_request_mb: Tamanho máximo do corpo de uma requisição
+        """
+        self.config = dict(config or {})
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.max_request_bytes = int(max_request_mb * 1024 * 1024)
+        
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        
+        self.started_at = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_pages = 0
+        self.total_latency = 0.0
+        self.pool_restarts = 0
+    
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Endereço (host, porta) em que o servidor escuta."""
+        if self._httpd is None:
+            return self.host, self.port
+        return self._httpd.server_address[:2]
+    
+    def _start_pool(self) -> ProcessPoolExecutor:
+        """Cria o pool de processos e o aquece."""
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_server_worker,
+            initargs=(self.config,),
+        )
+        
+        # Uma tarefa por processo força a criação e a inicialização de todos
+        pids = {future.result() for future in [executor.submit(_ping) for _ in range(self.workers)]}
+        logger.info(f"Pool aquecido: {len(pids)} processos trabalhadores")
+        return executor
+    
+    @staticmethod
+    def _is_broken(executor: ProcessPoolExecutor) -> bool:
+        """Indica se um processo do pool morreu, inutilizando o pool."""
+        return bool(getattr(executor, "_broken", False))
+    
+    def _pool(self) -> ProcessPoolExecutor:
+        """Pool em funcionamento, recriado se estiver quebrado."""
+        with self._pool_lock:
+            if self._executor is None:
+                raise RuntimeError("Servidor encerrado")
+            if self._is_broken(self._executor):
+                logger.warning("Pool de processos quebrado; recriando")
+                self._executor.shutdown(wait=False)
+                self._executor = self._start_pool()
+                self.pool_restarts += 1
+            return self._executor
+    
+    def start(self):
+        """Inicia e aquece o pool de processos e abre a porta de escuta."""
+        self._executor = self._start_pool()
+        
+        handler = type("_BoundHandler", (_ExtractionHandler,), {"server_ref": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.started_at = time.monotonic()
+        
+        host, port = self.address
+        logger.info(f"Servidor de extração em http://{host}:{port}")
+    
+    def serve_forever(self):
+        """Atende requisições até shutdown (ou Ctrl+C)."""
+        if self._httpd is None:
+            self.start()
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Servidor interrompido")
+        finally:
+            self.close()
+    
+    def shutdown(self):
+        """Interrompe serve_forever (chamado de outra thread)."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+    
+    def close(self):
+        """Fecha a porta e encerra o pool de processos."""
+        if self._httpd is not None:
+            self._httpd.server_close()
+            self._httpd = None
+        with self._pool_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            if sys.version_info >= (3, 9):
+                executor.shutdown(cancel_futures=True)
+            else:
+                # Sem cancel_futures (Python 3.8), as extrações na fila terminam antes
+                executor.shutdown()
+    
+    @contextmanager
+    def reserve(self) -> Iterator[None]:
+        """
+        Reserva um lugar na fila de extração enquanto o bloco executa.
+        
+        Raises:
+            ServerBusy: Se a fila estiver cheia
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ServerBusy("Fila de extração cheia")
+        try:
+            yield
+        finally:
+            self._slots.release()
+    
+    def extract(self, pdf_input: Any, reserved: bool = False) -> Dict[str, Any]:
+        """
+        Extrai um documento em um processo trabalhador, respeitando o limite da fila.
+        
+        Args:
+            pdf_input: Caminho do arquivo ou PDFSource com o conteúdo
+            reserved: Se True, o lugar na fila já foi reservado com reserve
+        
+        Returns:
+            Resultado da extração, com o tempo total da requisição
+        
+        Raises:
+            ServerBusy: Se a fila estiver cheia
+            RuntimeError: Se o processo trabalhador morreu durante a extração
+        """
+        if not reserved:
+            with self.reserve():
+                return self.extract(pdf_input, reserved=True)
+        
+        start = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            executor = self._pool()
+            try:
+                result = executor.submit(_extract_in_worker, pdf_input).result()
+            except BrokenProcessPool as e:
+                # O pool é recriado pela próxima requisição (ou já foi, por outra)
+                raise RuntimeError("Processo trabalhador encerrado durante a extração") from e
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        
+        latency = time.perf_counter() - start
+        with self._lock:
+            self.completed += 1
+            self.total_pages += result.get("num_pages", 0)
+            self.total_latency += latency
+        
+        result["request_time"] = round(latency, 6)
+        return result
+    
+    def health(self) -> Dict[str, Any]:
+        """Estado do servidor e profundidade da fila."""
+        with self._lock:
+            in_flight = self.in_flight
+        executor = self._executor
+        if executor is None:
+            status = "stopped"
+        elif self._is_broken(executor):
+            # Recriado na próxima requisição de extração
+            status = "broken"
+        else:
+            status = "ok"
+        return {
+            "status": status,
+            "workers": self.workers,
+            "pool_restarts": self.pool_restarts,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.workers),
+            "queue_capacity": self.queue_size,
+        }
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Contadores, vazão e latência média desde o início do servidor."""
+        uptime = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        with self._lock:
+            completed = self.completed
+            metrics = {
+                "uptime_seconds": round(uptime, 2),
+                "completed": completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "total_pages": self.total_pages,
+                "avg_latency_seconds": round(self.total_latency / completed, 6) if completed else 0,
+            }
+        metrics["docs_per_second"] = round(completed / uptime, 2) if uptime > 0 else 0
+        metrics["pages_per_second"] = round(metrics["total_pages"] / uptime, 2) if uptime > 0 else 0
+        return {**self.health(), **metrics}
+
+
+class _ExtractionHandler(BaseHTTPRequestHandler):
+    """Tratador HTTP das requisições do ExtractionServer."""
+    
+    server_ref: ExtractionServer = None
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format: str, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+    
+    def _send_json(self, status: HTTPStatus, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        """Envia uma resposta JSON."""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            health = self.server_ref.health()
+            status = HTTPStatus.OK if health["status"] == "ok" else HTTPStatus.SERVICE_UNAVAILABLE
+            self._send_json(status, health)
+        elif path == "/metrics":
+            self._send_json(HTTPStatus.OK, self.server_ref.metrics())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Endpoint desconhecido: {path}"})
+    
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/extract":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Endpoint desconhecido: {url.path}"})
+            return
+        
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Corpo da requisição vazio"})
+            return
+        if length > self.server_ref.max_request_bytes:
+            self.close_connection = True
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Documento acima do tamanho máximo"})
+            return
+        
+        # A fila é verificada antes de ler o corpo: requisições recusadas não o
+        # leem. A resposta só é enviada depois de liberado o lugar na fila,
+        # para que o cliente possa enviar a próxima requisição em seguida.
+        try:
+            with self.server_ref.reserve():
+                status, payload = self._extract(url, length)
+        except ServerBusy as e:
+            self.close_connection = True
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)}, {"Retry-After": "1"})
+        else:
+            self._send_json(status, payload)
+    
+    def _extract(self, url, length: int) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        """Lê o corpo e extrai o documento (lugar na fila já reservado); retorna a resposta."""
+        body = self.rfile.read(length)
+        
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                pdf_input = json.loads(body)["path"]
+            except (ValueError, KeyError, TypeError):
+                return HTTPStatus.BAD_REQUEST, {"error": 'JSON esperado: {"path": "..."}'}
+        else:
+            filename = parse_qs(url.query).get("filename", ["documento.pdf"])[0]
+            pdf_input = PDFSource.from_bytes(body, filename)
+        
+        try:
+            return HTTPStatus.OK, self.server_ref.extract(pdf_input, reserved=True)
+        except FileNotFoundError as e:
+            return HTTPStatus.NOT_FOUND, {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Erro na extração: {str(e)}")
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(e)}
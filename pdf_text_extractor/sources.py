@@ -0,0 +1,430 @@
+"""
+Módulo de fontes de entrada: PDFs em disco, em memória e dentro de
+arquivos compactados (zip e tar).
+"""
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tarfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Extensões reconhecidas como arquivos compactados com PDFs
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# Arquivos compactados abertos por processo, reaproveitados entre membros
+_MAX_OPEN_ARCHIVES = 8
+_open_archives: Dict[str, Any] = {}
+_archives_lock = threading.Lock()
+
+# Entradas aceitas pelo extrator: caminho, bytes, objeto de arquivo ou PDFSource
+PDFInput = Union[str, Path, bytes, bytearray, memoryview, BinaryIO, "PDFSource"]
+
+
+def is_archive(path: Union[str, Path]) -> bool:
+    """
+    Verifica pela extensão se um caminho é um arquivo compactado suportado.
+    
+    Args:
+        path: Caminho do arquivo
+    
+    Returns:
+        True para zip e tar (com ou sem compressão)
+    """
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def is_random_access(archive: Union[str, Path]) -> bool:
+    """
+    Verifica se os membros de um arquivo compactado podem ser lidos
+    individualmente sem percorrer o arquivo desde o início.
+    
+    Args:
+        archive: Caminho do arquivo compactado
+    
+    Returns:
+        True para zip e tar sem compressão; False para tar comprimido
+        (gz, bz2, xz), cujo acesso a um membro descomprime tudo o que vem antes
+    """
+    return zipfile.is_zipfile(archive) or str(archive).lower().endswith(".tar")
+
+
+def _open_archive(archive: Path):
+    """Abre (ou reaproveita) um arquivo compactado para leitura de membros."""
+    key = str(archive)
+    handle = _open_archives.get(key)
+    
+    if handle is None:
+        if len(_open_archives) >= _MAX_OPEN_ARCHIVES:
+            _open_archives.pop(next(iter(_open_archives))).close()
+        
+        if zipfile.is_zipfile(archive):
+            handle = zipfile.ZipFile(archive)
+        else:
+            handle = tarfile.open(archive, "r:*")
+        _open_archives[key] = handle
+    
+    return handle
+
+
+def read_archive_member(archive: Path, member: str) -> bytes:
+    """
+    Lê o conteúdo de um membro de um arquivo compactado.
+    
+    Em tar comprimido, cada leitura descomprime o arquivo até o membro;
+    no processamento em lote esses membros são lidos em uma única passagem
+    (veja iter_archive_members com load=True).
+    
+    Args:
+        archive: Caminho do arquivo zip ou tar
+        member: Nome do membro
+    
+    Returns:
+        Bytes do membro
+    """
+    with _archives_lock:
+        handle = _open_archive(Path(archive))
+        if isinstance(handle, zipfile.ZipFile):
+            return handle.read(member)
+        return handle.extractfile(member).read()
+
+
+class PDFSource:
+    """
+    Documento PDF de entrada: um arquivo em disco, bytes ou um objeto de
+    arquivo em memória (ex.: BytesIO ou mmap), ou um membro de um arquivo
+    zip/tar, lido para a memória apenas quando o documento é aberto.
+    
+    Membros de tar comprimido lidos em fluxo trazem o conteúdo em memória
+    ou, se grandes, uma cópia em disco (spool); a identidade continua
+    sendo a do membro.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        path: Optional[Path] = None,
+        data: Optional[bytes] = None,
+        stream: Optional[BinaryIO] = None,
+        archive: Optional[Path] = None,
+        member: Optional[str] = None,
+        size: Optional[int] = None,
+        mtime: Optional[float] = None,
+        spool: Optional[Path] = None
+    ):
+        """
+        Cria a fonte; prefira os construtores from_path, from_bytes,
+        from_stream e from_archive_member.
+        
+        Args:
+            name: Nome do documento (ex.: documento.pdf)
+            path: Caminho do arquivo em disco
+            data: Conteúdo em memória
+            stream: Objeto de arquivo binário posicionável
+            archive: Arquivo compactado que contém o documento
+            member: Nome do membro dentro do arquivo compactado
+            size: Tamanho do conteúdo em bytes, se conhecido
+            mtime: Data de modificação, se conhecida
+            spool: Cópia temporária em disco do membro, se houver
+        """
+        self.name = name
+        self.path = Path(path) if path is not None else None
+        self.data = data
+        self.stream = stream
+        self.archive = Path(archive) if archive is not None else None
+        self.member = member
+        self.size = size
+        self.mtime = mtime
+        self.spool = Path(spool) if spool is not None else None
+    
+    @classmethod
+    def from_path(cls, path: Union[str, Path]) -> "PDFSource":
+        """Fonte para um arquivo em disco."""
+        path = Path(path)
+        return cls(path.name, path=path)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str = "documento.pdf") -> "PDFSource":
+        """Fonte para um conteúdo em memória (bytes, bytearray ou memoryview)."""
+        return cls(name, data=bytes(data), size=len(data))
+    
+    @classmethod
+    def from_stream(cls, stream: BinaryIO, name: Optional[str] = None) -> "PDFSource":
+        """Fonte para um objeto de arquivo binário posicionável (BytesIO, mmap, arquivo aberto)."""
+        if name is None:
+            name = Path(getattr(stream, "name", "documento.pdf")).name
+        return cls(name, stream=stream)
+    
+    @classmethod
+    def from_archive_member(
+        cls,
+        archive: Union[str, Path],
+        member: str,
+        size: Optional[int] = None,
+        mtime: Optional[float] = None,
+        spool: Optional[Path] = None
+    ) -> "PDFSource":
+        """Fonte para um membro de um arquivo zip ou tar."""
+        return cls(
+            Path(member).name, archive=archive, member=member, size=size, mtime=mtime,
+            spool=spool,
+        )
+    
+    @property
+    def stem(self) -> str:
+        """Nome do documento sem a extensão."""
+        return Path(self.name).stem
+    
+    @property
+    def output_stem(self) -> str:
+        """
+        Nome base dos arquivos de saída do documento.
+        
+        Membros de arquivos compactados incluem o nome do arquivo e o
+        caminho do membro (ex.: lote.zip:docs/a.pdf -> lote.zip__docs__a), para
+        que membros com o mesmo nome não sobrescrevam a saída uns dos outros.
+        """
+        if self.archive is None:
+            return self.stem
+        member = self.member.replace("\\", "/").strip("/")
+        if member.lower().endswith(".pdf"):
+            member = member[:-4]
+        parts = [part for part in member.split("/") if part not in ("", ".", "..")]
+        return "__".join([self.archive.name] + parts)
+    
+    @property
+    def identity(self) -> str:
+        """Identificação estável: caminho absoluto ou "arquivo.zip:membro"."""
+        if self.path is not None:
+            return str(self.path.absolute())
+        if self.archive is not None:
+            return f"{self.archive.absolute()}:{self.member}"
+        return self.name
+    
+    def __str__(self) -> str:
+        return self.identity
+    
+    def __repr__(self) -> str:
+        return f"PDFSource({self.identity!r})"
+    
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PDFSource) and self.identity == other.identity
+    
+    def __hash__(self) -> int:
+        return hash(self.identity)
+    
+    def exists(self) -> bool:
+        """Indica se o conteúdo está disponível (arquivos em disco são verificados)."""
+        disk = self.path or self.spool
+        return disk is None or disk.exists()
+    
+    def open(self) -> Union[str, BinaryIO]:
+        """
+        Abre o conteúdo para o pdfplumber.
+        
+        Returns:
+            Caminho (arquivos em disco) ou objeto de arquivo binário
+        """
+        if self.path is not None:
+            return str(self.path)
+        if self.spool is not None:
+            return str(self.spool)
+        if self.stream is not None:
+            self.stream.seek(0)
+            return self.stream
+        return io.BytesIO(self.read_bytes())
+    
+    def read_bytes(self) -> bytes:
+        """Lê o conteúdo completo do documento."""
+        if self.data is not None:
+            return self.data
+        if self.path is not None:
+            return self.path.read_bytes()
+        if self.spool is not None:
+            return self.spool.read_bytes()
+        if self.stream is not None:
+            self.stream.seek(0)
+            return self.stream.read()
+        return read_archive_member(self.archive, self.member)
+    
+    def load(self) -> "PDFSource":
+        """
+        Retorna a fonte com o conteúdo já em memória, para que hash e
+        extração de um membro de arquivo compactado usem uma única leitura.
+        Arquivos em disco, membros copiados para o disco e objetos de
+        arquivo são retornados sem cópia.
+        """
+        if self.archive is None or self.data is not None or self.spool is not None:
+            return self
+        data = self.read_bytes()
+        return PDFSource(
+            self.name, data=data, archive=self.archive, member=self.member,
+            size=len(data), mtime=self.mtime,
+        )
+    
+    def release(self):
+        """
+        Descarta o conteúdo em memória e a cópia em disco de um membro de
+        arquivo compactado já processado; leituras posteriores voltam ao
+        arquivo compactado.
+        """
+        if self.archive is None:
+            return
+        self.data = None
+        if self.spool is not None:
+            try:
+                self.spool.unlink()
+            except FileNotFoundError:
+                pass
+            self.spool = None
+    
+    def sha256(self, chunk_size: int = 1024 * 1024) -> str:
+        """
+        Calcula o hash SHA-256 do conteúdo.
+        
+        Args:
+            chunk_size: Tamanho dos blocos lidos de arquivos e objetos de arquivo
+        
+        Returns:
+            Hash hexadecimal do conteúdo
+        """
+        digest = hashlib.sha256()
+        disk = self.path or self.spool
+        
+        if disk is not None:
+            with disk.open("rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    digest.update(chunk)
+        elif self.stream is not None:
+            self.stream.seek(0)
+            for chunk in iter(lambda: self.stream.read(chunk_size), b""):
+                digest.update(chunk)
+            self.stream.seek(0)
+        else:
+            digest.update(self.read_bytes())
+        
+        return digest.hexdigest()
+    
+    def stat(self) -> Tuple[Optional[int], Optional[float]]:
+        """
+        Retorna tamanho e data de modificação do documento.
+        
+        Returns:
+            Tupla (tamanho em bytes, data de modificação); None quando desconhecido
+        """
+        if self.path is not None:
+            stat = self.path.stat()
+            return stat.st_size, stat.st_mtime
+        return self.size, self.mtime
+    
+    def report_fields(self) -> Dict[str, str]:
+        """Campos que identificam o arquivo compactado e o membro no relatório."""
+        if self.archive is None:
+            return {}
+        return {"archive": str(self.archive), "member": self.member}
+
+
+def as_source(pdf: PDFInput) -> PDFSource:
+    """
+    Converte uma entrada aceita pelo extrator em PDFSource.
+    
+    Args:
+        pdf: Caminho, bytes, objeto de arquivo binário ou PDFSource
+    
+    Returns:
+        Fonte correspondente
+    """
+    if isinstance(pdf, PDFSource):
+        return pdf
+    if isinstance(pdf, (str, os.PathLike)):
+        return PDFSource.from_path(pdf)
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        return PDFSource.from_bytes(pdf)
+    if hasattr(pdf, "read") and hasattr(pdf, "seek"):
+        return PDFSource.from_stream(pdf)
+    raise TypeError(f"Entrada de PDF não suportada: {type(pdf).__name__}")
+
+
+def iter_archive_members(
+    archive: Union[str, Path],
+    load: bool = False,
+    spool_dir: Optional[Path] = None,
+    spool_above: Optional[int] = None
+) -> Iterator[PDFSource]:
+    """
+    Lista os PDFs de um arquivo zip ou tar sem extraí-los.
+    
+    Arquivos tar são percorridos em modo de fluxo, em uma única passagem.
+    Com load, o conteúdo de cada membro de tar é lido nessa passagem,
+    quando o membro é pedido ao iterador: fica em memória, ou em uma
+    cópia em spool_dir se tiver mais de spool_above bytes. Assim, um tar
+    comprimido é processado sem descomprimi-lo de novo a cada membro e
+    sem gravar todos os membros no disco.
+    
+    Args:
+        archive: Caminho do arquivo compactado
+        load: Se True, lê o conteúdo dos membros de tar na passagem
+        spool_dir: Diretório para as cópias dos membros grandes (com load)
+        spool_above: Tamanho, em bytes, a partir do qual um membro é
+            copiado para spool_dir em vez de lido para a memória
+    
+    Yields:
+        Fonte de cada membro PDF, na ordem do arquivo
+    """
+    archive = Path(archive)
+    
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                    continue
+                yield PDFSource.from_archive_member(
+                    archive, info.filename, size=info.file_size,
+                    mtime=time.mktime(info.date_time + (0, 0, -1)),
+                )
+        return
+    
+    with tarfile.open(archive, "r|*") as tf:
+        for index, info in enumerate(tf):
+            if not info.isfile() or not info.name.lower().endswith(".pdf"):
+                continue
+            
+            source = PDFSource.from_archive_member(
+                archive, info.name, size=info.size, mtime=float(info.mtime),
+            )
+            if load:
+                with tf.extractfile(info) as src:
+                    if spool_dir is not None and spool_above is not None and info.size > spool_above:
+                        source.spool = Path(spool_dir) / f"{archive.name}_{index:06d}.pdf"
+                        with source.spool.open("wb") as dst:
+                            shutil.copyfileobj(src, dst)
+                    else:
+                        source.data = src.read()
+            yield source
+
+
+def list_archive_members(archive: Union[str, Path]) -> List[PDFSource]:
+    """
+    Lista os PDFs de um arquivo compactado, registrando arquivos inválidos.
+    
+    Args:
+        archive: Caminho do arquivo compactado
+    
+    Returns:
+        Lista de fontes dos membros PDF (vazia se o arquivo não puder ser lido)
+    """
+    try:
+        members = list(iter_archive_members(archive))
+    except (OSError, tarfile.TarError, zipfile.BadZipFile) as e:
+        logger.error(f"Erro ao ler o arquivo compactado {archive}: {str(e)}")
+        return []
+    
+    logger.info(f"Encontrados {len(members)} PDFs em {archive}")
+    return members
@@ -0,0 +1,217 @@
+"""
+Módulo de medição de tempo por etapa do processamento.
+"""
+import math
+import random
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Any, Iterable, Iterator, Optional
+
+# Callback de tempo: recebe (etapa, segundos, contexto com filename e page)
+TimingCallback = Callable[[str, float, Dict[str, Any]], None]
+
+# Etapas medidas pelo extrator e pelo processador em lote
+STAGES = ("cache", "open", "extract_text", "extract_tables", "ocr", "clean", "write")
+
+
+class StageTimer:
+    """
+    Acumula o tempo gasto em cada etapa do processamento de um documento.
+    
+    Cada medição custa duas chamadas a time.perf_counter. Opcionalmente,
+    os tempos são separados por página, e cada medição é repassada aos
+    callbacks registrados (ex.: exportação para um sistema de métricas).
+    """
+    
+    def __init__(
+        self,
+        per_page: bool = False,
+        callbacks: Optional[Iterable[TimingCallback]] = None,
+        context: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Inicializa o medidor.
+        
+        Args:
+            per_page: Se True, guarda também os tempos de cada página
+            callbacks: Funções chamadas com (etapa, segundos, contexto) a
+                cada medição
+            context: Dados incluídos no contexto repassado aos callbacks
+        """
+        self.per_page = per_page
+        self.callbacks = list(callbacks or [])
+        self.context = dict(context or {})
+        self.totals: Dict[str, float] = {}
+        self.page_timings: Dict[int, Dict[str, float]] = {}
+    
+    @contextmanager
+    def stage(self, name: str, page: Optional[int] = None) -> Iterator[None]:
+        """
+        Mede o tempo do bloco como uma etapa.
+        
+        Args:
+            name: Nome da etapa
+            page: Número da página, para etapas executadas por página
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, page)
+    
+    def add(self, name: str, seconds: float, page: Optional[int] = None):
+        """
+        Registra uma medição.
+        
+        Args:
+            name: Nome da etapa
+            seconds: Duração em segundos
+            page: Número da página, para etapas executadas por página
+        """
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        
+        if self.per_page and page is not None:
+            timings = self.page_timings.setdefault(page, {})
+            timings[name] = timings.get(name, 0.0) + seconds
+        
+        for callback in self.callbacks:
+            callback(name, seconds, {**self.context, "page": page})
+    
+    def export(self) -> Dict[str, Any]:
+        """
+        Exporta as medições para envio entre processos.
+        
+        Returns:
+            Dicionário com os totais e os tempos por página
+        """
+        return {"totals": dict(self.totals), "pages": dict(self.page_timings)}
+    
+    def merge(self, exported: Dict[str, Any]):
+        """
+        Incorpora medições exportadas por outro medidor (ex.: de um processo
+        trabalhador), repassando-as aos callbacks deste medidor.
+        
+        Args:
+            exported: Resultado de export() do outro medidor
+        """
+        paged_stages = set()
+        for page, timings in exported["pages"].items():
+            for name, seconds in timings.items():
+                self.add(name, seconds, page)
+                paged_stages.add(name)
+        
+        for name, seconds in exported["totals"].items():
+            if name not in paged_stages:
+                self.add(name, seconds)
+    
+    def as_dict(self) -> Dict[str, float]:
+        """Retorna o tempo total de cada etapa, em segundos."""
+        return {name: round(seconds, 6) for name, seconds in self.totals.items()}
+    
+    def get_page_timings(self) -> List[Dict[str, Any]]:
+        """Retorna os tempos de cada página, na ordem das páginas."""
+        return [
+            {"page": page, **{name: round(seconds, 6) for name, seconds in timings.items()}}
+            for page, timings in sorted(self.page_timings.items())
+        ]
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Percentil com interpolação linear sobre valores ordenados."""
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class TimingAggregator:
+    """
+    Agrega tempos por etapa de forma incremental, sem guardar todos os
+    registros.
+    
+    Contagem, total e máximo são exatos. Os percentis vêm de uma amostra
+    de tamanho fixo (amostragem por reservatório) e são exatos enquanto o
+    número de medições de uma etapa não passa de max_samples.
+    """
+    
+    def __init__(self, prefix: str = "", max_samples: int = 10000, seed: int = 0):
+        """
+        Inicializa o agregador.
+        
+        Args:
+            prefix: Prefixo das chaves de tempo nos registros (ex.: "time_");
+                a etapa é o nome da chave sem o prefixo
+            max_samples: Tamanho máximo da amostra usada nos percentis
+            seed: Semente da amostragem, para resultados reproduzíveis
+        """
+        self.prefix = prefix
+        self.max_samples = max_samples
+        self._random = random.Random(seed)
+        self._stages: Dict[str, Dict[str, Any]] = {}
+    
+    def add(self, row: Dict[str, Any]):
+        """
+        Acrescenta os tempos de um registro.
+        
+        Args:
+            row: Registro com os tempos de cada etapa
+        """
+        for key, seconds in row.items():
+            if not key.startswith(self.prefix) or key == "page" or not isinstance(seconds, (int, float)):
+                continue
+            
+            stage = self._stages.setdefault(
+                key[len(self.prefix):], {"count": 0, "total": 0.0, "max": 0.0, "samples": []}
+            )
+            stage["count"] += 1
+            stage["total"] += seconds
+            stage["max"] = max(stage["max"], seconds)
+            
+            samples = stage["samples"]
+            if len(samples) < self.max_samples:
+                samples.append(seconds)
+            else:
+                index = self._random.randrange(stage["count"])
+                if index < self.max_samples:
+                    samples[index] = seconds
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna total, média e percentis de cada etapa.
+        
+        Returns:
+            Dicionário etapa -> {count, total, mean, p50, p90, p99, max}
+        """
+        summary = {}
+        for name in sorted(self._stages, key=lambda stage: (STAGES + (stage,)).index(stage)):
+            stage = self._stages[name]
+            samples = sorted(stage["samples"])
+            summary[name] = {
+                "count": stage["count"],
+                "total": round(stage["total"], 4),
+                "mean": round(stage["total"] / stage["count"], 6),
+                "p50": round(_percentile(samples, 50), 6),
+                "p90": round(_percentile(samples, 90), 6),
+                "p99": round(_percentile(samples, 99), 6),
+                "max": round(stage["max"], 6),
+            }
+        
+        return summary
+
+
+def summarize_timings(rows: Iterable[Dict[str, Any]], prefix: str = "") -> Dict[str, Dict[str, float]]:
+    """
+    Agrega tempos por etapa em total, média e percentis.
+    
+    Args:
+        rows: Registros com os tempos de cada etapa
+        prefix: Prefixo das chaves de tempo nos registros (ex.: "time_");
+            a etapa é o nome da chave sem o prefixo
+    
+    Returns:
+        Dicionário etapa -> {count, total, mean, p50, p90, p99, max}
+    """
+    aggregator = TimingAggregator(prefix)
+    for row in rows:
+        aggregator.add(row)
+    return aggregator.summary()
@@ -0,0 +1,318 @@
+"""
+Módulo de monitoramento de diretório: processa os PDFs à medida que chegam.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .batch_processor import PDFBatchProcessor, _error_result, _init_worker, _process_file_in_worker
+from .isolation import FAILED_STATUSES
+from .manifest import RunManifest
+from .report import StreamingReport
+
+logger = logging.getLogger(__name__)
+
+
+class FolderWatcher:
+    """
+    Processa os PDFs novos e modificados de um diretório, continuamente.
+    
+    O diretório é varrido com os.scandir a cada poll_interval segundos;
+    com o pacote opcional watchdog (inotify no Linux), eventos do sistema
+    de arquivos antecipam a varredura. Um arquivo só é processado depois
+    de settle_seconds sem mudança de tamanho nem de data de modificação,
+    para não ler arquivos ainda em gravação. Os arquivos vão para um pool
+    de processos mantido durante toda a execução, e cada resultado é
+    gravado no manifesto e no relatório assim que termina; arquivos já
+    processados e inalterados não são reprocessados após um reinício.
+    
+    O monitoramento sobrevive à queda de um processo trabalhador: o pool
+    é recriado e os arquivos afetados voltam para a fila. Arquivos com
+    falha são tentados de novo até max_retries vezes, com espera
+    crescente. O processing_report.json é regravado a cada
+    report_interval segundos e acumula as sessões anteriores.
+    """
+    
+    def __init__(
+        self,
+        input_dir: str,
+        output_dir: str,
+        config: Optional[Dict] = None,
+        workers: Optional[int] = None,
+        poll_interval: float = 1.0,
+        settle_seconds: float = 2.0,
+        recursive: bool = False,
+        max_retries: int = 2,
+        report_interval: float = 60.0
+    ):
+        """
+        Inicializa o monitoramento (sem iniciar o pool).
+        
+        Args:
+            input_dir: Diretório monitorado
+            output_dir: Diretório de saída
+            config: Configuração do processamento
+            workers: Processos trabalhadores (padrão: max_workers da configuração)
+            poll_interval: Intervalo entre varreduras, em segundos
+            settle_seconds: Tempo sem mudanças para considerar um arquivo completo
+            recursive: Se True, monitora também os subdiretórios
+            max_retries: Novas tentativas de um arquivo com falha antes de
+                registrá-lo como falho (0 desativa)
+            report_interval: Intervalo entre gravações do relatório
+                parcial, em segundos
+        """
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        self.processor = PDFBatchProcessor(config)
+        self.workers = max(1, workers if workers is not None else self.processor.max_workers)
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.recursive = recursive
+        self.max_retries = max(0, max_retries)
+        self.report_interval = report_interval
+        self.processed = 0
+        self.pool_restarts = 0
+        
+        # (tamanho, data de modificação) observados e instante da última mudança
+        self._observed: Dict[Path, Tuple[Tuple[int, float], float]] = {}
+        # Versão (tamanho, data de modificação) já processada de cada arquivo
+        self._done: Dict[Path, Tuple[int, float]] = {}
+        self._running: Dict[Future, Tuple[Path, Tuple[int, float]]] = {}
+        # Falhas da versão atual de cada arquivo e instante da próxima tentativa
+        self._failures: Dict[Path, Tuple[Tuple[int, float], int]] = {}
+        self._retry_at: Dict[Path, float] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+    
+    def _iter_pdf_entries(self, directory: Path):
+        """Entradas de PDFs do diretório (e subdiretórios, se recursive)."""
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive and os.path.abspath(entry.path) != str(self.output_dir.absolute()):
+                            yield from self._iter_pdf_entries(Path(entry.path))
+                    elif entry.name.lower().endswith(".pdf"):
+                        yield entry
+        except FileNotFoundError:
+            return
+    
+    def scan(self, now: Optional[float] = None) -> List[Path]:
+        """
+        Varre o diretório e retorna os arquivos prontos para processamento.
+        
+        Args:
+            now: Instante da varredura (padrão: time.time())
+        
+        Returns:
+            Arquivos novos ou modificados, estáveis há settle_seconds e
+            ainda não processados nessa versão
+        """
+        now = time.time() if now is None else now
+        running = {path for path, _ in self._running.values()}
+        observed = {}
+        ready = []
+        
+        for entry in self._iter_pdf_entries(self.input_dir):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            path = Path(entry.path)
+            version = (stat.st_size, stat.st_mtime)
+            
+            previous = self._observed.get(path)
+            if previous is None:
+                # Arquivos antigos já estão completos; os recém-criados aguardam
+                changed_at = min(stat.st_mtime, now)
+            elif previous[0] != version:
+                changed_at = now
+            else:
+                changed_at = previous[1]
+            observed[path] = (version, changed_at)
+            
+            if (
+                stat.st_size > 0
+                and now - changed_at >= self.settle_seconds
+                and self._done.get(path) != version
+                and path not in running
+                and self._retry_at.get(path, 0) <= now
+            ):
+                ready.append(path)
+        
+        # Arquivos removidos deixam de ser acompanhados
+        self._observed = observed
+        for path in set(self._retry_at) - set(observed):
+            del self._retry_at[path]
+            self._failures.pop(path, None)
+        return ready
+    
+    def _start_observer(self):
+        """Inicia o observador do watchdog, se instalado, para antecipar as varreduras."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info(f"watchdog não instalado: varredura a cada {self.poll_interval}s")
+            return None
+        
+        wake = self._wake
+        
+        class _WakeHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+        
+        observer = Observer()
+        observer.schedule(_WakeHandler(), str(self.input_dir), recursive=self.recursive)
+        observer.start()
+        logger.info(f"Monitorando {self.input_dir} por eventos do sistema de arquivos")
+        return observer
+    
+    def _start_executor(self) -> ProcessPoolExecutor:
+        """Cria o pool de processos trabalhadores."""
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.processor.config,),
+        )
+    
+    def _submit(self, pdf_file: Path) -> Future:
+        """
+        Envia um arquivo ao pool, recriando-o se um trabalhador caiu.
+        
+        Args:
+            pdf_file: Arquivo PDF
+        
+        Returns:
+            Future do resultado do arquivo
+        """
+        try:
+            return self._executor.submit(_process_file_in_worker, pdf_file, self.output_dir)
+        except BrokenProcessPool:
+            logger.warning("Processo trabalhador encerrado inesperadamente: recriando o pool")
+            self._executor.shutdown(wait=False)
+            self._executor = self._start_executor()
+            self.pool_restarts += 1
+            return self._executor.submit(_process_file_in_worker, pdf_file, self.output_dir)
+    
+    def stop(self):
+        """Pede o encerramento do monitoramento (pode ser chamado de outra thread)."""
+        self._stop.set()
+        self._wake.set()
+    
+    def run(self):
+        """
+        Monitora o diretório até stop (ou Ctrl+C).
+        
+        Ao encerrar, aguarda os arquivos em processamento, grava o
+        relatório consolidado e fecha o pool. As linhas do relatório são
+        mantidas para a próxima sessão, que as continua.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = RunManifest(self.output_dir / RunManifest.FILENAME, resume=True)
+        report = StreamingReport(self.output_dir, append=True)
+        self.processor._open_record_writer(self.output_dir)
+        # Sem agrupamento prévio: cada arquivo chega sozinho; só o índice de
+        # quase duplicatas (com dedup=near) é usado
+        self.processor._split_duplicates([])
+        self._executor = self._start_executor()
+        observer = self._start_observer()
+        start_time = datetime.now()
+        last_report = time.monotonic()
+        
+        logger.info(f"Monitorando {self.input_dir} com {self.workers} processos")
+        
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                
+                for pdf_file in self.scan():
+                    if len(self._running) >= 2 * self.workers:
+                        # Os demais ficam para as próximas varreduras
+                        break
+                    version = self._observed[pdf_file][0]
+                    if manifest.get_completed_result(pdf_file) is not None:
+                        # Já processado em uma execução anterior
+                        self._done[pdf_file] = version
+                        continue
+                    self._running[self._submit(pdf_file)] = (pdf_file, version)
+                
+                if self._running:
+                    done, _ = wait(self._running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record(future, manifest, report)
+                    if not self._running:
+                        # Sem trabalho pendente: grava os registros consolidados
+                        self.processor._flush_records(manifest)
+                else:
+                    self._wake.wait(self.poll_interval)
+                
+                if time.monotonic() - last_report >= self.report_interval:
+                    report.snapshot((datetime.now() - start_time).total_seconds())
+                    last_report = time.monotonic()
+        except KeyboardInterrupt:
+            logger.info("Monitoramento interrompido")
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            
+            for future in list(self._running):
+                self._record(future, manifest, report)
+            
+            self.processor._close_record_writer(manifest)
+            near_duplicates = self.processor._resolve_near_duplicates(manifest)
+            manifest.compact()
+            report.finalize(
+                (datetime.now() - start_time).total_seconds(), annotations=near_duplicates, keep_rows=True
+            )
+            manifest.close()
+            report.close()
+            self._executor.shutdown()
+    
+    def _record(self, future: Future, manifest: RunManifest, report: StreamingReport):
+        """
+        Grava o resultado de um arquivo concluído no manifesto e no relatório.
+        
+        Uma falha com tentativas restantes não é gravada: o arquivo volta
+        para a fila depois da espera.
+        """
+        pdf_file, version = self._running.pop(future)
+        try:
+            result = future.result()
+        except Exception as e:
+            # Falha do próprio processo trabalhador (ex.: processo encerrado)
+            logger.error(f"Erro ao processar {pdf_file.name}: {str(e)}")
+            result = _error_result(pdf_file, str(e))
+        
+        if result["status"] in FAILED_STATUSES:
+            previous = self._failures.get(pdf_file)
+            attempts = previous[1] + 1 if previous is not None and previous[0] == version else 1
+            self._failures[pdf_file] = (version, attempts)
+            if attempts <= self.max_retries and not self._stop.is_set():
+                # Nova tentativa após uma espera que cresce a cada falha
+                delay = self.poll_interval * 2 ** attempts
+                self._retry_at[pdf_file] = time.time() + delay
+                logger.warning(
+                    f"Falha em {pdf_file.name} ({result['status']}); "
+                    f"tentativa {attempts + 1} de {self.max_retries + 1} em {delay:.1f}s"
+                )
+                return
+            result["attempts"] = attempts
+        
+        self._failures.pop(pdf_file, None)
+        self._retry_at.pop(pdf_file, None)
+        self._done[pdf_file] = version
+        signature = result.pop("minhash", None)
+        self.processor._record_result(manifest, pdf_file, result)
+        row = report.add(result)
+        self.processor._index_near_duplicate(pdf_file, result, signature, row)
+        self.processed += 1
+        logger.info(f"Processado: {pdf_file.name} ({result['status']})")
@@ -0,0 +1,298 @@
+"""
+Módulo de escrita de saída dos textos processados.
+"""
+import csv
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Formatos em que todos os documentos vão para arquivos consolidados
+CONSOLIDATED_FORMATS = ("jsonl", "parquet")
+
+
+class StreamingTextWriter:
+    """
+    Escreve o texto limpo em disco de forma incremental, em blocos,
+    no formato de saída configurado (txt, json ou csv).
+    
+    O arquivo gerado é idêntico ao produzido escrevendo o texto
+    completo de uma só vez.
+    """
+    
+    def __init__(self, output_file: Path, output_format: str = "txt"):
+        """
+        Abre o arquivo de saída.
+        
+        Args:
+            output_file: Caminho do arquivo de saída
+            output_format: Formato de saída (txt, json ou csv)
+        """
+        self.output_file = Path(output_file)
+        self.output_format = output_format
+        self.length = 0
+        self._pending_line = ""
+        self._line_number = 0
+        self._csv_writer = None
+        
+        if output_format == "csv":
+            self._file = self.output_file.open("w", newline="", encoding="utf-8")
+            self._csv_writer = csv.writer(self._file)
+            self._csv_writer.writerow(["line_number", "text"])
+        else:
+            self._file = self.output_file.open("w", encoding="utf-8")
+            if output_format == "json":
+                self._file.write('{\n  "text": "')
+    
+    def __enter__(self) -> "StreamingTextWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def write(self, text: str):
+        """
+        Acrescenta um bloco de texto à saída.
+        
+        Args:
+            text: Bloco de texto
+        """
+        if not text:
+            return
+        
+        self.length += len(text)
+        
+        if self.output_format == "txt":
+            self._file.write(text)
+        
+        elif self.output_format == "json":
+            self._file.write(json.dumps(text, ensure_ascii=False)[1:-1])
+        
+        elif self.output_format == "csv":
+            # Para CSV, salva linha por linha
+            lines = (self._pending_line + text).split('\n')
+            self._pending_line = lines.pop()
+            for line in lines:
+                self._line_number += 1
+                self._csv_writer.writerow([self._line_number, line])
+    
+    def close(self):
+        """Finaliza e fecha o arquivo de saída."""
+        if self._file is None:
+            return
+        
+        if self.output_format == "json":
+            self._file.write(
+                f'",\n  "length": {self.length},\n'
+                f'  "timestamp": {json.dumps(datetime.now().isoformat())}\n}}'
+            )
+        elif self.output_format == "csv":
+            self._line_number += 1
+            self._csv_writer.writerow([self._line_number, self._pending_line])
+        
+        self._file.close()
+        self._file = None
+        logger.debug(f"Texto salvo em: {self.output_file}")
+
+
+def _parquet_schema():
+    """Esquema dos registros de documento nos shards Parquet."""
+    import pyarrow as pa
+    
+    return pa.schema([
+        ("filename", pa.string()),
+        ("filepath", pa.string()),
+        ("num_pages", pa.int64()),
+        ("metadata", pa.string()),
+        ("stats", pa.struct([
+            ("original_length", pa.int64()),
+            ("cleaned_length", pa.int64()),
+            ("characters_removed", pa.int64()),
+            ("reduction_percentage", pa.float64()),
+            ("content_preserved_percentage", pa.float64()),
+        ])),
+        ("clean_text", pa.string()),
+    ])
+
+
+class ShardedRecordWriter:
+    """
+    Grava um registro por documento em poucos arquivos consolidados
+    (shards), em JSON por linha (jsonl) ou Parquet, em vez de um arquivo
+    de saída por PDF.
+    
+    Os registros ficam em um buffer e são gravados em bloco: no formato
+    jsonl, uma única escrita por bloco; no Parquet, um row group por bloco.
+    Quando um shard atinge max_records registros, o próximo é aberto. Um
+    shard Parquet só pode ser lido depois de fechado (o rodapé é gravado
+    no fechamento); durable_records indica quantos registros já podem.
+    """
+    
+    def __init__(
+        self,
+        output_dir: Path,
+        output_format: str = "jsonl",
+        max_records: int = 10000,
+        buffer_records: int = 100,
+        prefix: str = "documents"
+    ):
+        """
+        Prepara o escritor; o primeiro shard é criado na primeira gravação.
+        
+        Args:
+            output_dir: Diretório onde os shards são criados
+            output_format: Formato dos shards (jsonl ou parquet)
+            max_records: Número máximo de registros por shard
+            buffer_records: Registros acumulados antes de cada gravação
+            prefix: Prefixo do nome dos shards
+        
+        Raises:
+            ValueError: Se o formato não for suportado
+            ImportError: Se o formato for parquet e o pyarrow não estiver
+                instalado
+        """
+        if output_format not in CONSOLIDATED_FORMATS:
+            raise ValueError(f"Formato consolidado não suportado: {output_format}")
+        
+        if output_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "O formato parquet requer o pacote pyarrow: pip install pyarrow"
+                ) from None
+        
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_format = output_format
+        self.max_records = max(1, int(max_records))
+        self.buffer_records = max(1, int(buffer_records))
+        self.prefix = prefix
+        self.shards: List[Path] = []
+        self.records_written = 0
+        
+        self._closed_records = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._shard_index = self._next_shard_index()
+        self._shard_path: Optional[Path] = None
+        self._shard_records = 0
+        self._file = None
+        self._parquet_writer = None
+    
+    def __enter__(self) -> "ShardedRecordWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _next_shard_index(self) -> int:
+        """Primeiro índice livre, para não sobrescrever shards de execuções anteriores."""
+        indexes = []
+        for shard in self.output_dir.glob(f"{self.prefix}-*.{self.output_format}"):
+            suffix = shard.stem[len(self.prefix) + 1:]
+            if suffix.isdigit():
+                indexes.append(int(suffix))
+        return max(indexes) + 1 if indexes else 0
+    
+    @property
+    def pending_records(self) -> int:
+        """Número de registros no buffer, ainda não gravados."""
+        return len(self._buffer)
+    
+    @property
+    def durable_records(self) -> int:
+        """
+        Número de registros já legíveis no disco, na ordem de gravação: no
+        jsonl, os gravados; no Parquet, os de shards já fechados.
+        """
+        return self.records_written if self.output_format == "jsonl" else self._closed_records
+    
+    def write(self, record: Dict[str, Any]) -> Path:
+        """
+        Acrescenta o registro de um documento.
+        
+        Args:
+            record: Registro serializável (filename, metadados, estatísticas
+                e texto limpo)
+        
+        Returns:
+            Caminho do shard que recebe o registro
+        """
+        if self._shard_path is None or self._shard_records >= self.max_records:
+            self._roll()
+        
+        self._buffer.append(record)
+        self._shard_records += 1
+        
+        if len(self._buffer) >= self.buffer_records:
+            self.flush()
+        
+        return self._shard_path
+    
+    def _roll(self):
+        """Grava o buffer, fecha o shard atual e inicia o próximo."""
+        self.flush()
+        self._close_shard()
+        
+        self._shard_path = self.output_dir / f"{self.prefix}-{self._shard_index:05d}.{self.output_format}"
+        self._shard_index += 1
+        self._shard_records = 0
+        self.shards.append(self._shard_path)
+        
+        if self.output_format == "jsonl":
+            self._file = self._shard_path.open("w", encoding="utf-8")
+        
+        logger.info(f"Novo shard de saída: {self._shard_path}")
+    
+    def flush(self):
+        """Grava em bloco os registros acumulados no buffer."""
+        if not self._buffer:
+            return
+        
+        if self.output_format == "jsonl":
+            self._file.write("".join(
+                json.dumps(record, ensure_ascii=False, default=str) + "\n"
+                for record in self._buffer
+            ))
+            self._file.flush()
+        else:
+            self._write_row_group(self._buffer)
+        
+        self.records_written += len(self._buffer)
+        self._buffer = []
+    
+    def _write_row_group(self, records: List[Dict[str, Any]]):
+        """Grava os registros como um row group do shard Parquet."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        # Metadados variam entre PDFs e são gravados como JSON
+        rows = [
+            {**record, "metadata": json.dumps(record.get("metadata", {}), ensure_ascii=False, default=str)}
+            for record in records
+        ]
+        
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(str(self._shard_path), _parquet_schema())
+        
+        self._parquet_writer.write_table(pa.Table.from_pylist(rows, schema=self._parquet_writer.schema))
+    
+    def _close_shard(self):
+        """Fecha o arquivo do shard atual."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        # Chamado sempre depois de flush: todos os registros gravados estão fechados
+        self._closed_records = self.records_written
+    
+    def close(self):
+        """Grava os registros pendentes e fecha o shard atual."""
+        self.flush()
+        self._close_shard()
+        logger.debug(f"{self.records_written} registros gravados em {len(self.shards)} shards")
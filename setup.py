@@ -14,7 +14,6 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "pdfplumber>=0.11.0",
-        "pandas>=2.0.0",
         "python-dotenv>=1.0.0",
     ],
 )
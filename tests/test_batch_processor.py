@@ -0,0 +1,149 @@
+"""
+Testes unitários para o módulo PDFBatchProcessor.
+"""
+import asyncio
+import json
+import subprocess
+import sys
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from benchmarks.corpus import SyntheticPDFBuilder, generate_corpus
+from pdf_text_extractor import PDFBatchProcessor, batch_processor
+from pdf_text_extractor.scheduling import CostEstimator
+from pdf_text_extractor.sources import PDFSource
+
+
+class TestAsyncBatch:
+    """Testes para a API assíncrona do processamento em lote."""
+    
+    def test_process_directory_async(self, tmp_path):
+        """Testa que os resultados são entregues um a um e o relatório é gerado."""
+        generate_corpus(tmp_path / "input", num_docs=3, pages_per_doc=1, tables=False)
+        processor = PDFBatchProcessor()
+        
+        async def collect():
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                return [
+                    result async for result in processor.process_directory_async(
+                        tmp_path / "input", tmp_path / "output", executor=executor
+                    )
+                ]
+        
+        results = asyncio.run(collect())
+        
+        assert sorted(r["filename"] for r in results) == [
+            "sintetico_0000.pdf", "sintetico_0001.pdf", "sintetico_0002.pdf",
+        ]
+        assert all(r["status"] == "success" for r in results)
+        
+        report = json.loads((tmp_path / "output" / "processing_report.json").read_text(encoding="utf-8"))
+        assert report["summary"]["successful"] == 3
+        assert sorted(r["filename"] for r in report["files"]) == sorted(r["filename"] for r in results)
+
+
+class TestLargestFirstScheduling:
+    """Testes para o escalonamento pelo custo estimado."""
+    
+    def test_order_largest_first(self, tmp_path):
+        """Testa que os documentos são ordenados pelo custo estimado, do maior ao menor."""
+        builder = SyntheticPDFBuilder(tables=False)
+        small = builder.write(tmp_path / "pequeno.pdf", 1)
+        large = builder.write(tmp_path / "grande.pdf", 6)
+        medium = builder.write(tmp_path / "medio.pdf", 3)
+        
+        estimator = CostEstimator()
+        ordered, costs = estimator.order_largest_first([small, large, medium])
+        
+        assert ordered == [large, medium, small]
+        assert estimator.estimate(large)[0] == 6
+        assert costs[large] > costs[medium] > costs[small]
+    
+    def test_archive_member_uses_stored_size(self, tmp_path):
+        """Testa que membros de arquivos compactados são estimados sem leitura do conteúdo."""
+        member = PDFSource.from_archive_member(tmp_path / "ausente.tar.gz", "a.pdf", size=2 * 1024 * 1024)
+        
+        assert CostEstimator(seconds_per_mb=0.5).estimate(member) == (None, 1.0)
+    
+    def test_report_compares_estimated_and_actual_cost(self, tmp_path):
+        """Testa que o relatório traz o custo estimado e o real dos arquivos escalonados."""
+        generate_corpus(tmp_path / "input", num_docs=3, pages_per_doc=1, tables=False)
+        processor = PDFBatchProcessor({"max_workers": 2})
+        
+        results = processor.process_directory(tmp_path / "input", tmp_path / "output")
+        
+        assert all(r["estimated_cost"] > 0 for r in results)
+        
+        report = json.loads((tmp_path / "output" / "processing_report.json").read_text(encoding="utf-8"))
+        assert report["scheduling"]["files"] == 3
+        assert report["scheduling"]["estimated_cost"] > 0
+
+
+class TestWorkerInit:
+    """Testes para a inicialização dos processos trabalhadores."""
+    
+    def test_no_nested_page_pool(self):
+        """Testa que os trabalhadores extraem as páginas em um único processo por padrão."""
+        batch_processor._init_worker({"max_workers": 8})
+        assert batch_processor._worker_processor.extractor.page_workers == 1
+        
+        batch_processor._init_worker({"max_workers": 8, "page_workers": 4})
+        assert batch_processor._worker_processor.extractor.page_workers == 4
+
+
+class TestPrefilterReport:
+    """Testes para os contadores do pré-filtro de limpeza no relatório."""
+    
+    def test_counters_from_workers(self, tmp_path):
+        """Testa que os contadores dos processos trabalhadores chegam ao relatório."""
+        generate_corpus(tmp_path / "input", num_docs=3, pages_per_doc=2, tables=False)
+        processor = PDFBatchProcessor({"max_workers": 2})
+        
+        results = processor.process_directory(tmp_path / "input", tmp_path / "output")
+        
+        report = json.loads((tmp_path / "output" / "processing_report.json").read_text(encoding="utf-8"))
+        assert report["prefilter"]["applied"] == sum(r["patterns_applied"] for r in results) > 0
+        assert report["prefilter"]["skipped"] == sum(r["patterns_skipped"] for r in results)
+
+
+class TestConsolidatedResume:
+    """Testes para a retomada de execuções com saída consolidada."""
+    
+    def test_parquet_crash_and_resume(self, tmp_path):
+        """Testa que documentos de um shard Parquet sem rodapé são refeitos na retomada."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        generate_corpus(tmp_path / "input", num_docs=4, pages_per_doc=1, tables=False)
+        output_dir = tmp_path / "output"
+        
+        # Execução encerrada abruptamente ao iniciar o terceiro documento
+        script = textwrap.dedent(f"""
+            import os
+            from pdf_text_extractor import PDFBatchProcessor
+            
+            processor = PDFBatchProcessor({{
+                "max_workers": 1, "output_format": "parquet", "write_buffer_records": 1,
+            }})
+            process = processor._process_file_safely
+            calls = []
+            
+            def crash_on_third(pdf_file, output_path):
+                calls.append(pdf_file)
+                if len(calls) == 3:
+                    os._exit(1)
+                return process(pdf_file, output_path)
+            
+            processor._process_file_safely = crash_on_third
+            processor.process_directory({str(tmp_path / "input")!r}, {str(output_dir)!r})
+        """)
+        subprocess.run([sys.executable, "-c", script], check=False)
+        
+        manifest = (output_dir / "run_manifest.jsonl").read_text(encoding="utf-8")
+        assert "sintetico" not in manifest
+        
+        processor = PDFBatchProcessor({"max_workers": 1, "output_format": "parquet", "resume": True})
+        results = processor.process_directory(tmp_path / "input", output_dir)
+        
+        assert [r["status"] for r in results] == ["success"] * 4
+        shard = output_dir / "documents-00001.parquet"
+        assert {r["output_file"] for r in results} == {str(shard)}
+        assert len(pq.read_table(shard)) == 4
@@ -0,0 +1,46 @@
+"""
+Testes unitários para o pacote de benchmarks.
+"""
+from benchmarks.corpus import SyntheticPDFBuilder, generate_corpus
+from benchmarks.run import compare_results
+from pdf_text_extractor import CleanPDFExtractor
+
+
+class TestSyntheticCorpus:
+    """Testes para o gerador de corpus sintético."""
+    
+    def test_deterministic(self, tmp_path):
+        """Testa que os mesmos parâmetros geram os mesmos bytes."""
+        first = generate_corpus(tmp_path / "a", num_docs=2, pages_per_doc=3)
+        second = generate_corpus(tmp_path / "b", num_docs=2, pages_per_doc=3)
+        
+        assert [f.read_bytes() for f in first] == [f.read_bytes() for f in second]
+        assert first[0].read_bytes() != first[1].read_bytes()
+    
+    def test_extracted_content(self, tmp_path):
+        """Testa que o PDF gerado tem as páginas, a poluição e as tabelas esperadas."""
+        pdf_file = SyntheticPDFBuilder().write(tmp_path / "doc.pdf", num_pages=2)
+        
+        data = CleanPDFExtractor().extract_with_metadata(str(pdf_file))
+        
+        assert data["num_pages"] == 2
+        assert "RELINT SEPOL" in data["raw_text"]
+        assert "PÁGINA 2" in data["raw_text"]
+        assert "RELINT" not in data["clean_text"]
+        assert "PÁGINA" not in data["clean_text"]
+        assert data["table_stats"] == {"pages_analysed": 1, "pages_skipped": 1}
+
+
+class TestCompareResults:
+    """Testes para a comparação com a referência."""
+    
+    def test_regression_threshold(self):
+        """Testa que apenas quedas acima do limite são regressões."""
+        baseline = {"results": {"clean_text": {"pages_per_second": 100, "mb_per_second": 1.0}}}
+        slower = {"results": {"clean_text": {"pages_per_second": 95, "mb_per_second": 0.8}}}
+        
+        regressions = compare_results(slower, baseline, threshold=0.1)
+        
+        assert len(regressions) == 1
+        assert regressions[0].startswith("clean_text.mb_per_second")
+        assert compare_results(slower, baseline, threshold=0.25) == []
@@ -0,0 +1,86 @@
+"""
+Testes unitários para o módulo ExtractionCache.
+"""
+import io
+import os
+from benchmarks.corpus import SyntheticPDFBuilder
+from pdf_text_extractor import CleanPDFExtractor
+from pdf_text_extractor.cache import ExtractionCache
+
+
+class TestExtractionCache:
+    """Testes para a classe ExtractionCache."""
+    
+    def setup_method(self):
+        """Configuração antes de cada teste."""
+        self.settings = {"extract_tables": True, "patterns": {"a": r"\d+"}}
+    
+    def test_get_put(self, tmp_path):
+        """Testa armazenamento e leitura de uma entrada."""
+        cache = ExtractionCache(tmp_path / "cache")
+        key = cache.make_key("abc", self.settings)
+        
+        assert cache.get(key) is None
+        cache.put(key, {"clean_text": "Conteúdo", "num_pages": 2})
+        
+        assert cache.get(key) == {"clean_text": "Conteúdo", "num_pages": 2}
+        assert cache.get_stats() == {"hits": 1, "misses": 1}
+    
+    def test_key_depends_on_content_and_settings(self, tmp_path):
+        """Testa que conteúdo e configuração mudam a chave."""
+        cache = ExtractionCache(tmp_path / "cache")
+        key = cache.make_key("abc", self.settings)
+        
+        assert key == cache.make_key("abc", dict(self.settings))
+        assert key != cache.make_key("abd", self.settings)
+        assert key != cache.make_key("abc", {**self.settings, "extract_tables": False})
+    
+    def test_lru_eviction(self, tmp_path):
+        """Testa a remoção das entradas menos usadas ao exceder o limite."""
+        cache = ExtractionCache(tmp_path / "cache", max_size_mb=3500 / (1024 * 1024))
+        keys = [cache.make_key(str(i), self.settings) for i in range(3)]
+        
+        for age, key in enumerate(keys):
+            cache.put(key, {"text": "x" * 1000})
+            os.utime(cache._entry_path(key), (age, age))
+        
+        # Acessar a entrada mais antiga a torna a mais recente
+        assert cache.get(keys[0]) is not None
+        cache.put(cache.make_key("3", self.settings), {"text": "x" * 1000})
+        
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+    
+    def test_eviction_to_low_water_mark(self, tmp_path, monkeypatch):
+        """Testa que a remoção deixa folga e o diretório não é varrido a cada put."""
+        cache = ExtractionCache(tmp_path / "cache", max_size_mb=10500 / (1024 * 1024))
+        scans = []
+        iter_entries = cache._iter_entries
+        monkeypatch.setattr(cache, "_iter_entries", lambda: scans.append(1) or iter_entries())
+        
+        for i in range(20):
+            cache.put(cache.make_key(str(i), self.settings), {"text": "x" * 1000})
+            assert cache._size <= cache.max_size
+        
+        assert cache._size == cache._scan_size()
+        assert 0 < len(scans) < 20 - 10
+
+
+class TestStreamingCache:
+    """Testes para o cache no modo de extração página a página."""
+    
+    def test_extract_to_writer_uses_cache(self, tmp_path):
+        """Testa que o segundo documento vem do cache com o mesmo texto e estatísticas."""
+        pdf_file = SyntheticPDFBuilder(tables=False).write(tmp_path / "doc.pdf", 3)
+        extractor = CleanPDFExtractor({"cache_dir": str(tmp_path / "cache")})
+        first, second = io.StringIO(), io.StringIO()
+        
+        miss = extractor.extract_to_writer(pdf_file, first)
+        hit = extractor.extract_to_writer(pdf_file, second)
+        
+        assert (miss["cache_hit"], hit["cache_hit"]) == (False, True)
+        assert second.getvalue() == first.getvalue() != ""
+        assert hit["stats"] == miss["stats"] and hit["num_pages"] == 3
+        
+        # Entradas separadas das da extração do documento completo
+        assert extractor.extract_with_metadata(pdf_file)["cache_hit"] is False
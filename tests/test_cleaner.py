@@ -1,8 +1,13 @@
 """
 Testes unitários para o módulo PDFTextCleaner.
 """
+import random
+import re
+
 import pytest
+from pdf_text_extractor.boilerplate import RepeatedLineDetector
 from pdf_text_extractor.cleaner import PDFTextCleaner
+from pdf_text_extractor.prefilter import LiteralScanner, required_literals
 
 
 class TestPDFTextCleaner:
@@ -82,3 +87,183 @@ class TestPDFTextCleaner:
         cleaner = PDFTextCleaner(custom_patterns)
         
         assert "custom" in cleaner.patterns
+
+
+def _legacy_pipeline(patterns, text, remove_headers=True, normalize_spaces=True):
+    """Reproduz as passagens sequenciais originais de limpeza."""
+    if text:
+        for name, repl in (
+            ("page_numbers", ''), ("headers_relint", ''), ("document_codes", ''),
+            ("multiple_spaces", ' '), ("multiple_newlines", '\n\n'), ("page_marker", ''),
+        ):
+            text = re.sub(patterns[name], repl, text)
+        text = text.strip()
+    else:
+        text = ""
+    if remove_headers:
+        text = re.sub(r'(?:RELINT|SEPOL|SSINTE).*?(?=\n|$)', '', text)
+    if normalize_spaces:
+        text = _legacy_normalize(text)
+    return text
+
+
+def _legacy_normalize(text):
+    """Reproduz a versão original de normalize_spaces."""
+    text = re.sub(r'\s{2,}', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return '\n'.join(line.strip() for line in text.split('\n'))
+
+
+class TestCleaningEngine:
+    """Garante que o motor compilado reproduz as passagens originais."""
+    
+    TOKENS = [
+        "PÁGINA", "página", "RELINT", "SEPOL", "SSINTE", "RESUMO:", "REL", "INT",
+        "---", "-", "/", " / ", "1", "42", "0011170143", "123456789012", "7" * 9,
+        " ", "  ", "\n", "\n\n\n", "\t", "\r", "\x0c", " ",
+        "Conteúdo", "a", "Z", ".", ":",
+    ]
+    
+    def _random_texts(self, count=3000, seed=1234):
+        rnd = random.Random(seed)
+        for _ in range(count):
+            yield "".join(rnd.choice(self.TOKENS) for _ in range(rnd.randint(0, 25)))
+    
+    def test_clean_document_matches_legacy(self):
+        """Testa saída idêntica às passagens sequenciais, byte a byte."""
+        cleaner = PDFTextCleaner()
+        for text in self._random_texts():
+            for remove_headers in (True, False):
+                for normalize_spaces in (True, False):
+                    expected = _legacy_pipeline(cleaner.patterns, text, remove_headers, normalize_spaces)
+                    assert cleaner.clean_document(text, remove_headers, normalize_spaces) == expected
+    
+    def test_individual_passes_match_legacy(self):
+        """Testa clean_text, remove_headers e normalize_spaces isolados."""
+        cleaner = PDFTextCleaner()
+        for text in self._random_texts(seed=99):
+            assert cleaner.clean_text(text) == _legacy_pipeline(cleaner.patterns, text, False, False)
+            assert cleaner.remove_headers(text) == re.sub(
+                r'(?:RELINT|SEPOL|SSINTE).*?(?=\n|$)', '', text
+            )
+            assert cleaner.normalize_spaces(text) == _legacy_normalize(text)
+    
+    def test_marker_joining_fragments(self):
+        """Testa o caso em que remover um marcador de página forma um cabeçalho."""
+        cleaner = PDFTextCleaner()
+        text = "Início SEP---PÁGINARELINT x\n5---OL fim\nConteúdo"
+        assert cleaner.clean_document(text) == _legacy_pipeline(cleaner.patterns, text)
+    
+    def test_custom_patterns_use_sequential_passes(self):
+        """Testa padrões customizados sobrepondo os padrões padrão."""
+        cleaner = PDFTextCleaner({"multiple_spaces": r' {2,}', "page_marker": r'#+'})
+        for text in self._random_texts(count=500, seed=7):
+            assert cleaner.clean_document(text + "##") == _legacy_pipeline(cleaner.patterns, text + "##")
+    
+    def test_patterns_changed_after_init(self):
+        """Testa recompilação quando self.patterns é alterado."""
+        cleaner = PDFTextCleaner()
+        cleaner.patterns["document_codes"] = r'\bXYZ\b'
+        cleaner.patterns["multiple_spaces"] = r' {2,}'
+        text = "a XYZ b 0011170143\n\n\n\nc"
+        assert cleaner.clean_text(text) == _legacy_pipeline(cleaner.patterns, text, False, False)
+
+
+class TestLiteralPrefilter:
+    """Testes para o pré-filtro por literais dos padrões."""
+    
+    def test_required_literals(self):
+        """Testa os literais derivados dos padrões padrão."""
+        patterns = PDFTextCleaner().patterns
+        
+        assert required_literals(patterns["page_numbers"]) == {"PÁGINA", "página", "/"}
+        assert required_literals(patterns["headers_relint"]) == {"RELINT", "SEPOL", "SSINTE"}
+        assert required_literals(patterns["page_marker"]) == {"PÁGINA"}
+        assert required_literals(patterns["multiple_newlines"]) == {"\n\n\n"}
+        assert required_literals(patterns["multiple_spaces"]) is None
+        assert required_literals(r'(?i)relint') is None
+    
+    def test_scanner_finds_overlapping_literals(self):
+        """Testa a busca de literais sobrepostos e contidos em outros."""
+        scanner = LiteralScanner(["RESUMO:", "SUMO", "PÁGINA"])
+        
+        assert scanner.scan("xRESUMO: y") == {"RESUMO:", "SUMO"}
+        assert scanner.scan("nada") == frozenset()
+    
+    def test_skips_passes_without_literals(self):
+        """Testa que páginas sem as palavras-chave dispensam as passagens."""
+        cleaner = PDFTextCleaner()
+        
+        assert cleaner.clean_document("Conteúdo   sem marcadores") == "Conteúdo sem marcadores"
+        stats = cleaner.get_prefilter_stats()
+        assert stats["scans"] == 1
+        assert stats["skipped_by_pattern"] == {"page_numbers": 1, "headers_relint": 1, "page_marker": 1}
+    
+    def test_literal_formed_by_removal(self):
+        """Testa um cabeçalho formado pela remoção da numeração de página."""
+        cleaner = PDFTextCleaner()
+        text = "Início REL1 / 2INT x\nConteúdo"
+        
+        assert cleaner.clean_text(text) == _legacy_pipeline(cleaner.patterns, text, False, False)
+        assert "RELINT" not in cleaner.clean_text(text)
+    
+    def test_declared_literals(self):
+        """Testa literais declarados junto de um padrão customizado."""
+        cleaner = PDFTextCleaner(
+            {"page_marker": r'\[\w+\]'},
+            custom_literals={"page_marker": ["[FIM]", "[INÍCIO]"]},
+        )
+        
+        assert cleaner.clean_text("a [FIM] b") == "a  b"
+        assert cleaner.clean_text("a [OUTRO] b") == "a [OUTRO] b"
+        assert cleaner.get_prefilter_stats()["skipped_by_pattern"]["page_marker"] == 1
+    
+    def test_header_patterns_scanned_on_demand(self):
+        """Testa que literais de padrões de cabeçalho avulsos também são procurados."""
+        cleaner = PDFTextCleaner()
+        text = "foo XYZ bar\nrest"
+        header_patterns = [r'ABC', r'XYZ[^\n]*']
+        
+        assert cleaner.remove_headers(text, header_patterns) == "foo \nrest"
+        assert cleaner.get_prefilter_stats()["skipped_by_pattern"] == {"ABC": 1}
+    
+    def test_document_counters(self):
+        """Testa os contadores de um documento, além dos do limpador."""
+        cleaner = PDFTextCleaner()
+        stats = cleaner.new_prefilter_stats()
+        
+        cleaner.clean_document("Conteúdo sem marcadores", prefilter_stats=stats)
+        cleaner.clean_document("Outro texto")
+        
+        assert stats["skipped"] == 3
+        assert cleaner.get_prefilter_stats()["skipped"] == 6
+
+
+class TestRepeatedLineDetector:
+    """Testes para a detecção estatística de cabeçalhos e rodapés."""
+    
+    def test_strip_repeated_edges(self):
+        """Testa a remoção de linhas repetidas com numeração variável."""
+        detector = RepeatedLineDetector(edge_lines=2)
+        bodies = ["Introdução", "Metodologia", "Resultados", "Conclusão"]
+        pages = [
+            f"ACME S.A. - Relatório\n{body}\nPág. {n}   de 4"
+            for n, body in enumerate(bodies, 1)
+        ]
+        
+        assert detector.strip_pages(pages) == bodies
+    
+    def test_keeps_lines_below_share(self):
+        """Testa que linhas presentes em poucas páginas e documentos curtos são mantidos."""
+        detector = RepeatedLineDetector(min_share=0.5)
+        pages = ["Aviso\nTexto A", "Aviso\nTexto B", "Texto C", "Texto D"]
+        
+        assert detector.strip_pages(pages) == pages
+        assert detector.strip_pages(pages[:2]) == pages[:2]
+    
+    def test_clean_document_without_header_regex(self):
+        """Testa que header_regex=False dispensa só os padrões de cabeçalho."""
+        cleaner = PDFTextCleaner()
+        text = "RELINT SEPOL\nConteúdo   importante PÁGINA 2"
+        
+        assert cleaner.clean_document(text, header_regex=False) == "RELINT SEPOL\nConteúdo importante"
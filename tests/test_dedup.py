@@ -0,0 +1,104 @@
+"""
+Testes unitários para o módulo de detecção de duplicatas.
+"""
+import json
+import shutil
+import pytest
+from pathlib import Path
+from benchmarks.corpus import SyntheticPDFBuilder, generate_corpus
+from pdf_text_extractor import PDFBatchProcessor
+from pdf_text_extractor.dedup import MinHashSignature, NearDuplicateIndex, find_exact_duplicates
+
+
+TEXT = " ".join(f"palavra{index} relatório de análise número {index}" for index in range(200))
+
+
+class TestMinHash:
+    """Testes para as assinaturas MinHash e o índice LSH."""
+    
+    def test_chunked_signature_matches_full_text(self):
+        """Testa que entregar o texto em blocos produz a mesma assinatura."""
+        signature = MinHashSignature()
+        for start in range(0, len(TEXT), 37):
+            signature.write(TEXT[start:start + 37])
+        
+        assert signature.digest() == MinHashSignature.of_text(TEXT)
+        assert MinHashSignature.of_text("curto") is None
+    
+    def test_pure_python_matches_numpy(self):
+        """Testa que a assinatura não depende do numpy."""
+        pytest.importorskip("numpy")
+        signature = MinHashSignature()
+        signature._numpy = None
+        signature.update(TEXT)
+        
+        assert signature.digest() == MinHashSignature.of_text(TEXT)
+    
+    def test_near_duplicate_index(self):
+        """Testa que textos quase iguais são agrupados, com o original escolhido pela identificação."""
+        edited = TEXT.replace("palavra7 ", "palavra sete ")
+        other = " ".join(f"conteúdo{index} diferente sobre outro tema {index}" for index in range(200))
+        signatures = {
+            "a": MinHashSignature.of_text(TEXT),
+            "b": MinHashSignature.of_text(other),
+            "c": MinHashSignature.of_text(edited),
+        }
+        
+        for order in (["a", "b", "c"], ["c", "b", "a"]):
+            index = NearDuplicateIndex(threshold=0.8)
+            for key in order:
+                index.add(key, signatures[key])
+            
+            matches = index.resolve()
+            assert list(matches) == ["c"]
+            assert matches["c"][0] == "a" and matches["c"][1] >= 0.8
+
+
+class TestDeduplicatedBatch:
+    """Testes para o processamento em lote com duplicatas."""
+    
+    def test_exact_duplicates_reuse_output(self, tmp_path):
+        """Testa que cópias idênticas não são extraídas e apontam para a saída do original."""
+        input_dir = tmp_path / "input"
+        pdf_files = generate_corpus(input_dir, num_docs=2, pages_per_doc=1, tables=False)
+        shutil.copy(pdf_files[0], input_dir / "copia.pdf")
+        
+        unique_files, duplicates = find_exact_duplicates(sorted(input_dir.glob("*.pdf")))
+        assert len(unique_files) == 2
+        assert duplicates == {input_dir / "sintetico_0000.pdf": input_dir / "copia.pdf"}
+        
+        processor = PDFBatchProcessor({"max_workers": 1, "dedup": "exact"})
+        results = processor.process_directory(input_dir, tmp_path / "output")
+        duplicate, = [r for r in results if r["status"] == "duplicate"]
+        canonical, = [r for r in results if r["filename"] == Path(duplicate["duplicate_of"]).name]
+        
+        assert {duplicate["filename"], canonical["filename"]} == {"sintetico_0000.pdf", "copia.pdf"}
+        assert duplicate["output_file"] == canonical["output_file"]
+        assert not (tmp_path / "output" / f"{duplicate['filename'][:-4]}_clean.txt").exists()
+        
+        report = json.loads((tmp_path / "output" / "processing_report.json").read_text(encoding="utf-8"))
+        assert report["summary"]["successful"] == 2
+        assert report["summary"]["duplicates"] == 1
+    
+    def test_near_duplicates_are_marked(self, tmp_path):
+        """Testa que um documento com quase o mesmo texto é marcado no relatório."""
+        builder = SyntheticPDFBuilder(tables=False)
+        builder.write(tmp_path / "input" / "a.pdf", 8, seed=3)
+        builder.write(tmp_path / "input" / "b.pdf", 9, seed=3)
+        builder.write(tmp_path / "input" / "c.pdf", 8, seed=4)
+        
+        processor = PDFBatchProcessor({"max_workers": 1, "dedup": "near", "stream_pages": True})
+        results = processor.process_directory(tmp_path / "input", tmp_path / "output")
+        by_name = {r["filename"]: r for r in results}
+        
+        assert by_name["b.pdf"]["near_duplicate_of"] == str(tmp_path / "input" / "a.pdf")
+        assert by_name["b.pdf"]["status"] == "success"
+        assert "near_duplicate_of" not in by_name["c.pdf"]
+        assert all("minhash" not in r for r in results)
+        
+        report = json.loads((tmp_path / "output" / "processing_report.json").read_text(encoding="utf-8"))
+        assert report["summary"]["near_duplicates"] == 1
+        assert {r["filename"]: r.get("near_duplicate_of") for r in report["files"]} == {
+            name: r.get("near_duplicate_of") for name, r in by_name.items()
+        }
+        assert str(tmp_path / "input" / "a.pdf") in (tmp_path / "output" / "processing_report.csv").read_text(encoding="utf-8")
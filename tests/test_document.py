@@ -0,0 +1,79 @@
+"""
+Testes unitários para o módulo PDFDocumentSession.
+"""
+from types import SimpleNamespace
+from benchmarks.corpus import SyntheticPDFBuilder
+from pdf_text_extractor.boilerplate import RepeatedLineDetector
+from pdf_text_extractor.document import PDFDocumentSession
+
+
+def _page(lines=(), rects=(), curves=(), orientations=()):
+    """Cria uma página falsa com a geometria informada."""
+    return SimpleNamespace(
+        lines=list(lines),
+        rects=list(rects),
+        curves=list(curves),
+        edges=[{"orientation": o} for o in orientations],
+    )
+
+
+class TestTablePrecheck:
+    """Testes para a pré-verificação de tabelas."""
+    
+    def test_page_without_geometry(self):
+        """Testa página só com texto."""
+        assert not PDFDocumentSession.may_have_tables(_page())
+    
+    def test_single_rule(self):
+        """Testa página com uma única linha horizontal (ex.: sublinhado)."""
+        page = _page(lines=[{}], orientations=["h"])
+        assert not PDFDocumentSession.may_have_tables(page)
+    
+    def test_rect_grid(self):
+        """Testa página com um retângulo (duas bordas de cada orientação)."""
+        page = _page(rects=[{}], orientations=["h", "h", "v", "v"])
+        assert PDFDocumentSession.may_have_tables(page)
+    
+    def test_diagonal_curves(self):
+        """Testa curvas sem bordas horizontais ou verticais."""
+        page = _page(curves=[{}], orientations=[None, None, None, None])
+        assert not PDFDocumentSession.may_have_tables(page)
+
+
+class TestCropMargins:
+    """Testes para o recorte das faixas de cabeçalho e rodapé."""
+    
+    def test_fixed_margins(self, tmp_path):
+        """Testa que a faixa recortada não chega ao texto extraído."""
+        pdf_file = SyntheticPDFBuilder(tables=False).write(tmp_path / "doc.pdf", 2)
+        
+        with PDFDocumentSession(pdf_file, crop_margins=(45, 0)) as document:
+            text = document.extract_text()
+        
+        assert "RELINT" not in text
+        assert "Documento" in text
+    
+    def test_learned_margins(self, tmp_path):
+        """Testa o aprendizado da faixa de cabeçalho nas primeiras páginas."""
+        pdf_file = SyntheticPDFBuilder(tables=False).write(tmp_path / "doc.pdf", 4)
+        
+        with PDFDocumentSession(pdf_file) as document:
+            top_margin, bottom_margin = document.learn_crop_margins(RepeatedLineDetector(), 3)
+            text = document.extract_text()
+        
+        assert top_margin > 0
+        assert "RELINT" not in text
+    
+    def test_glyphs_past_mediabox(self, tmp_path):
+        """Testa que o recorte não corta linhas que ultrapassam a MediaBox na horizontal."""
+        pdf_bytes = SyntheticPDFBuilder(tables=False, headers=False).build(1)
+        # Página estreita, com o mesmo tamanho em bytes (a tabela xref segue válida)
+        pdf_bytes = pdf_bytes.replace(b"/MediaBox [0 0 595 842]", b"/MediaBox [0 0 200 842]")
+        
+        with PDFDocumentSession(pdf_bytes) as document:
+            expected = document.extract_text().splitlines()
+        with PDFDocumentSession(pdf_bytes, crop_margins=(0, 30)) as document:
+            text = document.extract_text().splitlines()
+        
+        assert text == expected[:len(text)]
+        assert len(text) >= len(expected) - 2
@@ -0,0 +1,81 @@
+"""
+Testes do orçamento de tempo de importação do pacote e da CLI.
+
+As medições usam "python -X importtime" em um processo novo. Os limites
+são folgados para não variar com a máquina; a verificação principal é que
+as dependências pesadas não são carregadas na importação.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Orçamentos documentados no README (milissegundos)
+PACKAGE_IMPORT_BUDGET_MS = 100
+CLI_HELP_BUDGET_MS = 200
+
+# Módulos que só devem ser importados pelo caminho de código que os usa
+HEAVY_MODULES = ("pdfplumber", "pdfminer", "pandas", "pyarrow", "dotenv", "asyncio")
+
+
+def _import_times(*args):
+    """
+    Executa um processo Python com -X importtime.
+    
+    Returns:
+        Dicionário módulo -> (tempo acumulado em ms, nível de aninhamento)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times[name.strip()] = (int(cumulative) / 1000, depth)
+    return times
+
+
+def _heavy_modules(times):
+    """Lista os módulos pesados importados."""
+    return sorted({name for name in times if name.split(".")[0] in HEAVY_MODULES})
+
+
+class TestImportTime:
+    """Testes do tempo de importação."""
+    
+    def test_package_import(self):
+        """Testa que importar o pacote não carrega dependências pesadas."""
+        times = _import_times("-c", "import pdf_text_extractor")
+        
+        assert _heavy_modules(times) == []
+        assert times["pdf_text_extractor"][0] < PACKAGE_IMPORT_BUDGET_MS
+    
+    def test_classes_do_not_load_pdfplumber(self):
+        """Testa que as classes são importadas sem carregar o pdfplumber."""
+        times = _import_times(
+            "-c", "from pdf_text_extractor import CleanPDFExtractor, PDFBatchProcessor"
+        )
+        
+        assert _heavy_modules(times) == []
+    
+    def test_config_import(self):
+        """Testa que importar a configuração não carrega o .env; o primeiro acesso carrega."""
+        times = _import_times("-c", "import pdf_text_extractor.config")
+        assert _heavy_modules(times) == []
+        
+        times = _import_times("-c", "from pdf_text_extractor.config import Config; Config.MAX_WORKERS")
+        assert "dotenv" in times
+    
+    def test_cli_help(self):
+        """Testa que "main.py --help" não carrega dependências pesadas."""
+        times = _import_times("main.py", "--help")
+        
+        assert _heavy_modules(times) == []
+        total = sum(cumulative for cumulative, depth in times.values() if depth == 0)
+        assert total < CLI_HELP_BUDGET_MS
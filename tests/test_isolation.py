@@ -0,0 +1,147 @@
+"""
+Testes unitários para a execução isolada de documentos.
+"""
+import json
+import os
+import time
+import zlib
+from benchmarks.corpus import generate_corpus
+from pdf_text_extractor import PDFBatchProcessor
+from pdf_text_extractor.isolation import IsolatedWorkerPool
+
+
+def _fake_process(self, pdf_file, output_dir):
+    """
+    Substitui a extração: "lento" não termina, "grande" esgota a memória,
+    "ruim" falha e "nativo" aborta como uma falha de alocação em código nativo.
+    """
+    if pdf_file.stem == "lento":
+        time.sleep(60)
+    if pdf_file.stem == "grande":
+        bytearray(4 * 1024 ** 3)
+    if pdf_file.stem == "ruim":
+        raise ValueError("PDF inválido")
+    if pdf_file.stem == "nativo":
+        os.abort()
+    return {"filename": pdf_file.name, "status": "success", "pid": os.getpid()}
+
+
+def _inflating_pdf(path, stream_mb: int):
+    """PDF de uma página cujo conteúdo comprimido ocupa stream_mb MB ao ser descomprimido."""
+    compressor = zlib.compressobj(9)
+    data = compressor.compress(b"BT /F1 12 Tf 72 720 Td (Texto) Tj ET\n")
+    blank = b" " * (1024 * 1024)
+    for _ in range(stream_mb):
+        data += compressor.compress(blank)
+    data += compressor.flush()
+    
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream",
+    ]
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    
+    path.write_bytes(bytes(output))
+    return path
+
+
+def _virtual_memory_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmSize:"):
+                return int(line.split()[1]) / 1024
+
+
+class TestIsolatedWorkerPool:
+    """Testes para o pool de processos isolados."""
+    
+    def _run(self, monkeypatch, tmp_path, names, **options):
+        monkeypatch.setattr(PDFBatchProcessor, "_process_single_file", _fake_process)
+        results = {}
+        pool = IsolatedWorkerPool({}, 1, **options)
+        pool.run(
+            [tmp_path / f"{name}.pdf" for name in names], tmp_path,
+            lambda pdf_file, result: results.__setitem__(pdf_file.stem, result),
+        )
+        return pool, results
+    
+    def test_timeout_does_not_stop_the_batch(self, monkeypatch, tmp_path):
+        """Testa que um documento acima do tempo limite é interrompido e o lote continua."""
+        start = time.monotonic()
+        _, results = self._run(monkeypatch, tmp_path, ["a", "lento", "b"], timeout=1)
+        
+        assert time.monotonic() - start < 30
+        assert results["lento"]["status"] == "timeout"
+        assert results["a"]["status"] == results["b"]["status"] == "success"
+    
+    def test_memory_limit_and_recycling(self, monkeypatch, tmp_path):
+        """Testa o status oom sob RLIMIT_AS e a reciclagem dos processos."""
+        pool, results = self._run(
+            monkeypatch, tmp_path, ["a", "grande", "b", "c"],
+            memory_limit_mb=_virtual_memory_mb() + 512, max_tasks=2,
+        )
+        
+        assert results["grande"]["status"] == "oom"
+        assert results["a"]["pid"] != results["b"]["pid"]
+        assert results["b"]["pid"] == results["c"]["pid"]
+        assert pool.recycled >= 2
+    
+    def test_worker_replaced_after_error(self, monkeypatch, tmp_path):
+        """Testa que o documento seguinte a uma falha roda em um processo novo."""
+        _, results = self._run(monkeypatch, tmp_path, ["a", "ruim", "b"])
+        
+        assert results["ruim"]["status"] == "error"
+        assert results["a"]["pid"] != results["b"]["pid"]
+    
+    def test_real_document_over_memory_limit(self, tmp_path):
+        """Testa um PDF real acima do limite: status oom, e os documentos seguintes não são afetados."""
+        import pdfplumber  # noqa: F401 - já carregado no processo principal, fora do limite
+        
+        big = _inflating_pdf(tmp_path / "grande.pdf", stream_mb=512)
+        small = generate_corpus(tmp_path, num_docs=2, pages_per_doc=1, tables=False)
+        results = {}
+        
+        pool = IsolatedWorkerPool({}, 1, memory_limit_mb=_virtual_memory_mb() + 150)
+        pool.run([big] + small, tmp_path, lambda pdf_file, result: results.__setitem__(pdf_file.stem, result))
+        
+        assert results["grande"]["status"] == "oom"
+        assert [results[pdf_file.stem]["status"] for pdf_file in small] == ["success", "success"]
+    
+    def test_signal_under_memory_limit_is_oom(self, monkeypatch, tmp_path):
+        """Testa que um processo encerrado por sinal conta como oom apenas com o limite ativo."""
+        _, results = self._run(monkeypatch, tmp_path, ["nativo", "a"])
+        assert results["nativo"]["status"] == "error"
+        
+        _, results = self._run(
+            monkeypatch, tmp_path, ["nativo", "a"], memory_limit_mb=_virtual_memory_mb() + 512,
+        )
+        assert results["nativo"]["status"] == "oom"
+        assert results["a"]["status"] == "success"
+    
+    def test_report_counts_interrupted_files_as_failed(self, monkeypatch, tmp_path):
+        """Testa que arquivos interrompidos aparecem no relatório como falhas, com seu status."""
+        monkeypatch.setattr(PDFBatchProcessor, "_process_single_file", _fake_process)
+        (tmp_path / "input").mkdir()
+        for name in ("a", "lento"):
+            (tmp_path / "input" / f"{name}.pdf").write_bytes(b"%PDF-1.4")
+        
+        processor = PDFBatchProcessor({"max_workers": 1, "doc_timeout": 1})
+        processor.process_directory(tmp_path / "input", tmp_path / "output")
+        
+        report = json.loads((tmp_path / "output" / "processing_report.json").read_text(encoding="utf-8"))
+        assert report["summary"]["failed"] == 1
+        assert report["summary"]["timeouts"] == 1
+        assert {f["filename"]: f["status"] for f in report["files"]} == {"a.pdf": "success", "lento.pdf": "timeout"}
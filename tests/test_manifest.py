@@ -0,0 +1,77 @@
+"""
+Testes unitários para o módulo RunManifest.
+"""
+import os
+from pdf_text_extractor.manifest import RunManifest
+
+
+class TestRunManifest:
+    """Testes para a classe RunManifest."""
+    
+    def _setup_files(self, tmp_path):
+        pdf_file = tmp_path / "doc.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4 conteudo")
+        output_file = tmp_path / "doc_clean.txt"
+        output_file.write_text("texto", encoding="utf-8")
+        result = {"filename": "doc.pdf", "status": "success", "output_file": str(output_file)}
+        return pdf_file, output_file, result
+    
+    def test_resume_unchanged_file(self, tmp_path):
+        """Testa que um arquivo inalterado é reaproveitado na retomada."""
+        pdf_file, _, result = self._setup_files(tmp_path)
+        manifest_file = tmp_path / RunManifest.FILENAME
+        
+        with RunManifest(manifest_file, resume=False) as manifest:
+            manifest.record(pdf_file, result)
+        
+        with RunManifest(manifest_file) as manifest:
+            assert manifest.get_completed_result(pdf_file) == result
+    
+    def test_touched_file_with_same_content(self, tmp_path):
+        """Testa que mudar só a data de modificação não força reprocessamento."""
+        pdf_file, _, result = self._setup_files(tmp_path)
+        manifest_file = tmp_path / RunManifest.FILENAME
+        
+        with RunManifest(manifest_file) as manifest:
+            manifest.record(pdf_file, result)
+        
+        os.utime(pdf_file, (1, 1))
+        
+        with RunManifest(manifest_file) as manifest:
+            assert manifest.get_completed_result(pdf_file) == result
+    
+    def test_changed_failed_or_missing_output(self, tmp_path):
+        """Testa arquivos alterados, com falha ou sem saída."""
+        pdf_file, output_file, result = self._setup_files(tmp_path)
+        manifest_file = tmp_path / RunManifest.FILENAME
+        
+        with RunManifest(manifest_file) as manifest:
+            manifest.record(pdf_file, result)
+            
+            pdf_file.write_bytes(b"%PDF-1.4 outro conteudo")
+            assert manifest.get_completed_result(pdf_file) is None
+            
+            manifest.record(pdf_file, {"filename": "doc.pdf", "status": "error", "error": "x"})
+            assert manifest.get_completed_result(pdf_file) is None
+            
+            manifest.record(pdf_file, result)
+            output_file.unlink()
+            assert manifest.get_completed_result(pdf_file) is None
+    
+    def test_truncated_line_and_compact(self, tmp_path):
+        """Testa leitura com linha incompleta e compactação."""
+        pdf_file, _, result = self._setup_files(tmp_path)
+        manifest_file = tmp_path / RunManifest.FILENAME
+        
+        with RunManifest(manifest_file) as manifest:
+            manifest.record(pdf_file, result)
+            manifest.record(pdf_file, result)
+        
+        with manifest_file.open("a", encoding="utf-8") as f:
+            f.write('{"path": "incomp')
+        
+        with RunManifest(manifest_file) as manifest:
+            assert manifest.get_completed_result(pdf_file) == result
+            manifest.compact()
+        
+        assert len(manifest_file.read_text(encoding="utf-8").splitlines()) == 1
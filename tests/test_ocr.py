@@ -0,0 +1,84 @@
+"""
+Testes unitários para o OCR seletivo de páginas escaneadas.
+"""
+import pickle
+from types import SimpleNamespace
+
+from benchmarks.corpus import SyntheticPDFBuilder
+from pdf_text_extractor import ocr
+from pdf_text_extractor.cache import ExtractionCache
+from pdf_text_extractor.document import PDFDocumentSession, extract_page_range
+from pdf_text_extractor.ocr import PageOCR
+from pdf_text_extractor.sources import as_source
+
+
+def _fake_engine(calls):
+    """Substitui o pytesseract por um reconhecedor que conta as chamadas."""
+    def image_to_string(image, lang):
+        calls.append(lang)
+        return "texto reconhecido\n"
+    return lambda: SimpleNamespace(image_to_string=image_to_string)
+
+
+class TestPageOCR:
+    """Testes para o OCR das páginas sem camada de texto."""
+    
+    def test_only_pages_without_text(self, tmp_path, monkeypatch):
+        """Testa que só páginas sem caracteres passam por OCR."""
+        calls = []
+        monkeypatch.setattr(ocr, "_load_engine", _fake_engine(calls))
+        scanned = SyntheticPDFBuilder(
+            lines_per_page=0, tables=False, headers=False, footers=False, document_codes=False,
+        ).write(tmp_path / "escaneado.pdf", 2)
+        native = SyntheticPDFBuilder(tables=False).write(tmp_path / "nativo.pdf", 2)
+        page_ocr = PageOCR(max_workers=0)
+        
+        with PDFDocumentSession(scanned, ocr=page_ocr) as document:
+            assert document.extract_page_texts() == ["texto reconhecido", "texto reconhecido"]
+            assert document.ocr_pages == 2
+            assert "ocr" in document.timer.as_dict()
+        
+        with PDFDocumentSession(native, ocr=page_ocr) as document:
+            document.extract_page_texts()
+            assert document.ocr_pages == 0
+        
+        assert calls == ["por", "por"]
+    
+    def test_cached_pages(self, tmp_path, monkeypatch):
+        """Testa que o texto reconhecido é reaproveitado do cache."""
+        calls = []
+        monkeypatch.setattr(ocr, "_load_engine", _fake_engine(calls))
+        scanned = SyntheticPDFBuilder(
+            lines_per_page=0, tables=False, headers=False, footers=False, document_codes=False,
+        ).write(tmp_path / "escaneado.pdf", 1)
+        page_ocr = PageOCR(max_workers=0, cache=ExtractionCache(tmp_path / "cache"))
+        
+        for _ in range(2):
+            with PDFDocumentSession(scanned, ocr=page_ocr) as document:
+                assert list(document.iter_page_texts()) == ["texto reconhecido"]
+        
+        assert len(calls) == 1
+    
+    def test_page_range_uses_cache(self, tmp_path, monkeypatch):
+        """Testa que a cópia local enviada às fatias paralelas mantém o cache."""
+        calls = []
+        monkeypatch.setattr(ocr, "_load_engine", _fake_engine(calls))
+        scanned = SyntheticPDFBuilder(
+            lines_per_page=0, tables=False, headers=False, footers=False, document_codes=False,
+        ).write(tmp_path / "escaneado.pdf", 2)
+        page_ocr = PageOCR(max_workers=2, cache=ExtractionCache(tmp_path / "cache"))
+        content_hash = as_source(scanned).sha256()
+        
+        # A cópia passa por pickle, como no envio a um processo trabalhador
+        inline_ocr = pickle.loads(pickle.dumps(page_ocr.inline()))
+        assert inline_ocr.max_workers == 0
+        assert pickle.loads(pickle.dumps(page_ocr)).cache is None
+        
+        for _ in range(2):
+            page_texts, stats, _ = extract_page_range(
+                str(scanned), 1, 2, ocr=inline_ocr, content_hash=content_hash
+            )
+            assert page_texts == ["texto reconhecido", "texto reconhecido"]
+            assert stats["ocr_pages"] == 2
+        
+        assert len(calls) == 2
@@ -0,0 +1,85 @@
+"""
+Testes unitários para o pipeline por página.
+"""
+import io
+import time
+
+import pytest
+from benchmarks.corpus import SyntheticPDFBuilder
+from pdf_text_extractor import CleanPDFExtractor
+from pdf_text_extractor.pipeline import PagePipeline
+
+
+class TestPagePipeline:
+    """Testes para os estágios concorrentes com filas limitadas."""
+    
+    def test_order_and_backpressure(self):
+        """Testa a ordem das páginas e a espera por um estágio lento."""
+        extracted = []
+        written = []
+        
+        def pages():
+            for number in range(20):
+                extracted.append(number)
+                yield f"página {number}"
+        
+        def write(page_number, text):
+            # A extração não se adianta mais que as duas filas e os estágios
+            assert len(extracted) - len(written) <= 2 * 2 + 3
+            time.sleep(0.001)
+            written.append((page_number, text))
+        
+        pipeline = PagePipeline(depth=2)
+        pipeline.run(pages(), lambda page_number, text: text.upper(), write)
+        
+        assert written == [(number + 1, f"PÁGINA {number}") for number in range(20)]
+        assert pipeline.pages == 20
+        assert pipeline.stalls > 0
+    
+    def test_stage_error_stops_extraction(self):
+        """Testa que um erro na escrita interrompe a extração e é repassado."""
+        extracted = []
+        
+        def pages():
+            for number in range(1000):
+                extracted.append(number)
+                yield "texto"
+        
+        def write(page_number, text):
+            if page_number == 3:
+                raise OSError("disco cheio")
+        
+        with pytest.raises(OSError, match="disco cheio"):
+            PagePipeline(depth=2).run(pages(), lambda page_number, text: text, write)
+        
+        assert len(extracted) < 1000
+    
+    def test_extract_to_writer_matches_sequential(self, tmp_path):
+        """Testa que o pipeline grava o mesmo texto que a execução sequencial."""
+        pdf_file = SyntheticPDFBuilder(tables=False).write(tmp_path / "doc.pdf", 6)
+        
+        outputs = []
+        for depth in (0, 2):
+            writer = io.StringIO()
+            extractor = CleanPDFExtractor({"pipeline_depth": depth, "time_pages": True})
+            data = extractor.extract_to_writer(str(pdf_file), writer)
+            outputs.append((writer.getvalue(), data["stats"], len(data["page_timings"])))
+        
+        assert outputs[0] == outputs[1]
+        assert outputs[0][0]
+    
+    @pytest.mark.parametrize("depth", [0, 2])
+    def test_repeated_lines_while_streaming(self, tmp_path, depth):
+        """Testa header_detection="repeated" na extração página a página."""
+        pdf_file = SyntheticPDFBuilder(tables=False).write(tmp_path / "doc.pdf", 6)
+        
+        config = {"header_detection": "repeated", "pipeline_depth": depth}
+        expected = CleanPDFExtractor(config).extract_with_metadata(str(pdf_file))["clean_text"]
+        
+        for window in (50, 3):
+            writer = io.StringIO()
+            CleanPDFExtractor({**config, "repeated_line_window": window}).extract_to_writer(str(pdf_file), writer)
+            assert writer.getvalue() == expected
+        
+        assert list(CleanPDFExtractor(config).iter_clean_pages(str(pdf_file)))
+        assert "RELINT" not in expected
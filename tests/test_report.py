@@ -0,0 +1,60 @@
+"""
+Testes unitários para o relatório incremental.
+"""
+import csv
+import json
+from pdf_text_extractor.report import StreamingReport
+
+
+def _success(name, pages, reduction):
+    """Linha de resultado de sucesso mínima."""
+    return {
+        "filename": name,
+        "status": "success",
+        "num_pages": pages,
+        "chars_removed": 10,
+        "reduction_percentage": reduction,
+        "content_preserved": 100 - reduction,
+        "time_clean": 0.5,
+        "page_timings": [{"page": 1, "extract_text": 0.25}],
+    }
+
+
+class TestStreamingReport:
+    """Testes para a classe StreamingReport."""
+    
+    def test_aggregates_and_files(self, tmp_path):
+        """Testa o resumo calculado a partir dos agregados e a lista de arquivos."""
+        with StreamingReport(tmp_path) as report:
+            report.add(_success("a.pdf", 2, 10.0))
+            report.add({"filename": "b.pdf", "status": "error", "error": "falha"})
+            report.add(_success("c.pdf", 3, 20.0))
+            report.finalize(total_time=2.0, skipped=1)
+        
+        data = json.loads((tmp_path / "processing_report.json").read_text(encoding="utf-8"))
+        
+        assert data["summary"]["total_files"] == 3
+        assert data["summary"]["successful"] == 2
+        assert data["summary"]["failed"] == 1
+        assert data["summary"]["total_pages"] == 5
+        assert data["summary"]["skipped_unchanged"] == 1
+        assert data["statistics"]["avg_reduction_percentage"] == 15.0
+        assert data["timings"]["clean"]["total"] == 1.0
+        assert data["page_timings"]["extract_text"]["count"] == 2
+        assert [f["filename"] for f in data["files"]] == ["a.pdf", "b.pdf", "c.pdf"]
+        assert not (tmp_path / "processing_report.json.rows").exists()
+        
+        with open(tmp_path / "processing_report.csv", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["filename"] for row in rows] == ["a.pdf", "c.pdf"]
+        assert "page_timings" not in rows[0]
+    
+    def test_empty_report(self, tmp_path):
+        """Testa um relatório sem arquivos."""
+        with StreamingReport(tmp_path) as report:
+            report.finalize(total_time=0)
+        
+        data = json.loads((tmp_path / "processing_report.json").read_text(encoding="utf-8"))
+        assert data["files"] == []
+        assert data["summary"]["total_files"] == 0
+        assert not (tmp_path / "processing_report.csv").exists()
@@ -0,0 +1,83 @@
+"""
+Testes unitários para o servidor de extração.
+"""
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from benchmarks.corpus import SyntheticPDFBuilder
+from pdf_text_extractor import CleanPDFExtractor
+from pdf_text_extractor.server import ExtractionServer
+
+
+@pytest.fixture
+def server():
+    server = ExtractionServer(port=0, workers=1, queue_size=0)
+    server.start()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def _request(server, path, data=None, headers=None):
+    host, port = server.address
+    request = urllib.request.Request(f"http://{host}:{port}{path}", data=data, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestExtractionServer:
+    """Testes para o servidor HTTP de extração."""
+    
+    def test_extract_and_metrics(self, server, tmp_path):
+        """Testa a extração pelo corpo e por caminho, e os contadores."""
+        pdf_file = SyntheticPDFBuilder(tables=False).write(tmp_path / "doc.pdf", 2)
+        expected = CleanPDFExtractor().extract_clean_text(pdf_file)
+        
+        status, result = _request(server, "/extract?filename=doc.pdf", pdf_file.read_bytes())
+        assert status == 200
+        assert result["clean_text"] == expected
+        assert result["filename"] == "doc.pdf"
+        assert "raw_text" not in result
+        
+        status, result = _request(
+            server, "/extract", json.dumps({"path": str(pdf_file)}).encode(),
+            {"Content-Type": "application/json"},
+        )
+        assert status == 200 and result["num_pages"] == 2
+        
+        status, metrics = _request(server, "/metrics")
+        assert status == 200
+        assert metrics["completed"] == 2 and metrics["queue_depth"] == 0
+    
+    def test_full_queue_is_rejected(self, server):
+        """Testa que, com a fila cheia, a requisição recebe 503 sem ser enfileirada."""
+        server._slots.acquire()
+        try:
+            status, result = _request(server, "/extract", b"%PDF-1.4")
+        finally:
+            server._slots.release()
+        
+        assert status == 503
+        assert server.metrics()["rejected"] == 1
+        assert _request(server, "/health")[1]["status"] == "ok"
+    
+    def test_pool_recreated_after_worker_crash(self, server, tmp_path):
+        """Testa que a morte de um processo é indicada em /health e o pool é recriado."""
+        pdf_file = SyntheticPDFBuilder(tables=False).write(tmp_path / "doc.pdf", 1)
+        
+        with pytest.raises(Exception):
+            server._executor.submit(os._exit, 1).result()
+        assert _request(server, "/health") == (503, {**server.health(), "status": "broken"})
+        
+        status, result = _request(server, "/extract?filename=doc.pdf", pdf_file.read_bytes())
+        assert status == 200 and result["num_pages"] == 1
+        assert server.health()["status"] == "ok"
+        assert server.health()["pool_restarts"] == 1
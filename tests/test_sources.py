@@ -0,0 +1,142 @@
+"""
+Testes unitários para o módulo de fontes de entrada (arquivos compactados e memória).
+"""
+import io
+import json
+import pickle
+import tarfile
+import zipfile
+from pathlib import Path
+import pytest
+from benchmarks.corpus import SyntheticPDFBuilder, generate_corpus
+from pdf_text_extractor import CleanPDFExtractor, PDFBatchProcessor, sources
+from pdf_text_extractor.sources import PDFSource, as_source, iter_archive_members
+
+
+class TestPDFSource:
+    """Testes para as fontes de PDF."""
+    
+    def test_bytes_and_stream_match_file(self, tmp_path):
+        """Testa que bytes e objetos de arquivo produzem o mesmo texto que o arquivo."""
+        pdf_file = SyntheticPDFBuilder(tables=False).write(tmp_path / "doc.pdf", 2)
+        extractor = CleanPDFExtractor()
+        
+        expected = extractor.extract_clean_text(pdf_file)
+        
+        assert extractor.extract_clean_text(pdf_file.read_bytes()) == expected
+        assert extractor.extract_clean_text(io.BytesIO(pdf_file.read_bytes())) == expected
+    
+    def test_archive_members(self, tmp_path):
+        """Testa a listagem e a leitura de membros de zip e tar."""
+        pdf_files = generate_corpus(tmp_path / "input", num_docs=2, pages_per_doc=1, tables=False)
+        
+        with zipfile.ZipFile(tmp_path / "lote.zip", "w") as zf:
+            for pdf_file in pdf_files:
+                zf.write(pdf_file, f"docs/{pdf_file.name}")
+        with tarfile.open(tmp_path / "lote.tar.gz", "w:gz") as tf:
+            for pdf_file in pdf_files:
+                tf.add(pdf_file, f"docs/{pdf_file.name}")
+        
+        for archive in ("lote.zip", "lote.tar.gz"):
+            members = list(iter_archive_members(tmp_path / archive))
+            
+            assert [m.member for m in members] == [f"docs/{p.name}" for p in pdf_files]
+            assert members[0].name == pdf_files[0].name
+            assert members[0].identity.endswith(f"{archive}:docs/{pdf_files[0].name}")
+            assert members[0].read_bytes() == pdf_files[0].read_bytes()
+            assert members[0].sha256() == as_source(pdf_files[0]).sha256()
+
+
+class TestArchiveBatch:
+    """Testes para o processamento em lote de arquivos compactados."""
+    
+    def test_process_archive(self, tmp_path):
+        """Testa que o relatório identifica cada documento pelo arquivo e membro."""
+        pdf_files = generate_corpus(tmp_path / "pdfs", num_docs=2, pages_per_doc=1, tables=False)
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        with zipfile.ZipFile(input_dir / "lote.zip", "w") as zf:
+            for pdf_file in pdf_files:
+                zf.write(pdf_file, pdf_file.name)
+        
+        processor = PDFBatchProcessor({"max_workers": 1, "read_archives": True})
+        results = processor.process_directory(input_dir, tmp_path / "output")
+        
+        assert [r["status"] for r in results] == ["success", "success"]
+        assert [r["member"] for r in results] == [p.name for p in pdf_files]
+        assert all(r["archive"] == str(input_dir / "lote.zip") for r in results)
+        assert (tmp_path / "output" / "lote.zip__sintetico_0000_clean.txt").exists()
+        
+        report = json.loads((tmp_path / "output" / "processing_report.json").read_text(encoding="utf-8"))
+        assert report["summary"]["successful"] == 2
+        assert "archive,member" in (tmp_path / "output" / "processing_report.csv").read_text(encoding="utf-8")
+    
+    @pytest.mark.parametrize("archive", ["lote.zip", "lote.tar.gz"])
+    def test_same_member_name(self, tmp_path, archive, monkeypatch):
+        """Testa saídas distintas para membros de mesmo nome e tar comprimido lido uma vez."""
+        pdf_files = generate_corpus(tmp_path / "pdfs", num_docs=2, pages_per_doc=1, tables=False)
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        if archive.endswith(".zip"):
+            with zipfile.ZipFile(input_dir / archive, "w") as zf:
+                zf.write(pdf_files[0], "a/doc.pdf")
+                zf.write(pdf_files[1], "b/doc.pdf")
+        else:
+            with tarfile.open(input_dir / archive, "w:gz") as tf:
+                tf.add(pdf_files[0], "a/doc.pdf")
+                tf.add(pdf_files[1], "b/doc.pdf")
+            
+            def read_member(archive, member):
+                raise AssertionError(f"acesso direto a {member}")
+            monkeypatch.setattr(sources, "read_archive_member", read_member)
+        
+        processor = PDFBatchProcessor({"max_workers": 1, "read_archives": True})
+        results = processor.process_directory(input_dir, tmp_path / "output")
+        
+        assert [r["status"] for r in results] == ["success", "success"]
+        outputs = [tmp_path / "output" / f"{archive}__{d}__doc_clean.txt" for d in ("a", "b")]
+        assert [o.read_text(encoding="utf-8") for o in outputs] == [
+            CleanPDFExtractor().extract_clean_text(p) for p in pdf_files
+        ]
+        assert processor._spool_dir is None
+    
+    def test_compressed_tar_streamed(self, tmp_path, monkeypatch):
+        """Testa a leitura em fluxo de tar comprimido: memória, cópia acima do limite, duplicatas e retomada."""
+        pdf_files = generate_corpus(tmp_path / "pdfs", num_docs=2, pages_per_doc=1, tables=False)
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        with tarfile.open(input_dir / "lote.tar.gz", "w:gz") as tf:
+            tf.add(pdf_files[0], "a.pdf")
+            tf.add(pdf_files[1], "b.pdf")
+            tf.add(pdf_files[0], "c.pdf")
+        
+        copies = []
+        copyfileobj = sources.shutil.copyfileobj
+        monkeypatch.setattr(sources.shutil, "copyfileobj", lambda src, dst: copies.append(dst) or copyfileobj(src, dst))
+        config = {"max_workers": 1, "read_archives": True, "dedup": "exact"}
+        
+        # Membros lidos para a memória: nenhuma cópia em disco
+        results = PDFBatchProcessor(config).process_directory(input_dir, tmp_path / "memoria")
+        assert [r["status"] for r in results] == ["success", "success", "duplicate"]
+        assert copies == []
+        
+        # Acima do limite, cópia temporária removida após o processamento
+        results = PDFBatchProcessor({**config, "archive_spool_threshold_mb": 0}).process_directory(
+            input_dir, tmp_path / "disco"
+        )
+        assert [r["status"] for r in results] == ["success", "success", "duplicate"]
+        assert len(copies) == 3 and not any(Path(c.name).exists() for c in copies)
+        assert (tmp_path / "disco" / "lote.tar.gz__a_clean.txt").read_text(encoding="utf-8") == (
+            tmp_path / "memoria" / "lote.tar.gz__a_clean.txt"
+        ).read_text(encoding="utf-8")
+        
+        # Retomada: membros inalterados reaproveitados
+        PDFBatchProcessor({**config, "resume": True}).process_directory(input_dir, tmp_path / "disco")
+        report = json.loads((tmp_path / "disco" / "processing_report.json").read_text(encoding="utf-8"))
+        assert report["summary"]["skipped_unchanged"] == 3
+    
+    def test_source_is_picklable(self, tmp_path):
+        """Testa que membros de arquivos compactados podem ir para processos trabalhadores."""
+        source = PDFSource.from_archive_member(tmp_path / "lote.zip", "docs/a.pdf")
+        
+        assert pickle.loads(pickle.dumps(source)) == source
@@ -0,0 +1,61 @@
+"""
+Testes unitários para o módulo de medição de tempo por etapa.
+"""
+from pdf_text_extractor.timing import StageTimer, summarize_timings
+
+
+class TestStageTimer:
+    """Testes para a classe StageTimer."""
+    
+    def test_totals_and_pages(self):
+        """Testa a soma por etapa e a separação por página."""
+        timer = StageTimer(per_page=True)
+        timer.add("open", 0.5)
+        timer.add("extract_text", 1.0, page=1)
+        timer.add("extract_text", 2.0, page=2)
+        
+        with timer.stage("clean"):
+            pass
+        
+        assert timer.totals["extract_text"] == 3.0
+        assert timer.totals["clean"] >= 0
+        assert timer.get_page_timings() == [
+            {"page": 1, "extract_text": 1.0},
+            {"page": 2, "extract_text": 2.0},
+        ]
+    
+    def test_callbacks_and_merge(self):
+        """Testa o repasse aos callbacks, inclusive de medições de outro medidor."""
+        events = []
+        timer = StageTimer(
+            callbacks=[lambda stage, seconds, context: events.append((stage, seconds, context))],
+            context={"filename": "doc.pdf"},
+        )
+        
+        worker = StageTimer(per_page=True)
+        worker.add("open", 0.25)
+        worker.add("extract_text", 1.0, page=3)
+        timer.merge(worker.export())
+        
+        assert timer.as_dict() == {"extract_text": 1.0, "open": 0.25}
+        assert events == [
+            ("extract_text", 1.0, {"filename": "doc.pdf", "page": 3}),
+            ("open", 0.25, {"filename": "doc.pdf", "page": None}),
+        ]
+
+
+class TestSummarizeTimings:
+    """Testes para a agregação em percentis."""
+    
+    def test_percentiles(self):
+        """Testa total, média e percentis por etapa."""
+        rows = [{"filename": f"{i}.pdf", "time_clean": float(i)} for i in range(1, 11)]
+        
+        summary = summarize_timings(rows, prefix="time_")
+        
+        assert list(summary) == ["clean"]
+        assert summary["clean"]["count"] == 10
+        assert summary["clean"]["total"] == 55
+        assert summary["clean"]["p50"] == 5.5
+        assert summary["clean"]["p90"] == 9.1
+        assert summary["clean"]["max"] == 10
@@ -0,0 +1,133 @@
+"""
+Testes unitários para o monitoramento de diretório.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import wait
+from benchmarks.corpus import SyntheticPDFBuilder
+from pdf_text_extractor.watcher import FolderWatcher
+
+
+def _run_until(watcher, processed, action):
+    """Executa o monitoramento, chama action e espera processed arquivos."""
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        deadline = time.time() + 30
+        while watcher._executor is None and time.time() < deadline:
+            time.sleep(0.01)
+        action()
+        while watcher.processed < processed and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+        thread.join()
+
+
+class TestFolderWatcher:
+    """Testes para o FolderWatcher."""
+    
+    def test_scan_waits_for_stable_files(self, tmp_path):
+        """Testa que arquivos em gravação só ficam prontos após settle_seconds sem mudanças."""
+        watcher = FolderWatcher(tmp_path, tmp_path / "output", settle_seconds=2.0)
+        pdf_file = tmp_path / "novo.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4 parcial")
+        now = time.time()
+        
+        assert watcher.scan(now) == []
+        
+        # O arquivo cresce: a contagem recomeça
+        pdf_file.write_bytes(b"%PDF-1.4 parcial e mais conteudo")
+        os.utime(pdf_file, (now + 1, now + 1))
+        assert watcher.scan(now + 1.5) == []
+        assert watcher.scan(now + 3) == []
+        assert watcher.scan(now + 3.6) == [pdf_file]
+    
+    def test_run_processes_new_files(self, tmp_path):
+        """Testa que um PDF deixado no diretório é processado e registrado no relatório."""
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        output_dir = tmp_path / "output"
+        watcher = FolderWatcher(
+            input_dir, output_dir, {"max_workers": 1}, poll_interval=0.05, settle_seconds=0.2
+        )
+        thread = threading.Thread(target=watcher.run)
+        thread.start()
+        
+        try:
+            SyntheticPDFBuilder(tables=False).write(input_dir / "doc.pdf", 1)
+            deadline = time.time() + 30
+            while watcher.processed < 1 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+            thread.join()
+        
+        assert (output_dir / "doc_clean.txt").exists()
+        report = json.loads((output_dir / "processing_report.json").read_text(encoding="utf-8"))
+        assert report["summary"]["successful"] == 1
+    
+    def test_failed_file_retried(self, tmp_path):
+        """Testa que um arquivo com falha é tentado de novo antes de ser registrado."""
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        output_dir = tmp_path / "output"
+        watcher = FolderWatcher(
+            input_dir, output_dir, {"max_workers": 1},
+            poll_interval=0.05, settle_seconds=0.2, max_retries=2
+        )
+        
+        _run_until(watcher, 1, lambda: (input_dir / "ruim.pdf").write_bytes(b"nao e um pdf"))
+        
+        report = json.loads((output_dir / "processing_report.json").read_text(encoding="utf-8"))
+        assert [(f["status"], f["attempts"]) for f in report["files"]] == [("error", 3)]
+    
+    def test_pool_recreated_after_worker_crash(self, tmp_path):
+        """Testa que o monitoramento continua após a queda de um processo trabalhador."""
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        output_dir = tmp_path / "output"
+        watcher = FolderWatcher(
+            input_dir, output_dir, {"max_workers": 1}, poll_interval=0.05, settle_seconds=0.2
+        )
+        
+        def crash_then_drop():
+            wait([watcher._executor.submit(os._exit, 1)])
+            SyntheticPDFBuilder(tables=False).write(input_dir / "doc.pdf", 1)
+        
+        _run_until(watcher, 1, crash_then_drop)
+        
+        assert watcher.pool_restarts == 1
+        assert (output_dir / "doc_clean.txt").exists()
+    
+    def test_report_continues_across_sessions(self, tmp_path):
+        """Testa o relatório parcial e a continuação do relatório em uma nova sessão."""
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        output_dir = tmp_path / "output"
+        report_file = output_dir / "processing_report.json"
+        builder = SyntheticPDFBuilder(tables=False)
+        
+        def drop_and_wait_snapshot(name):
+            # O relatório parcial lista o arquivo antes do encerramento
+            builder.write(input_dir / name, 1)
+            deadline = time.time() + 30
+            while time.time() < deadline:
+                if report_file.exists() and name in report_file.read_text(encoding="utf-8"):
+                    return
+                time.sleep(0.05)
+            raise AssertionError(f"{name} ausente do relatório parcial")
+        
+        for name in ("a.pdf", "b.pdf"):
+            watcher = FolderWatcher(
+                input_dir, output_dir, {"max_workers": 1},
+                poll_interval=0.05, settle_seconds=0.2, report_interval=0
+            )
+            _run_until(watcher, 1, lambda: drop_and_wait_snapshot(name))
+        
+        report = json.loads(report_file.read_text(encoding="utf-8"))
+        assert report["summary"]["successful"] == 2
+        assert [f["filename"] for f in report["files"]] == ["a.pdf", "b.pdf"]
+        assert (output_dir / "processing_report.csv").read_text(encoding="utf-8").count(".pdf") == 2
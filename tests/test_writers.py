@@ -0,0 +1,62 @@
+"""
+Testes unitários para os escritores de saída.
+"""
+import json
+import pytest
+from pdf_text_extractor.writers import ShardedRecordWriter
+
+
+def _record(name):
+    """Registro de documento mínimo."""
+    return {
+        "filename": name,
+        "filepath": f"/dados/{name}",
+        "num_pages": 1,
+        "metadata": {"Title": name},
+        "stats": {
+            "original_length": 10,
+            "cleaned_length": 8,
+            "characters_removed": 2,
+            "reduction_percentage": 20.0,
+            "content_preserved_percentage": 80.0,
+        },
+        "clean_text": f"Texto de {name}",
+    }
+
+
+class TestShardedRecordWriter:
+    """Testes para a classe ShardedRecordWriter."""
+    
+    def test_jsonl_shards_and_buffer(self, tmp_path):
+        """Testa a rotação de shards e a gravação em bloco."""
+        with ShardedRecordWriter(tmp_path, "jsonl", max_records=2, buffer_records=2) as writer:
+            paths = [writer.write(_record(f"{i}.pdf")) for i in range(3)]
+            
+            assert writer.pending_records == 1
+            assert (tmp_path / "documents-00001.jsonl").read_text(encoding="utf-8") == ""
+        
+        assert [p.name for p in paths] == ["documents-00000.jsonl"] * 2 + ["documents-00001.jsonl"]
+        lines = (tmp_path / "documents-00000.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["filename"] for line in lines] == ["0.pdf", "1.pdf"]
+        assert json.loads((tmp_path / "documents-00001.jsonl").read_text(encoding="utf-8"))["clean_text"] == "Texto de 2.pdf"
+    
+    def test_does_not_overwrite_previous_shards(self, tmp_path):
+        """Testa que uma nova execução começa no próximo shard livre."""
+        with ShardedRecordWriter(tmp_path, "jsonl") as writer:
+            writer.write(_record("a.pdf"))
+        with ShardedRecordWriter(tmp_path, "jsonl") as writer:
+            assert writer.write(_record("b.pdf")).name == "documents-00001.jsonl"
+    
+    def test_parquet_row_groups(self, tmp_path):
+        """Testa um row group por bloco gravado no formato Parquet."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        
+        with ShardedRecordWriter(tmp_path, "parquet", buffer_records=2) as writer:
+            for i in range(3):
+                writer.write(_record(f"{i}.pdf"))
+        
+        shard = pq.ParquetFile(tmp_path / "documents-00000.parquet")
+        rows = shard.read().to_pylist()
+        assert shard.num_row_groups == 2
+        assert [row["filename"] for row in rows] == ["0.pdf", "1.pdf", "2.pdf"]
+        assert json.loads(rows[0]["metadata"]) == {"Title": "0.pdf"}